@@ -43,7 +43,9 @@ import {
 } from 'lucide-react';
 import DirectEditModal from '@/components/resume/direct-edit-modal';
 import DashboardHeader from "@/components/dashboard/Header";
-import { resumeAPI } from '@/lib/api';
+import axios from 'axios';
+import { resumeAPI, type Resume } from '@/lib/api';
+import { diffResume } from '@/lib/resume-patch';
 import { toast, Toaster } from 'sonner';
 
 export type EditingTarget =
@@ -59,6 +61,8 @@ export default function BuilderPage() {
   const [templateOptions, setTemplateOptions] = useState<EnhancedTemplateOptions>(initialEnhancedTemplateOptions);
   const [selectedTemplate, setSelectedTemplate] = useState<ResumeTemplate | null>(null);
   const [currentResumeId, setCurrentResumeId] = useState<string | null>(null);
+  // Last version the server confirmed; later saves send only what changed since
+  const [savedResume, setSavedResume] = useState<Resume | null>(null);
   const [isClient, setIsClient] = useState(false);
   const [activeTab, setActiveTab] = useState('edit');
   const [generatingPDF, setGeneratingPDF] = useState(false);
@@ -227,24 +231,36 @@ export default function BuilderPage() {
         is_public: false,
       };
 
-      let savedResume;
+      let result: Resume;
       if (currentResumeId) {
         // Update existing resume
-        savedResume = await resumeAPI.update(currentResumeId, resumePayload);
+        if (savedResume?.id === currentResumeId) {
+          const operations = diffResume(savedResume as unknown as Record<string, unknown>, resumePayload);
+          result = operations.length
+            ? await resumeAPI.patch(currentResumeId, operations, savedResume.version)
+            : savedResume;
+        } else {
+          result = await resumeAPI.update(currentResumeId, resumePayload);
+        }
         toast.success('Resume updated successfully!');
       } else {
         // Create new resume
-        savedResume = await resumeAPI.create(resumePayload);
-        setCurrentResumeId(savedResume.id);
-        localStorage.setItem('currentResumeId', savedResume.id);
+        result = await resumeAPI.create(resumePayload);
+        setCurrentResumeId(result.id);
+        localStorage.setItem('currentResumeId', result.id);
         toast.success('Resume saved successfully!');
       }
+      setSavedResume(result);
       
       setShowSaveDialog(false);
       setResumeTitle('');
     } catch (error) {
       console.error('Failed to save resume:', error);
-      toast.error('Failed to save resume');
+      if (axios.isAxiosError(error) && error.response?.status === 412) {
+        toast.error('This resume was changed in another tab. Reload it before saving again.');
+      } else {
+        toast.error('Failed to save resume');
+      }
     } finally {
       setSaving(false);
     }
@@ -1,5 +1,6 @@
 import axios from 'axios';
 import Cookies from 'js-cookie';
+import type { PatchOperation } from './resume-patch';
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api';
 
@@ -108,6 +109,7 @@ export interface Resume {
   template_options: Record<string, any>;
   is_public: boolean;
   pdf_file?: string;
+  version: number;
   created_at: string;
   updated_at: string;
   user_name?: string;
@@ -121,6 +123,17 @@ export interface ResumeListItem {
   updated_at: string;
 }
 
+export interface ResumePage {
+  results: ResumeListItem[];
+  next: string | null;
+}
+
+export interface ResumeSearchResult extends ResumeListItem {
+  is_public: boolean;
+  rank: number;
+  snippet: string; // HTML-escaped, matches wrapped in <mark>
+}
+
 // Authentication API
 export const authAPI = {
   register: async (userData: {
@@ -181,11 +194,31 @@ export const templatesAPI = {
 
 // Resume API
 export const resumeAPI = {
-  getAll: async (): Promise<ResumeListItem[]> => {
-    const response = await api.get('/auth/resumes/');
+  // One page of resumes, most recently updated first; pass `next` from the previous page to continue
+  getPage: async (next?: string | null, limit = 20): Promise<ResumePage> => {
+    const response = next
+      ? await api.get(next)
+      : await api.get('/auth/resumes/', { params: { limit } });
     return response.data;
   },
 
+  getAll: async (): Promise<ResumeListItem[]> => {
+    const resumes: ResumeListItem[] = [];
+    let next: string | null = null;
+    do {
+      const page: ResumePage = await resumeAPI.getPage(next, 100);
+      resumes.push(...page.results);
+      next = page.next;
+    } while (next);
+    return resumes;
+  },
+
+  // Best matches first among the user's own resumes and public ones
+  search: async (q: string, scope: 'all' | 'mine' | 'public' = 'all', limit = 20): Promise<ResumeSearchResult[]> => {
+    const response = await api.get('/auth/resumes/search/', { params: { q, scope, limit } });
+    return response.data.results;
+  },
+
   create: async (resumeData: Partial<Resume>): Promise<Resume> => {
     const response = await api.post('/auth/resumes/create/', resumeData);
     return response.data;
@@ -201,6 +234,17 @@ export const resumeAPI = {
     return response.data;
   },
 
+  // Sends only the changes; fails with 412 if the resume moved past `version` in another session
+  patch: async (resumeId: string, operations: PatchOperation[], version: number): Promise<Resume> => {
+    const response = await api.patch(`/auth/resumes/${resumeId}/update/`, operations, {
+      headers: {
+        'Content-Type': 'application/json-patch+json',
+        'If-Match': `"${version}"`,
+      },
+    });
+    return response.data;
+  },
+
   delete: async (resumeId: string): Promise<void> => {
     await api.delete(`/auth/resumes/${resumeId}/delete/`);
   },
@@ -0,0 +1,81 @@
+// Builds RFC 6902 JSON Patch documents for resume updates. Entries of the list
+// sections are addressed by their `id`, which the API resolves like an index.
+
+export type PatchOperation =
+  | { op: 'add' | 'replace' | 'test'; path: string; value: unknown }
+  | { op: 'remove'; path: string };
+
+type Entry = { id?: string } & Record<string, unknown>;
+
+const ENTRY_SECTIONS = ['experience', 'education', 'skills', 'projects'];
+const OBJECT_FIELDS = ['personal_info', 'template_options', 'additional_sections'];
+
+const escapeToken = (token: string) => token.replace(/~/g, '~0').replace(/\//g, '~1');
+
+const isEqual = (a: unknown, b: unknown) => JSON.stringify(a) === JSON.stringify(b);
+
+const isPlainObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value);
+
+function diffObject(path: string, before: Record<string, unknown>, after: Record<string, unknown>): PatchOperation[] {
+  const operations: PatchOperation[] = [];
+  for (const key of Object.keys(before)) {
+    if (!(key in after)) {
+      operations.push({ op: 'remove', path: `${path}/${escapeToken(key)}` });
+    }
+  }
+  for (const [key, value] of Object.entries(after)) {
+    if (!isEqual(before[key], value)) {
+      operations.push({ op: 'add', path: `${path}/${escapeToken(key)}`, value });
+    }
+  }
+  return operations;
+}
+
+function diffEntries(field: string, before: Entry[], after: Entry[]): PatchOperation[] {
+  const replaceAll: PatchOperation[] = [{ op: 'replace', path: `/${field}`, value: after }];
+  if (![...before, ...after].every(entry => isPlainObject(entry) && typeof entry.id === 'string')) {
+    return replaceAll;
+  }
+
+  const beforeIds = before.map(entry => entry.id as string);
+  const afterIds = after.map(entry => entry.id as string);
+  // Reordered entries are rare; sending the section is simpler than a chain of moves
+  const kept = beforeIds.filter(id => afterIds.includes(id));
+  if (!isEqual(kept, afterIds.filter(id => beforeIds.includes(id)))) {
+    return replaceAll;
+  }
+
+  const operations: PatchOperation[] = beforeIds
+    .filter(id => !afterIds.includes(id))
+    .map(id => ({ op: 'remove' as const, path: `/${field}/${escapeToken(id)}` }));
+
+  after.forEach((entry, index) => {
+    const previous = before.find(item => item.id === entry.id);
+    if (previous) {
+      operations.push(...diffObject(`/${field}/${escapeToken(entry.id as string)}`, previous, entry));
+    } else {
+      // Earlier entries are already in their final places, so the index is exact
+      operations.push({ op: 'add', path: `/${field}/${index}`, value: entry });
+    }
+  });
+  return operations;
+}
+
+export function diffResume(before: Record<string, unknown>, after: Record<string, unknown>): PatchOperation[] {
+  const operations: PatchOperation[] = [];
+  for (const [field, value] of Object.entries(after)) {
+    const previous = before[field];
+    if (isEqual(previous, value)) {
+      continue;
+    }
+    if (ENTRY_SECTIONS.includes(field) && Array.isArray(previous) && Array.isArray(value)) {
+      operations.push(...diffEntries(field, previous as Entry[], value as Entry[]));
+    } else if (OBJECT_FIELDS.includes(field) && isPlainObject(previous) && isPlainObject(value)) {
+      operations.push(...diffObject(`/${field}`, previous, value));
+    } else {
+      operations.push({ op: 'add', path: `/${field}`, value });
+    }
+  }
+  return operations;
+}
@@ -2,6 +2,8 @@
 ASGI config for resume project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn resume.asgi:application``) so the
+async social login views share pooled outbound connections across requests.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -0,0 +1,81 @@
+"""
+DATABASES['default'] built from the environment.
+
+DB_ENGINE selects 'sqlite' (the default) or 'postgresql'. SQLite connections
+run in WAL mode with a busy timeout and take the write lock when a
+transaction starts, so concurrent autosaves queue instead of failing with
+"database is locked". PostgreSQL connections come from a psycopg pool
+(DB_POOL, needs psycopg[pool]) or are kept open for DB_CONN_MAX_AGE seconds.
+"""
+
+from decouple import config
+
+
+def sqlite_pragmas():
+    """PRAGMA statements run on every new SQLite connection."""
+    if not config('SQLITE_PRAGMAS', default=True, cast=bool):
+        return []
+    return [
+        # Readers no longer block the writer, and commits append to the WAL
+        'PRAGMA journal_mode = WAL',
+        # Safe with WAL: a power loss can drop the last commits, never corrupt
+        'PRAGMA synchronous = NORMAL',
+        f"PRAGMA busy_timeout = {config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int)}",
+        f"PRAGMA mmap_size = {config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)}",
+        # Negative sizes are KiB
+        f"PRAGMA cache_size = -{config('SQLITE_CACHE_SIZE_KB', default=64 * 1024, cast=int)}",
+        'PRAGMA temp_store = MEMORY',
+    ]
+
+def sqlite_database(base_dir):
+    options = {
+        # The sqlite3 module's own wait for a lock, in seconds
+        'timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=5000, cast=int) / 1000,
+    }
+    pragmas = sqlite_pragmas()
+    if pragmas:
+        options['init_command'] = '; '.join(pragmas)
+        # BEGIN IMMEDIATE: a read-then-write transaction waits for the lock up
+        # front instead of failing when it tries to upgrade mid-transaction
+        options['transaction_mode'] = 'IMMEDIATE'
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': config('DB_NAME', default=str(base_dir / 'db.sqlite3')),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': options,
+    }
+
+def postgresql_database():
+    options = {}
+    conn_max_age = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    if config('DB_POOL', default=True, cast=bool):
+        options['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            # Seconds a request waits for a free connection before erroring
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        }
+        # Pooled connections are returned after each request; Django rejects both
+        conn_max_age = 0
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default='resume'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': conn_max_age,
+        'CONN_HEALTH_CHECKS': True,
+        # Transaction-mode PgBouncer cannot hold server-side cursors across statements
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool),
+        'OPTIONS': options,
+    }
+
+def database_config(base_dir):
+    engine = config('DB_ENGINE', default='sqlite')
+    if engine in ('postgres', 'postgresql'):
+        return postgresql_database()
+    if engine in ('sqlite', 'sqlite3'):
+        return sqlite_database(base_dir)
+    raise ValueError(f'Unsupported DB_ENGINE: {engine!r} (use sqlite or postgresql)')
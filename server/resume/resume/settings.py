@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from datetime import timedelta
 from decouple import config
+from .database import database_config
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -59,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'social_django.middleware.SocialAuthExceptionMiddleware',
+    'resume_app.query_budget.QueryBudgetMiddleware',
 ]
 
 ROOT_URLCONF = 'resume.urls'
@@ -83,18 +85,29 @@ WSGI_APPLICATION = 'resume.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Configured from DB_* / SQLITE_* environment variables, see resume/database.py
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': database_config(BASE_DIR),
 }
 
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# PBKDF2 cost of stored passwords: hashes made at any other cost (such as
+# Django's default of 1,000,000) are rewritten at this one on the user's next
+# login. 600,000 is OWASP's current floor for PBKDF2-HMAC-SHA256
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=600_000, cast=int)
+
+PASSWORD_HASHERS = [
+    'resume_app.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -112,7 +125,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'resume_app.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -124,6 +137,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'resume_app.blacklist.TokenRefreshSerializer',
 }
 
 CORS_ALLOWED_ORIGINS = [
@@ -192,6 +206,121 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Public origin of this backend, used to build absolute media URLs for the frontend
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+
+# Rendered resume PDFs are cached in Resume.pdf_file; least recently used
+# files are evicted once the cache grows past this many bytes
+PDF_CACHE_MAX_BYTES = config('PDF_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+
+# Parsed paragraphs are cached per resume entry and template so that editing
+# one entry only re-parses that entry on the next render
+PDF_FLOWABLE_CACHE_SIZE = config('PDF_FLOWABLE_CACHE_SIZE', default=5000, cast=int)
+
+# Freshly rendered PDFs spill from memory to a temporary file past this size
+PDF_SPOOL_MAX_BYTES = config('PDF_SPOOL_MAX_BYTES', default=1024 * 1024, cast=int)
+
+# Background PDF rendering (python manage.py run_pdf_worker)
+PDF_WORKER_CONCURRENCY = config('PDF_WORKER_CONCURRENCY', default=os.cpu_count() or 1, cast=int)
+PDF_WORKER_POLL_INTERVAL = config('PDF_WORKER_POLL_INTERVAL', default=1.0, cast=float)
+PDF_WORKER_STALE_AFTER = config('PDF_WORKER_STALE_AFTER', default=300, cast=int)  # seconds
+
+# LaTeX templates are compiled with a local TeX engine when one is installed;
+# each template's preamble is precompiled into a format file in LATEX_FORMAT_DIR
+LATEX_ENABLED = config('LATEX_ENABLED', default=True, cast=bool)
+LATEX_ENGINE = config('LATEX_ENGINE', default='pdflatex')
+LATEX_WORKERS = config('LATEX_WORKERS', default=os.cpu_count() or 1, cast=int)
+LATEX_TIMEOUT = config('LATEX_TIMEOUT', default=20, cast=int)  # seconds
+LATEX_FORMAT_DIR = config('LATEX_FORMAT_DIR', default=str(BASE_DIR / 'latex_formats'))
+
+# Template gallery thumbnails (python manage.py render_template_previews),
+# rasterized with poppler's pdftoppm and stored under MEDIA_ROOT
+PREVIEW_RASTERIZER = config('PREVIEW_RASTERIZER', default='pdftoppm')
+PREVIEW_WIDTHS = [240, 480, 960]
+PREVIEW_FORMATS = ['webp', 'png']
+PREVIEW_DEFAULT_WIDTH = 480
+
+# Bulk ZIP export renders at most this many PDFs at once per request
+PDF_EXPORT_MAX_IN_FLIGHT = config('PDF_EXPORT_MAX_IN_FLIGHT', default=2 * PDF_WORKER_CONCURRENCY, cast=int)
+
+# NDJSON export reads and import writes this many resumes per query/transaction
+RESUME_NDJSON_BATCH_SIZE = config('RESUME_NDJSON_BATCH_SIZE', default=1000, cast=int)
+
+# Public resume pages (Resume.is_public) are pre-rendered on save. Shared caches
+# may keep them for PUBLIC_RESUME_MAX_AGE seconds, browsers for
+# PUBLIC_RESUME_BROWSER_MAX_AGE; set PUBLIC_RESUME_PURGE_URL to the reverse
+# proxy's base URL to send it PURGE requests when a page changes or is unpublished
+PUBLIC_RESUME_MAX_AGE = config('PUBLIC_RESUME_MAX_AGE', default=86400, cast=int)
+PUBLIC_RESUME_BROWSER_MAX_AGE = config('PUBLIC_RESUME_BROWSER_MAX_AGE', default=300, cast=int)
+PUBLIC_RESUME_PURGE_URL = config('PUBLIC_RESUME_PURGE_URL', default='')
+PUBLIC_RESUME_PURGE_TIMEOUT = config('PUBLIC_RESUME_PURGE_TIMEOUT', default=5.0, cast=float)
+
+# The template catalog is served from pre-rendered JSON, rebuilt when templates
+# change. Changes made in other processes are seen immediately with a shared
+# CACHES backend, otherwise after this many seconds
+TEMPLATE_CATALOG_MAX_AGE = config('TEMPLATE_CATALOG_MAX_AGE', default=300, cast=int)
+
+# Views declare how many SQL queries they may run with @query_budget; overruns
+# are logged to resume_app.queries, or raise when enforced (tests turn this on)
+QUERY_BUDGET_ENFORCE = config('QUERY_BUDGET_ENFORCE', default=False, cast=bool)
+
+# Autosave PATCHes to a resume within this many seconds are merged in memory
+# and written as one UPDATE (0 writes each edit immediately). Buffered edits
+# live in one process, so only enable this for a single worker or sticky sessions
+RESUME_WRITE_BUFFER_WINDOW = config('RESUME_WRITE_BUFFER_WINDOW', default=0.0, cast=float)
+
+# Template fonts are embedded from open-licensed TTF stand-ins (Carlito,
+# Liberation, Gelasio, Lora) found in these directories; families without
+# files fall back to the base-14 PDF fonts
+PDF_EMBED_FONTS = config('PDF_EMBED_FONTS', default=True, cast=bool)
+PDF_FONT_DIRS = [BASE_DIR / 'fonts', '/usr/share/fonts', '/usr/local/share/fonts']
+PDF_FONT_SUBSET_CACHE_SIZE = config('PDF_FONT_SUBSET_CACHE_SIZE', default=256, cast=int)
+
+# Outbound calls of the async social login views share one keep-alive HTTP
+# client per event loop; the provider URLs can point at a local stub
+# (python manage.py run_oauth_stub) for tests and benchmarks
+SOCIAL_AUTH_HTTP_TIMEOUT = config('SOCIAL_AUTH_HTTP_TIMEOUT', default=10.0, cast=float)  # seconds
+SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT = config('SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT', default=3.0, cast=float)
+SOCIAL_AUTH_HTTP_MAX_CONNECTIONS = config('SOCIAL_AUTH_HTTP_MAX_CONNECTIONS', default=50, cast=int)
+LINKEDIN_API_URL = config('LINKEDIN_API_URL', default='https://api.linkedin.com')
+GOOGLE_CERTS_URL = config('GOOGLE_CERTS_URL', default='https://www.googleapis.com/oauth2/v1/certs')
+
+# Google's signing certificates are cached for their Cache-Control max-age
+# (this default when absent) and refreshed in the background this many seconds
+# before expiry; expired ones are still used for STALE_IF_ERROR seconds while
+# Google is unreachable. Workers share the last set through CACHE_FILE if set
+GOOGLE_CERTS_DEFAULT_MAX_AGE = config('GOOGLE_CERTS_DEFAULT_MAX_AGE', default=300, cast=int)
+GOOGLE_CERTS_REFRESH_MARGIN = config('GOOGLE_CERTS_REFRESH_MARGIN', default=300, cast=int)
+GOOGLE_CERTS_STALE_IF_ERROR = config('GOOGLE_CERTS_STALE_IF_ERROR', default=24 * 3600, cast=int)
+GOOGLE_CERTS_CACHE_FILE = config('GOOGLE_CERTS_CACHE_FILE', default='')
+
+# Authenticated users are cached in memory per process for up to TTL seconds;
+# saves and logouts invalidate them everywhere with a shared CACHES backend.
+# With TRUST_TOKEN_CLAIMS, reads marked @trusts_token_claims take the user id
+# from the signed token without loading the user, so deactivating a user only
+# takes effect there once their access token expires
+JWT_USER_CACHE_SIZE = config('JWT_USER_CACHE_SIZE', default=10000, cast=int)
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=300, cast=int)  # seconds
+JWT_TRUST_TOKEN_CLAIMS = config('JWT_TRUST_TOKEN_CLAIMS', default=False, cast=bool)
+
+# Expired refresh tokens are deleted from the blacklist tables in batches of
+# this many rows (python manage.py prune_token_blacklist, --every to keep running)
+TOKEN_BLACKLIST_PRUNE_BATCH_SIZE = config('TOKEN_BLACKLIST_PRUNE_BATCH_SIZE', default=1000, cast=int)
+TOKEN_BLACKLIST_PRUNE_PAUSE = config('TOKEN_BLACKLIST_PRUNE_PAUSE', default=0.05, cast=float)  # seconds
+
+# Refresh checks consult in-memory fingerprints of blacklisted tokens, rebuilt every
+# INDEX_REFRESH seconds, before the database. Tokens blacklisted since the
+# last rebuild are remembered in CACHES for RECENT_TTL seconds, so with more
+# than one worker only enable this with a shared cache backend
+TOKEN_BLACKLIST_INDEX = config('TOKEN_BLACKLIST_INDEX', default=False, cast=bool)
+TOKEN_BLACKLIST_INDEX_REFRESH = config('TOKEN_BLACKLIST_INDEX_REFRESH', default=60, cast=int)  # seconds
+TOKEN_BLACKLIST_RECENT_TTL = config('TOKEN_BLACKLIST_RECENT_TTL', default=600, cast=int)  # seconds
+
+# Password logins hash on this many threads; once QUEUE_DEPTH more are
+# waiting, further logins get a 429 with Retry-After instead of queueing
+LOGIN_HASH_WORKERS = config('LOGIN_HASH_WORKERS', default=os.cpu_count() or 1, cast=int)
+LOGIN_HASH_QUEUE_DEPTH = config('LOGIN_HASH_QUEUE_DEPTH', default=4 * LOGIN_HASH_WORKERS, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,147 @@
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# Shared through the Django cache so that every worker sees a bump
+USER_VERSION_KEY = 'resume_app:auth_user:{}:version'
+
+
+def trusts_token_claims(view):
+    """Let safe requests to ``view`` build request.user from the token alone when JWT_TRUST_TOKEN_CLAIMS is on.
+
+    Only for views that use nothing but ``request.user.pk``. Apply it above
+    ``@api_view`` so that the flag sits on the final view.
+    """
+    view.trust_token_claims = True
+    return view
+
+def user_version(user_id):
+    key = USER_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Evicted or never set: start a new version rather than trusting cached users
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+def invalidate_user(user_id):
+    """Drop the cached user in every process; call after changing the user outside save()."""
+    cache.set(USER_VERSION_KEY.format(user_id), uuid.uuid4().hex, None)
+    user_cache.discard(user_id)
+
+
+class UserCache:
+    """Bounded LRU cache of authenticated users, keyed by user id and version."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != version or time.monotonic() >= entry[1]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+        # Views may change request.user, so each request gets its own copy
+        return copy.copy(entry[2])
+
+    def put(self, user_id, version, user):
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + settings.JWT_USER_CACHE_TTL, copy.copy(user))
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.JWT_USER_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'max_entries': settings.JWT_USER_CACHE_SIZE,
+            }
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that loads each user from the database once per version.
+
+    Saving or deleting a user (profile updates, admin edits, social login)
+    and logging out bump the user's version, so the next request reloads it.
+    Without a shared CACHES backend other processes see the bump once
+    JWT_USER_CACHE_TTL has passed. Views marked ``@trusts_token_claims`` skip
+    the lookup for safe methods when JWT_TRUST_TOKEN_CLAIMS is on.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.trusts_claims(request):
+            return self.get_token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def trusts_claims(self, request):
+        if not settings.JWT_TRUST_TOKEN_CLAIMS or request.method not in SAFE_METHODS:
+            return False
+        match = request.resolver_match
+        return match is not None and getattr(match.func, 'trust_token_claims', False)
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+    def get_token_user(self, validated_token):
+        """An unsaved user with only the token's user id set; enough to filter by owner."""
+        user = self.user_model(**{api_settings.USER_ID_FIELD: self._user_id(validated_token)})
+        user._state.adding = False
+        return user
+
+    def get_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        # Read before loading: a bump while the query runs leaves this entry stale, never the next one
+        version = user_version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.put(user_id, version, user)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
@@ -0,0 +1,113 @@
+import json
+import platform
+import random
+import time
+from django.utils import timezone
+from .stats import percentile
+
+SAMPLE_WORDS = (
+    'designed built led shipped migrated scaled optimized platform service pipeline '
+    'latency throughput customers revenue team reliability cloud data api frontend '
+    'backend analytics dashboard automation testing deployment security mentoring'
+).split()
+
+UNICODE_WORDS = (
+    'café naïve Zürich São Paulo Łódź Ærø Ελληνικά Москва Київ 東京 北京 서울 '
+    'résumé über façade smörgåsbord jalapeño Ñandú İstanbul Dvořák Þórsmörk'
+).split()
+
+
+def summarize(latencies):
+    """Latency percentiles (ms) and throughput for a list of durations in seconds."""
+    total = sum(latencies)
+    return {
+        'iterations': len(latencies),
+        'mean_ms': total / len(latencies) * 1000 if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'throughput_per_s': len(latencies) / total if total else 0.0,
+    }
+
+def timed(func, iterations, warmup=0):
+    """Call ``func`` repeatedly and return the duration of each timed call."""
+    for _ in range(warmup):
+        func()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+def _sentence(rng, words, length):
+    return ' '.join(rng.choice(words) for _ in range(length)).capitalize() + '.'
+
+def _text(rng, words, sentences):
+    return ' '.join(_sentence(rng, words, rng.randint(8, 20)) for _ in range(sentences))
+
+def synthetic_resume_data(entries, unicode=False, seed=0):
+    """Resume content fields with ``entries`` experience and project entries."""
+    rng = random.Random(seed)
+    words = SAMPLE_WORDS + UNICODE_WORDS if unicode else SAMPLE_WORDS
+    return {
+        'title': f'Synthetic {entries}',
+        'personal_info': {
+            'name': 'Zoë Åström-Nakamura' if unicode else 'Alex Morgan',
+            'email': 'alex@example.com',
+            'phone': '+1 555 0100',
+            'linkedin': 'linkedin.com/in/example',
+        },
+        'professional_summary': _text(rng, words, 4),
+        'experience': [
+            {
+                'id': f'exp-{i}',
+                'jobTitle': _sentence(rng, words, 3).rstrip('.'),
+                'company': _sentence(rng, words, 2).rstrip('.'),
+                'location': rng.choice(['Berlin', 'São Paulo', 'Tokyo', 'Austin']),
+                'startDate': f'{2000 + i % 20}-01',
+                'endDate': f'{2001 + i % 20}-06',
+                'description': _text(rng, words, rng.randint(3, 10)),
+            }
+            for i in range(entries)
+        ],
+        'education': [
+            {
+                'id': f'edu-{i}',
+                'degree': _sentence(rng, words, 3).rstrip('.'),
+                'institution': _sentence(rng, words, 3).rstrip('.'),
+                'location': 'Zürich' if unicode else 'Boston',
+                'graduationDate': f'{1995 + i}',
+            }
+            for i in range(max(1, entries // 10))
+        ],
+        'skills': [{'id': f'skill-{i}', 'name': rng.choice(words)} for i in range(min(entries * 3, 60))],
+        'projects': [
+            {
+                'id': f'proj-{i}',
+                'name': _sentence(rng, words, 2).rstrip('.'),
+                'description': _text(rng, words, rng.randint(2, 6)),
+                'technologies': ', '.join(rng.sample(words, 4)),
+            }
+            for i in range(entries)
+        ],
+    }
+
+def environment_info():
+    import django
+    import reportlab
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'django': django.get_version(),
+        'reportlab': reportlab.Version,
+    }
+
+def write_results(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
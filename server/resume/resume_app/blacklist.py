@@ -0,0 +1,242 @@
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+logger = logging.getLogger(__name__)
+
+# Tokens blacklisted since the last index snapshot, shared through the Django cache
+RECENT_KEY = 'resume_app:blacklisted_jti:{}'
+# Requests still writing their blacklist row when a snapshot starts must have
+# their recent entry outlive the snapshot by at least this long
+RECENT_MARGIN = 60
+FINGERPRINT_MASK = 0xFFFFFFFF
+
+
+class FingerprintSet:
+    """Sorted 32-bit fingerprints of strings: no false negatives, about n / 2**32 false positives.
+
+    Stands in for a Bloom filter: with Python's string hash the build is one
+    C-level sort, where setting Bloom bits in Python took several seconds
+    per million tokens. Fingerprints only mean something in this process.
+    """
+
+    def __init__(self, values):
+        self.fingerprints = array('I', sorted(hash(value) & FINGERPRINT_MASK for value in values))
+
+    def __len__(self):
+        return len(self.fingerprints)
+
+    def __contains__(self, value):
+        fingerprint = hash(value) & FINGERPRINT_MASK
+        i = bisect_left(self.fingerprints, fingerprint)
+        return i < len(self.fingerprints) and self.fingerprints[i] == fingerprint
+
+
+@dataclass(frozen=True)
+class BlacklistSnapshot:
+    fingerprints: FingerprintSet
+    taken_at: float  # Unix timestamp; rows committed before it are in the set
+    build_seconds: float
+
+
+def remember_blacklisted(jti, exp):
+    """Record a blacklisting for indexes whose snapshot predates it."""
+    timeout = min(settings.TOKEN_BLACKLIST_RECENT_TTL, max(int(exp - time.time()), 1))
+    cache.set(RECENT_KEY.format(jti), True, timeout)
+
+
+class BlacklistIndex:
+    """Fingerprints of the unexpired blacklisted refresh tokens, rebuilt in the background.
+
+    A token missing from the set was not blacklisted when the snapshot was
+    taken; one blacklisted since then is found through its recent entry in
+    the Django cache, so most checks never reach the database. A snapshot is
+    only trusted while those entries outlive it: with a per-process cache
+    that needs a single worker, otherwise a shared CACHES backend that does
+    not evict early. Possible hits are confirmed with the usual query.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._building = False
+        self.checks = 0
+        self.database_checks = 0
+        self.false_positives = 0
+
+    def snapshot(self):
+        """The current snapshot if it can answer checks, else None; starts a rebuild when due."""
+        snapshot = self._snapshot
+        age = time.time() - snapshot.taken_at if snapshot else None
+        if age is None or age >= settings.TOKEN_BLACKLIST_INDEX_REFRESH:
+            self._rebuild_in_background()
+        if age is None or age >= settings.TOKEN_BLACKLIST_RECENT_TTL - RECENT_MARGIN:
+            return None
+        return snapshot
+
+    def rebuild(self):
+        """Take a new snapshot of the blacklist table and swap it in."""
+        start = time.perf_counter()
+        taken_at = time.time()
+        # Expired tokens fail verification anyway, so they need no place in the set
+        jtis = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now()).values_list('token__jti', flat=True)
+        self._snapshot = BlacklistSnapshot(
+            fingerprints=FingerprintSet(jtis.iterator(chunk_size=10000)),
+            taken_at=taken_at,
+            build_seconds=time.perf_counter() - start,
+        )
+        return self._snapshot
+
+    def _rebuild_in_background(self):
+        with self._lock:
+            if self._building:
+                return
+            self._building = True
+        threading.Thread(target=self._background_rebuild, name='blacklist-index', daemon=True).start()
+
+    def _background_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception('Rebuilding the token blacklist index failed')
+        finally:
+            self._building = False
+            connection.close()
+
+    def is_blacklisted(self, jti):
+        self.checks += 1
+        snapshot = self.snapshot() if settings.TOKEN_BLACKLIST_INDEX else None
+        if snapshot is not None and jti not in snapshot.fingerprints and not cache.get(RECENT_KEY.format(jti)):
+            return False
+        self.database_checks += 1
+        blacklisted = BlacklistedToken.objects.filter(token__jti=jti).exists()
+        if snapshot is not None and not blacklisted:
+            self.false_positives += 1
+        return blacklisted
+
+    def clear(self):
+        self._snapshot = None
+        self.checks = self.database_checks = self.false_positives = 0
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'enabled': settings.TOKEN_BLACKLIST_INDEX,
+            'checks': self.checks,
+            'database_checks': self.database_checks,
+            'false_positives': self.false_positives,
+            'tokens': len(snapshot.fingerprints) if snapshot else None,
+            'index_bytes': snapshot.fingerprints.fingerprints.buffer_info()[1] * 4 if snapshot else 0,
+            'age_seconds': time.time() - snapshot.taken_at if snapshot else None,
+            'build_seconds': snapshot.build_seconds if snapshot else None,
+        }
+
+blacklist_index = BlacklistIndex()
+
+
+class IndexedRefreshToken(RefreshToken):
+    """Refresh token whose blacklist check goes through the in-memory index.
+
+    Rotation also skips the user lookups simplejwt does before touching the
+    outstanding token list: the refresh serializer has just loaded the user.
+    """
+
+    def check_blacklist(self):
+        if blacklist_index.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_('Token is blacklisted'))
+
+    def blacklist(self):
+        if settings.TOKEN_BLACKLIST_INDEX:
+            # Before the row, so a snapshot can never miss both
+            remember_blacklisted(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+        try:
+            # Recorded when it was issued, unless issued before the blacklist app
+            token = OutstandingToken.objects.get(jti=self.payload[api_settings.JTI_CLAIM])
+        except OutstandingToken.DoesNotExist:
+            return super().blacklist()
+        return BlacklistedToken.objects.get_or_create(token=token)
+
+    def outstand(self):
+        # Only called after rotation gave the token a new jti, so there is no row yet
+        return OutstandingToken.objects.create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            user_id=self.payload.get(api_settings.USER_ID_CLAIM),
+            created_at=self.current_time,
+            token=str(self),
+            expires_at=datetime_from_epoch(self.payload['exp']),
+        ), True
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = IndexedRefreshToken
+
+
+def prune_expired_tokens(batch_size=None, pause=None):
+    """Delete expired outstanding tokens and their blacklist rows in short transactions.
+
+    Batches walk the primary key, so each one touches at most ``batch_size``
+    rows and other writers wait at most one batch for the lock. Returns the
+    number of (outstanding, blacklisted) rows deleted.
+    """
+    batch_size = batch_size or settings.TOKEN_BLACKLIST_PRUNE_BATCH_SIZE
+    pause = settings.TOKEN_BLACKLIST_PRUNE_PAUSE if pause is None else pause
+    now = timezone.now()
+    outstanding = blacklisted = 0
+    last_id = 0
+    while True:
+        # Tokens expire in issue order, so expired rows sit at the start of the key range
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            blacklisted += BlacklistedToken.objects.filter(
+                token__id__range=(ids[0], ids[-1]), token__expires_at__lte=now
+            ).delete()[0]
+            outstanding += _delete_outstanding(ids[0], ids[-1], now)
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
+    return outstanding, blacklisted
+
+def _delete_outstanding(first_id, last_id, now):
+    # Their blacklist rows are gone, so one plain DELETE does; QuerySet.delete()
+    # would load the whole batch first to collect the cascade
+    opts = OutstandingToken._meta
+    expires_at = opts.get_field('expires_at')
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(opts.db_table)} WHERE {quote(opts.pk.column)} BETWEEN %s AND %s '
+            f'AND {quote(expires_at.column)} <= %s',
+            [first_id, last_id, expires_at.get_db_prep_value(now, connection)],
+        )
+        return cursor.rowcount
+
+def run_pruner(interval, batch_size=None, pause=None):
+    """Prune expired tokens every ``interval`` seconds until interrupted."""
+    while True:
+        close_old_connections()
+        start = time.perf_counter()
+        outstanding, blacklisted = prune_expired_tokens(batch_size, pause)
+        logger.info(
+            'Pruned %d outstanding and %d blacklisted tokens in %.1fs',
+            outstanding, blacklisted, time.perf_counter() - start,
+        )
+        time.sleep(interval)
@@ -0,0 +1,116 @@
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.utils import timezone
+from django.utils.text import slugify
+from .models import Resume
+from .pdf_cache import evict_pdf_cache, read_cached_pdf, resume_content_hash, store_resume_pdf
+from .pdf_jobs import create_render_pool
+from .rendering import render_resume_pdf
+
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+
+def get_export_pool():
+    """Return the process pool shared by every bulk export in this web process."""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            _export_pool = create_render_pool()
+        return _export_pool
+
+def discard_export_pool(pool):
+    """Forget a broken pool so the next export starts a fresh one."""
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is pool:
+            _export_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ZipChunkWriter:
+    """Unseekable file object that collects what ZipFile writes until it is drained."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_name(resume):
+    return f"{slugify(resume.title) or 'resume'}-{str(resume.id)[:8]}.pdf"
+
+def stream_resume_zip(resume_ids, max_in_flight=None):
+    """Yield a ZIP archive of the resumes' PDFs, adding each PDF as soon as it is ready.
+
+    At most ``max_in_flight`` renders are pending at a time, so memory stays
+    bounded by the window rather than by the number of resumes.
+    """
+    max_in_flight = max_in_flight or settings.PDF_EXPORT_MAX_IN_FLIGHT
+    pool = get_export_pool()
+    writer = ZipChunkWriter()
+    errors = []
+    pending = list(resume_ids)
+    in_flight = {}
+
+    with zipfile.ZipFile(writer, mode='w', compression=zipfile.ZIP_STORED) as archive:
+        def add(resume, data):
+            info = zipfile.ZipInfo(_archive_name(resume), date_time=timezone.localtime(resume.updated_at).timetuple()[:6])
+            archive.writestr(info, data)
+
+        while pending or in_flight:
+            # Top up the window, loading only as many rows as can be rendered now
+            room = max_in_flight - len(in_flight)
+            batch, pending = pending[:room], pending[room:]
+            resumes = Resume.objects.select_related('template').in_bulk(batch)
+            for resume_id in batch:
+                resume = resumes.get(resume_id)
+                if resume is None:
+                    continue
+                if resume.template is None:
+                    errors.append(f'{_archive_name(resume)}: No template selected for this resume')
+                    continue
+                digest = resume_content_hash(resume)
+                data = read_cached_pdf(resume, digest)
+                if data is not None:
+                    add(resume, data)
+                    yield writer.drain()
+                    continue
+                in_flight[pool.submit(render_resume_pdf, resume)] = (resume, digest)
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                resume, digest = in_flight.pop(future)
+                try:
+                    data = future.result()
+                except BrokenProcessPool:
+                    discard_export_pool(pool)
+                    raise
+                except Exception as e:
+                    errors.append(f'{_archive_name(resume)}: {e}')
+                    continue
+                store_resume_pdf(resume, digest, data)
+                add(resume, data)
+                yield writer.drain()
+
+        if errors:
+            archive.writestr('errors.txt', '\n'.join(errors) + '\n')
+        evict_pdf_cache()
+
+    yield writer.drain()
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.renderers import JSONRenderer
+from .models import ResumeTemplate
+from .serializers import ResumeTemplateSerializer
+
+# Shared through the Django cache so that every worker sees a bump
+CATALOG_VERSION_KEY = 'resume_app:template_catalog:version'
+
+
+@dataclass(frozen=True)
+class CachedJson:
+    content: bytes
+    etag: str
+    last_modified: float  # Unix timestamp
+
+
+@dataclass(frozen=True)
+class TemplateCatalog:
+    version: str
+    built_at: float
+    listing: CachedJson
+    templates: dict  # str(template id) -> CachedJson
+
+
+def _cached_json(data, last_modified):
+    content = JSONRenderer().render(data)
+    return CachedJson(
+        content=content,
+        etag='"%s"' % hashlib.sha256(content).hexdigest()[:32],
+        last_modified=last_modified,
+    )
+
+def bump_catalog_version():
+    """Mark the cached catalog stale in every process; call after changing templates."""
+    cache.set(CATALOG_VERSION_KEY, (uuid.uuid4().hex, time.time()), None)
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Evicted or never set: start a new version rather than trusting old builds
+        version = (uuid.uuid4().hex, time.time())
+        cache.add(CATALOG_VERSION_KEY, version, None)
+        version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+def build_catalog(version):
+    token, bumped_at = version
+    templates = list(ResumeTemplate.objects.all().order_by('-ats_score', 'name'))
+    data = ResumeTemplateSerializer(templates, many=True).data
+
+    # Deletes and preview updates leave updated_at alone, so the bump time counts too
+    updated = [template.updated_at.timestamp() for template in templates]
+    return TemplateCatalog(
+        version=token,
+        built_at=time.monotonic(),
+        listing=_cached_json(data, max(updated + [bumped_at])),
+        templates={
+            str(template.id): _cached_json(item, template.updated_at.timestamp())
+            for template, item in zip(templates, data)
+        },
+    )
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def _is_stale(catalog, token):
+    return (
+        catalog is None
+        or catalog.version != token
+        or time.monotonic() - catalog.built_at > settings.TEMPLATE_CATALOG_MAX_AGE
+    )
+
+def get_catalog():
+    """Return the serialized template catalog, rebuilding it when the version changes.
+
+    Without a shared cache backend, edits made by other processes (such as
+    ``populate_templates``) show up once TEMPLATE_CATALOG_MAX_AGE has passed.
+    """
+    global _catalog
+    token, _ = version = catalog_version()
+    catalog = _catalog
+    if _is_stale(catalog, token):
+        with _catalog_lock:
+            catalog = _catalog
+            if _is_stale(catalog, token):
+                catalog = _catalog = build_catalog(version)
+    return catalog
+
+def serialize_template(template):
+    """Serialize a single template the same way the catalog does."""
+    return _cached_json(ResumeTemplateSerializer(template).data, template.updated_at.timestamp())
@@ -0,0 +1,140 @@
+import os
+import re
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileRange:
+    """Read-only view of ``length`` bytes of a file starting at ``start``."""
+
+    def __init__(self, fileobj, start, length):
+        self._file = fileobj
+        self._remaining = length
+        fileobj.seek(start)
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def file_size(fileobj):
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    return size
+
+def parse_range(header, size):
+    """Return ``(start, end)`` for a single ``bytes=`` range, ``None`` to ignore it.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        # Multiple ranges or other units: fall back to the full body
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError('Empty suffix range')
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError('Range not satisfiable')
+    return start, end
+
+def not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match')
+    return bool(if_none_match) and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match))
+
+def pdf_file_response(request, fileobj, filename, etag):
+    """Stream a PDF from an open file, answering conditional and byte-range requests.
+
+    Takes ownership of ``fileobj``; FileResponse closes it once the body is sent.
+    """
+    if not_modified(request, etag):
+        fileobj.close()
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    size = file_size(fileobj)
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    # A stale If-Range means the client's partial copy is outdated, so send everything
+    if range_header and (not if_range or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            fileobj.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(fileobj, content_type='application/pdf', as_attachment=True, filename=filename)
+        response['Content-Length'] = size
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(fileobj, start, end - start + 1),
+            status=206, content_type='application/pdf', as_attachment=True, filename=filename,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
+
+def cached_json_response(request, cached):
+    """Send pre-rendered JSON with validators, or a 304 when the client's copy is current."""
+    response = get_conditional_response(request, etag=cached.etag, last_modified=int(cached.last_modified))
+    if response is None:
+        response = HttpResponse(cached.content, content_type='application/json')
+        response['Content-Length'] = len(cached.content)
+    response['ETag'] = cached.etag
+    response['Last-Modified'] = http_date(cached.last_modified)
+    # Shared caches may store it but must revalidate, which the ETag makes cheap
+    response['Cache-Control'] = 'public, no-cache'
+    return response
+
+async def iterate_in_thread(iterator):
+    """Serve a blocking iterator to an async response one chunk at a time.
+
+    Django's ASGI handler reads a synchronous StreamingHttpResponse to the
+    end before sending it, which would hold the whole body in memory.
+    """
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(iterator, None)) is not None:
+            yield chunk
+    finally:
+        if hasattr(iterator, 'close'):
+            await sync_to_async(iterator.close)()
+
+def streaming_content(request, iterator):
+    """The body of a StreamingHttpResponse generated by ``iterator``, streamed chunk by chunk under ASGI too."""
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        return iterate_in_thread(iterator)
+    return iterator
@@ -0,0 +1,137 @@
+import os
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace
+
+# CSS font families and the open-licensed, metric-compatible TTF families
+# that stand in for them: (registered name, {variant: file name})
+EMBEDDED_FONTS = {
+    'Calibri': ('Carlito', {
+        'normal': 'Carlito-Regular.ttf',
+        'bold': 'Carlito-Bold.ttf',
+        'italic': 'Carlito-Italic.ttf',
+        'boldItalic': 'Carlito-BoldItalic.ttf',
+    }),
+    'Arial': ('LiberationSans', {
+        'normal': 'LiberationSans-Regular.ttf',
+        'bold': 'LiberationSans-Bold.ttf',
+        'italic': 'LiberationSans-Italic.ttf',
+        'boldItalic': 'LiberationSans-BoldItalic.ttf',
+    }),
+    'Times New Roman': ('LiberationSerif', {
+        'normal': 'LiberationSerif-Regular.ttf',
+        'bold': 'LiberationSerif-Bold.ttf',
+        'italic': 'LiberationSerif-Italic.ttf',
+        'boldItalic': 'LiberationSerif-BoldItalic.ttf',
+    }),
+    'Georgia': ('Gelasio', {
+        'normal': 'Gelasio-Regular.ttf',
+        'bold': 'Gelasio-Bold.ttf',
+        'italic': 'Gelasio-Italic.ttf',
+        'boldItalic': 'Gelasio-BoldItalic.ttf',
+    }),
+    'Lora': ('Lora', {
+        'normal': 'Lora-Regular.ttf',
+        'bold': 'Lora-Bold.ttf',
+        'italic': 'Lora-Italic.ttf',
+        'boldItalic': 'Lora-BoldItalic.ttf',
+    }),
+}
+
+_registered = {}
+_registry_lock = threading.Lock()
+_font_files = None
+
+
+class CachedTTFontFace(TTFontFace):
+    """TrueType face that keeps built glyph subsets between documents.
+
+    Documents with the same characters produce the same subsets, so repeat
+    renders skip re-reading glyph tables. The lock also serializes the
+    face's internal read position, which is not thread-safe.
+    """
+
+    def __init__(self, filename, validate=0, subfontIndex=0):
+        super().__init__(filename, validate=validate, subfontIndex=subfontIndex)
+        self._subsets = OrderedDict()
+        self._subsets_lock = threading.Lock()
+
+    def makeSubset(self, subset):
+        key = tuple(subset)
+        with self._subsets_lock:
+            data = self._subsets.get(key)
+            if data is not None:
+                self._subsets.move_to_end(key)
+                return data
+            data = super().makeSubset(subset)
+            self._subsets[key] = data
+            while len(self._subsets) > settings.PDF_FONT_SUBSET_CACHE_SIZE:
+                self._subsets.popitem(last=False)
+            return data
+
+
+class CachedTTFont(TTFont):
+    def __init__(self, name, filename, **kwargs):
+        super().__init__(name, filename, **kwargs)
+        self.face = CachedTTFontFace(filename, subfontIndex=kwargs.get('subfontIndex', 0))
+
+
+def _index_font_files():
+    """Map TTF file names to paths across PDF_FONT_DIRS (first directory wins)."""
+    files = {}
+    for directory in settings.PDF_FONT_DIRS:
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if name.lower().endswith('.ttf'):
+                    files.setdefault(name, os.path.join(root, name))
+    return files
+
+def register_font_family(css_family):
+    """Register the TTF stand-in for a CSS family once per process; None if its files are missing."""
+    if css_family in _registered:
+        return _registered[css_family]
+
+    global _font_files
+    with _registry_lock:
+        if css_family in _registered:
+            return _registered[css_family]
+        if _font_files is None:
+            _font_files = _index_font_files()
+
+        family, variants = EMBEDDED_FONTS[css_family]
+        paths = {variant: _font_files.get(filename) for variant, filename in variants.items()}
+        if not paths['normal']:
+            _registered[css_family] = None
+            return None
+
+        names = {}
+        for variant, path in paths.items():
+            # Missing styles fall back to the regular face
+            names[variant] = f'{family}-{variant}' if path else f'{family}-normal'
+            if path:
+                pdfmetrics.registerFont(CachedTTFont(names[variant], path))
+
+        addMapping(family, 0, 0, names['normal'])
+        addMapping(family, 1, 0, names['bold'])
+        addMapping(family, 0, 1, names['italic'])
+        addMapping(family, 1, 1, names['boldItalic'])
+        _registered[css_family] = names['normal']
+        return names['normal']
+
+def resolve_font(font_family):
+    """ReportLab font name for a CSS font-family: an embedded TTF when available, else None."""
+    if not settings.PDF_EMBED_FONTS:
+        return None
+    primary_font = font_family.split(',')[0].strip().strip('"\'')
+    if primary_font not in EMBEDDED_FONTS:
+        return None
+    return register_font_family(primary_font)
+
+def available_font_families():
+    """CSS families that currently render with embedded fonts; part of the PDF cache key."""
+    if not settings.PDF_EMBED_FONTS:
+        return []
+    return sorted(family for family in EMBEDDED_FONTS if register_font_family(family))
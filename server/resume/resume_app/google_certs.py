@@ -0,0 +1,202 @@
+import base64
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# A forced refresh for an unknown key id happens at most this often, so
+# tokens with made-up key ids cannot turn into a stream of fetches
+FORCED_REFRESH_INTERVAL = 60
+# Wait before retrying after a failed fetch, doubling up to the maximum
+RETRY_MIN, RETRY_MAX = 5, 300
+
+
+class CertificateFetchError(Exception):
+    """No usable signing certificates: the fetch failed and nothing is cached."""
+
+
+def _b64_int(value):
+    return int.from_bytes(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)), 'big')
+
+def parse_certs(payload):
+    """``{key id: PEM}`` from Google's PEM endpoint (v1) or a JWKS document (v3)."""
+    if isinstance(payload, dict) and isinstance(payload.get('keys'), list):
+        certs = {}
+        for key in payload['keys']:
+            if key.get('kty') != 'RSA' or 'kid' not in key:
+                continue
+            public_key = rsa.RSAPublicNumbers(_b64_int(key['e']), _b64_int(key['n'])).public_key()
+            certs[key['kid']] = public_key.public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            ).decode('ascii')
+        return certs
+    if isinstance(payload, dict) and all(isinstance(value, str) for value in payload.values()):
+        return dict(payload)
+    raise ValueError('Unrecognized certificate document')
+
+def freshness_lifetime(headers, default):
+    """Seconds a response stays fresh, from Cache-Control max-age less Age, else Expires."""
+    cache_control = headers.get('Cache-Control', '')
+    if re.search(r'\b(no-store|no-cache)\b', cache_control):
+        return 0
+    match = re.search(r'\bmax-age=(\d+)', cache_control)
+    if match:
+        age = int(headers['Age']) if headers.get('Age', '').isdigit() else 0
+        return max(int(match.group(1)) - age, 0)
+    if 'Expires' in headers:
+        try:
+            return max(parsedate_to_datetime(headers['Expires']).timestamp() - time.time(), 0)
+        except (TypeError, ValueError):
+            return 0
+    return default
+
+
+class GoogleCertCache:
+    """Google's token signing certificates, kept in memory and refreshed ahead of expiry.
+
+    ``peek()`` and ``certs()`` answer from memory while the certificates are
+    fresh. Within GOOGLE_CERTS_REFRESH_MARGIN of expiry one background refresh
+    starts while the current set is still served, so logins only wait on the
+    network when nothing usable is cached. With GOOGLE_CERTS_CACHE_FILE set, workers share
+    the last fetched set through that file. When a fetch fails, expired
+    certificates are served for up to GOOGLE_CERTS_STALE_IF_ERROR seconds.
+    """
+
+    def __init__(self):
+        self._certs = None
+        self._expires_at = 0.0
+        self._retry_at = 0.0
+        self._retry_delay = RETRY_MIN
+        self._forced_at = 0.0
+        # Held for whole fetches; peek() never takes it
+        self._fetch_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._client = None
+
+    def clear(self):
+        with self._fetch_lock:
+            self._certs, self._expires_at, self._retry_at, self._forced_at = None, 0.0, 0.0, 0.0
+
+    def peek(self, require_kid=None):
+        """The cached certificates when they can be used without waiting on the network, else None."""
+        now = time.time()
+        if self._certs is None or now >= self._expires_at:
+            return None
+        if require_kid is not None and require_kid not in self._certs:
+            return None
+        if now >= self._expires_at - settings.GOOGLE_CERTS_REFRESH_MARGIN:
+            self._refresh_in_background()
+        return self._certs
+
+    def certs(self, require_kid=None):
+        """Current ``{key id: PEM}``, fetching if needed; ``require_kid`` refreshes once for a rotated key."""
+        certs = self.peek(require_kid)
+        if certs is not None:
+            return certs
+
+        now = time.time()
+        if self._certs is None or now >= self._expires_at:
+            self._load_file()
+        if self._certs is None or now >= self._expires_at:
+            self._refresh()
+        elif require_kid is not None and require_kid not in self._certs and now - self._forced_at >= FORCED_REFRESH_INTERVAL:
+            self._forced_at = now
+            self._refresh(force=True)
+
+        if self._certs is None:
+            raise CertificateFetchError('Google signing certificates are unavailable')
+        if time.time() >= self._expires_at + settings.GOOGLE_CERTS_STALE_IF_ERROR:
+            raise CertificateFetchError('Cached Google signing certificates are too old to trust')
+        return self._certs
+
+    def _refresh(self, force=False):
+        expires_at = self._expires_at
+        with self._fetch_lock:
+            # Another caller refreshed while this one waited for the lock
+            if self._expires_at != expires_at and not force:
+                return
+            # Inside the retry window after a failure, fail fast instead of
+            # making every waiting login sit through another timeout
+            if time.time() < self._retry_at:
+                return
+            self._fetch()
+
+    def _refresh_in_background(self):
+        if self._refreshing or time.time() < self._retry_at:
+            return
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name='google-certs', daemon=True).start()
+
+    def _background_refresh(self):
+        try:
+            with self._fetch_lock:
+                # Another worker may already have refreshed the shared file
+                self._load_file()
+                if time.time() < self._expires_at - settings.GOOGLE_CERTS_REFRESH_MARGIN:
+                    return
+                self._fetch()
+        finally:
+            self._refreshing = False
+
+    def _fetch(self):
+        # Called with _fetch_lock held
+        try:
+            if self._client is None:
+                self._client = httpx.Client(timeout=settings.SOCIAL_AUTH_HTTP_TIMEOUT)
+            response = self._client.get(settings.GOOGLE_CERTS_URL)
+            response.raise_for_status()
+            certs = parse_certs(response.json())
+        except (httpx.HTTPError, ValueError) as e:
+            self._retry_at = time.time() + self._retry_delay
+            self._retry_delay = min(self._retry_delay * 2, RETRY_MAX)
+            logger.warning('Fetching Google signing certificates failed (%s); retrying in %ds', e, self._retry_at - time.time())
+            return
+
+        lifetime = freshness_lifetime(response.headers, settings.GOOGLE_CERTS_DEFAULT_MAX_AGE)
+        self._certs, self._expires_at = certs, time.time() + lifetime
+        self._retry_at, self._retry_delay = 0.0, RETRY_MIN
+        self._save_file()
+
+    def _load_file(self):
+        path = settings.GOOGLE_CERTS_CACHE_FILE
+        if not path:
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                cached = json.load(f)
+            certs, expires_at = cached['certs'], float(cached['expires_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if expires_at > self._expires_at:
+            self._certs, self._expires_at = certs, expires_at
+
+    def _save_file(self):
+        path = settings.GOOGLE_CERTS_CACHE_FILE
+        if not path:
+            return
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix='.google-certs-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'certs': self._certs, 'expires_at': self._expires_at}, f)
+            # Readers in other workers see either the old file or the new one
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning('Could not write %s: %s', path, e)
+
+
+google_cert_cache = GoogleCertCache()
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 at PASSWORD_PBKDF2_ITERATIONS rounds.
+
+    It keeps the pbkdf2_sha256 algorithm name, so hashes made at any other
+    cost still verify and are rewritten at the configured cost on login.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
@@ -0,0 +1,316 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from django.conf import settings
+
+LATEX_SPECIAL_CHARS = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    # OT1 fonts put other glyphs in the slots of these three
+    '<': r'\textless{}',
+    '>': r'\textgreater{}',
+    '|': r'\textbar{}',
+}
+
+# Resume list macros shared by every LaTeX template; compiled into the format file
+RESUME_MACROS = r'''
+\newcommand{\resumeItem}[1]{\item\small{#1 \vspace{-2pt}}}
+\newcommand{\resumeSubheading}[4]{
+  \vspace{-2pt}\item
+    \begin{tabular*}{0.97\textwidth}[t]{l@{\extracolsep{\fill}}r}
+      \textbf{#1} & #2 \\
+      \textit{\small#3} & \textit{\small #4} \\
+    \end{tabular*}\vspace{-7pt}
+}
+\newcommand{\resumeProjectHeading}[2]{
+    \item
+    \begin{tabular*}{0.97\textwidth}{l@{\extracolsep{\fill}}r}
+      \small#1 & #2 \\
+    \end{tabular*}\vspace{-7pt}
+}
+\newcommand{\resumeSubHeadingListStart}{\begin{itemize}[leftmargin=0.15in, label={}]}
+\newcommand{\resumeSubHeadingListEnd}{\end{itemize}}
+\newcommand{\resumeItemListEnd}{\end{itemize}\vspace{-5pt}}
+'''
+
+# Section names used in layout_config['sections_order'] and their LaTeX builders
+LATEX_SECTIONS = {}
+
+_latex_pool = None
+_latex_pool_lock = threading.Lock()
+_format_locks = {}
+_format_locks_lock = threading.Lock()
+_worker_state = threading.local()
+
+
+class LatexError(RuntimeError):
+    """The TeX engine could not typeset the document."""
+
+
+def latex_escape(value):
+    """Escape user text so it is typeset literally."""
+    return ''.join(LATEX_SPECIAL_CHARS.get(char, char) for char in str(value or ''))
+
+@lru_cache(maxsize=None)
+def _engine_installed(engine):
+    return shutil.which(engine) is not None
+
+def latex_available():
+    return settings.LATEX_ENABLED and _engine_installed(settings.LATEX_ENGINE)
+
+def uses_latex(template):
+    """Whether this template is rendered by the TeX engine instead of ReportLab."""
+    return template.is_latex_template and latex_available()
+
+def _package_line(package):
+    if isinstance(package, dict):
+        options = ','.join(package.get('options', []))
+        return f"\\usepackage[{options}]{{{package['name']}}}" if options else f"\\usepackage{{{package['name']}}}"
+    return f'\\usepackage{{{package}}}'
+
+def build_preamble(latex_styles):
+    """Everything before \\begin{document}; identical for all resumes of a template."""
+    layout = latex_styles.get('layout_config', {})
+    options = ','.join(latex_styles.get('document_options', ['letterpaper', '10pt']))
+    lines = [f"\\documentclass[{options}]{{{latex_styles.get('document_class', 'article')}}}"]
+    lines += [_package_line(package) for package in latex_styles.get('packages', [])]
+
+    packages = {p['name'] if isinstance(p, dict) else p for p in latex_styles.get('packages', [])}
+    # The resume macros rely on these even when a template does not list them
+    for required in ('enumitem', 'titlesec', 'color'):
+        if required not in packages:
+            lines.append(f'\\usepackage{{{required}}}')
+
+    lines.append(r'\pagestyle{empty}')
+    for dimension, amount in layout.get('margins', {}).items():
+        lines.append(f'\\addtolength{{\\{dimension}}}{{{amount}}}')
+
+    section = layout.get('section_formatting', {})
+    title_format = section.get('title_format', r'\large\bfseries\scshape\raggedright')
+    lines.append(f'\\titleformat{{\\section}}{{\\vspace{{-4pt}}{title_format}}}{{}}{{0em}}{{}}[\\color{{black}}\\titlerule \\vspace{{-5pt}}]')
+    spacing = section.get('spacing', '').split()
+    if len(spacing) == 3:
+        lines.append(f'\\titlespacing*{{\\section}}{{{spacing[0]}}}{{{spacing[1]}}}{{{spacing[2]}}}')
+
+    bullet = layout.get('bullet_style', r'\textbullet')
+    lines.append(f'\\newcommand{{\\resumeItemListStart}}{{\\begin{{itemize}}[label={{{bullet}}}]}}')
+    lines.append(r'\raggedbottom')
+    lines.append(r'\raggedright')
+    lines.append(r'\setlength{\tabcolsep}{0in}')
+    lines.append(RESUME_MACROS)
+    return '\n'.join(lines) + '\n'
+
+def _bullets(text):
+    items = [line.strip(' •-*\t') for line in str(text or '').splitlines()]
+    items = [item for item in items if item]
+    if not items:
+        return []
+    lines = [r'\resumeItemListStart']
+    lines += [f'\\resumeItem{{{latex_escape(item)}}}' for item in items]
+    lines.append(r'\resumeItemListEnd')
+    return lines
+
+def latex_section(name):
+    def register(builder):
+        LATEX_SECTIONS[name] = builder
+        return builder
+    return register
+
+@latex_section('personalInfo')
+def build_heading(resume):
+    info = resume.personal_info
+    contact = [latex_escape(info[key]) for key in ('phone', 'email', 'linkedin', 'github', 'website') if info.get(key)]
+    lines = [r'\begin{center}']
+    if info.get('name'):
+        lines.append(f"\\textbf{{\\Huge \\scshape {latex_escape(info['name'])}}} \\\\ \\vspace{{1pt}}")
+    if contact:
+        lines.append(r'\small ' + r' $|$ '.join(contact))
+    lines.append(r'\end{center}')
+    return lines
+
+@latex_section('summary')
+def build_summary(resume):
+    if not resume.professional_summary:
+        return []
+    return [r'\section{Summary}', r'\small{' + latex_escape(resume.professional_summary) + '}']
+
+@latex_section('education')
+def build_education(resume):
+    if not resume.education:
+        return []
+    lines = [r'\section{Education}', r'\resumeSubHeadingListStart']
+    for edu in resume.education:
+        lines.append(
+            f"\\resumeSubheading{{{latex_escape(edu.get('institution'))}}}{{{latex_escape(edu.get('location'))}}}"
+            f"{{{latex_escape(edu.get('degree'))}}}{{{latex_escape(edu.get('graduationDate'))}}}"
+        )
+    lines.append(r'\resumeSubHeadingListEnd')
+    return lines
+
+@latex_section('experience')
+def build_experience(resume):
+    if not resume.experience:
+        return []
+    lines = [r'\section{Experience}', r'\resumeSubHeadingListStart']
+    for exp in resume.experience:
+        dates = f"{exp.get('startDate', '')} -- {exp.get('endDate', '')}"
+        lines.append(
+            f"\\resumeSubheading{{{latex_escape(exp.get('jobTitle'))}}}{{{latex_escape(dates)}}}"
+            f"{{{latex_escape(exp.get('company'))}}}{{{latex_escape(exp.get('location'))}}}"
+        )
+        lines += _bullets(exp.get('description'))
+    lines.append(r'\resumeSubHeadingListEnd')
+    return lines
+
+@latex_section('projects')
+def build_projects(resume):
+    if not resume.projects:
+        return []
+    lines = [r'\section{Projects}', r'\resumeSubHeadingListStart']
+    for proj in resume.projects:
+        heading = f"\\textbf{{{latex_escape(proj.get('name'))}}}"
+        if proj.get('technologies'):
+            heading += f" $|$ \\emph{{{latex_escape(proj['technologies'])}}}"
+        lines.append(f'\\resumeProjectHeading{{{heading}}}{{}}')
+        lines += _bullets(proj.get('description'))
+    lines.append(r'\resumeSubHeadingListEnd')
+    return lines
+
+@latex_section('skills')
+def build_skills(resume):
+    names = [latex_escape(skill.get('name')) for skill in resume.skills if skill.get('name')]
+    if not names:
+        return []
+    return [
+        r'\section{Technical Skills}',
+        r'\begin{itemize}[leftmargin=0.15in, label={}]',
+        r'\small{\item{' + ', '.join(names) + r'}}',
+        r'\end{itemize}',
+    ]
+
+def build_body(resume):
+    """The document body for one resume, in the template's section order."""
+    sections_order = resume.template.layout_config.get('sections_order', ['personalInfo', 'education', 'experience', 'projects', 'skills'])
+    lines = [r'\begin{document}']
+    for section in sections_order:
+        builder = LATEX_SECTIONS.get(section)
+        if builder:
+            lines += builder(resume)
+    lines.append(r'\end{document}')
+    return '\n'.join(lines) + '\n'
+
+def _run_engine(args, cwd, env=None):
+    return subprocess.run(
+        args, cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT, timeout=settings.LATEX_TIMEOUT, check=False,
+    )
+
+def ensure_format(preamble):
+    """Precompile the preamble into a format file and return its name, or None if that failed.
+
+    Formats are content-addressed by the preamble, so a template edit simply
+    produces a new format next to the old one.
+    """
+    name = 'resume-' + hashlib.sha256(preamble.encode('utf-8')).hexdigest()[:16]
+    format_dir = str(settings.LATEX_FORMAT_DIR)
+    path = os.path.join(format_dir, f'{name}.fmt')
+    if os.path.exists(path):
+        return name
+
+    with _format_locks_lock:
+        lock = _format_locks.setdefault(name, threading.Lock())
+    with lock:
+        if os.path.exists(path):
+            return name
+        os.makedirs(format_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=format_dir) as workdir:
+            with open(os.path.join(workdir, 'preamble.tex'), 'w', encoding='utf-8') as f:
+                f.write(preamble + '\\begin{document}\n\\end{document}\n')
+            # mylatexformat dumps the state reached at \begin{document}
+            try:
+                result = _run_engine(
+                    [settings.LATEX_ENGINE, '-ini', '-interaction=nonstopmode', '-halt-on-error',
+                     f'-jobname={name}', f'&{settings.LATEX_ENGINE}', 'mylatexformat.ltx', 'preamble.tex'],
+                    cwd=workdir,
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                return None
+            built = os.path.join(workdir, f'{name}.fmt')
+            if result.returncode != 0 or not os.path.exists(built):
+                return None
+            os.replace(built, path)
+    return name
+
+def _worker_dir():
+    if not hasattr(_worker_state, 'workdir'):
+        _worker_state.workdir = tempfile.mkdtemp(prefix='latex-worker-')
+    return _worker_state.workdir
+
+def _warm_worker():
+    # Each worker keeps one scratch directory instead of creating one per render
+    _worker_dir()
+
+def compile_latex(preamble, body):
+    """Compile a document in this worker's scratch directory and return the PDF bytes."""
+    workdir = _worker_dir()
+    format_name = ensure_format(preamble)
+    args = [settings.LATEX_ENGINE, '-interaction=nonstopmode', '-halt-on-error', '-no-shell-escape', '-jobname=resume']
+    env = None
+    if format_name:
+        # Only the body is typeset; the preamble is loaded from the format
+        args.append(f'-fmt={format_name}')
+        env = dict(os.environ, TEXFORMATS=f'{settings.LATEX_FORMAT_DIR}{os.pathsep}')
+    args.append('resume.tex')
+
+    with open(os.path.join(workdir, 'resume.tex'), 'w', encoding='utf-8') as f:
+        f.write(preamble + body)
+    try:
+        result = _run_engine(args, cwd=workdir, env=env)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise LatexError(f'LaTeX compilation failed: {e}') from e
+    pdf_path = os.path.join(workdir, 'resume.pdf')
+    if result.returncode != 0 or not os.path.exists(pdf_path):
+        log = result.stdout.decode('utf-8', 'replace')[-2000:]
+        raise LatexError(f'LaTeX compilation failed: {log}')
+    with open(pdf_path, 'rb') as pdf:
+        data = pdf.read()
+    os.remove(pdf_path)
+    return data
+
+def get_latex_pool():
+    """Bounded pool of pre-warmed threads, each driving one TeX process at a time."""
+    global _latex_pool
+    with _latex_pool_lock:
+        if _latex_pool is None:
+            _latex_pool = ThreadPoolExecutor(
+                max_workers=settings.LATEX_WORKERS,
+                thread_name_prefix='latex',
+                initializer=_warm_worker,
+            )
+        return _latex_pool
+
+def warm_latex_formats(templates):
+    """Build the format file of every LaTeX template ahead of the first request."""
+    return {template.name: ensure_format(build_preamble(template.latex_styles)) for template in templates}
+
+def write_latex_pdf(resume, output):
+    """Render a LaTeX template resume into a writable file object; raises LatexError if TeX fails.
+
+    Nothing is written to ``output`` when compilation fails.
+    """
+    preamble = build_preamble(resume.template.latex_styles)
+    body = build_body(resume)
+    output.write(get_latex_pool().submit(compile_latex, preamble, body).result())
@@ -0,0 +1,117 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from resume_app.benchmarks import environment_info, load_results, summarize, synthetic_resume_data, write_results
+from resume_app.models import Resume, ResumeTemplate
+
+# (name, path, query string); {resume} and {template} are filled in per run
+CASES = [
+    ('resume_list', '/api/auth/resumes/', ''),
+    ('resume_list', '/api/auth/resumes/', 'fields=id,title'),
+    ('resume_detail', '/api/auth/resumes/{resume}/', ''),
+    ('resume_detail', '/api/auth/resumes/{resume}/', 'exclude=template_details'),
+    ('resume_detail', '/api/auth/resumes/{resume}/', 'exclude=template_details.css_styles,template_details.latex_styles,template_details.layout_config'),
+    ('resume_detail', '/api/auth/resumes/{resume}/', 'fields=id,title,personal_info,template_details.name'),
+    ('template_list', '/api/auth/templates/', ''),
+    ('template_list', '/api/auth/templates/', 'fields=id,name,template_type,preview_image,ats_score,is_premium'),
+    ('template_detail', '/api/auth/templates/{template}/', ''),
+    ('template_detail', '/api/auth/templates/{template}/', 'fields=id,name,preview_image'),
+]
+
+class Command(BaseCommand):
+    help = 'Measure response size, query count, DB time and latency of the read API with and without sparse fieldsets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=20, help='Synthetic resumes owned by the benchmark user')
+        parser.add_argument('--entries', type=int, default=10, help='Experience/project entries per resume')
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per case')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        template = ResumeTemplate.objects.order_by('-ats_score', 'name').first()
+        if template is None:
+            self.stderr.write('No templates found; run populate_templates first')
+            return
+
+        # Everything created here is rolled back at the end
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                username='benchmark-api-user', email='benchmark-api@example.com', first_name='Bench', last_name='Mark'
+            )
+            resumes = [
+                Resume.objects.create(user=user, template=template, **synthetic_resume_data(options['entries'], seed=i))
+                for i in range(options['resumes'])
+            ]
+            client = APIClient()
+            client.force_authenticate(user)
+
+            cases = []
+            for name, path, query in CASES:
+                url = path.format(resume=resumes[0].id, template=template.id)
+                cases.append(self.run_case(client, name, url, query, options['iterations']))
+            transaction.set_rollback(True)
+
+        results = {'environment': environment_info(), 'cases': cases}
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(cases)} cases to {options['output']}"))
+        if options['compare']:
+            self.compare(load_results(options['compare']), results)
+
+    def time_query(self, durations):
+        # The query log rounds to milliseconds, too coarse for single-row reads
+        def wrapper(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                durations.append(time.perf_counter() - start)
+        return wrapper
+
+    def run_case(self, client, name, url, query, iterations):
+        full_url = f'{url}?{query}' if query else url
+        client.get(full_url)  # warm caches
+
+        # With DEBUG on the query log is capped and may already be full
+        reset_queries()
+        db_time = []
+        with CaptureQueriesContext(connection) as queries, connection.execute_wrapper(self.time_query(db_time)):
+            response = client.get(full_url)
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            client.get(full_url)
+            latencies.append(time.perf_counter() - start)
+
+        case = {
+            'endpoint': name,
+            'query': query,
+            'status': response.status_code,
+            'response_bytes': len(response.content),
+            'queries': len(queries.captured_queries),
+            'db_ms': sum(db_time) * 1000,
+            **summarize(latencies),
+        }
+        self.stdout.write(
+            f"{name:<16} {case['response_bytes']:>8}B queries={case['queries']:<2} db={case['db_ms']:6.2f}ms "
+            f"p50={case['p50_ms']:7.2f}ms p95={case['p95_ms']:7.2f}ms  {query or '(all fields)'}"
+        )
+        return case
+
+    def compare(self, baseline, results):
+        key = lambda case: (case['endpoint'], case['query'])
+        previous = {key(case): case for case in baseline['cases']}
+        self.stdout.write('\nChange versus baseline (negative is better):')
+        for case in results['cases']:
+            old = previous.get(key(case))
+            if not old:
+                continue
+            deltas = [
+                f"{metric}={(case[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0:+6.1f}%"
+                for metric in ('response_bytes', 'queries', 'p50_ms', 'p95_ms')
+            ]
+            self.stdout.write(f"{case['endpoint']:<16} " + ' '.join(deltas) + f"  {case['query'] or '(all fields)'}")
@@ -0,0 +1,95 @@
+import itertools
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from resume_app.authentication import CachedJWTAuthentication, user_cache
+from resume_app.benchmarks import environment_info, summarize, synthetic_resume_data, timed, write_results
+from resume_app.models import Resume
+from resume_app.query_budget import QueryStats
+
+# (name, authentication class, JWT_TRUST_TOKEN_CLAIMS)
+MODES = [
+    ('stock', JWTAuthentication, False),
+    ('cached', CachedJWTAuthentication, False),
+    ('claims', CachedJWTAuthentication, True),
+]
+
+# The resume list trusts token claims, the profile needs the full user
+CASES = [
+    ('profile', '/api/auth/profile/'),
+    ('resume_list', '/api/auth/resumes/?fields=id,title'),
+]
+
+class Command(BaseCommand):
+    help = 'Requests per second and queries per request of JWT-authenticated reads with the stock and cached authentication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='Users whose tokens the requests cycle through')
+        parser.add_argument('--requests', type=int, default=2000, help='Timed requests per case and mode')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        # Everything created here is rolled back at the end
+        with transaction.atomic():
+            tokens = []
+            for i in range(options['users']):
+                user = get_user_model().objects.create_user(
+                    username=f'benchmark-auth-{i}', email=f'benchmark-auth-{i}@example.com'
+                )
+                Resume.objects.create(user=user, **synthetic_resume_data(2, seed=i))
+                tokens.append(str(AccessToken.for_user(user)))
+
+            results = []
+            for case, path in CASES:
+                view = resolve(path.split('?')[0]).func.cls
+                original = view.authentication_classes
+                try:
+                    for mode, authentication, trust_claims in MODES:
+                        # Function views fix their authentication classes when decorated
+                        view.authentication_classes = [authentication]
+                        with override_settings(JWT_TRUST_TOKEN_CLAIMS=trust_claims):
+                            results.append(self.run_case(case, path, mode, tokens, options['requests']))
+                finally:
+                    view.authentication_classes = original
+            transaction.set_rollback(True)
+
+        for result in results:
+            stock = next(r for r in results if r['case'] == result['case'] and r['mode'] == 'stock')
+            result['speedup'] = result['requests_per_s'] / stock['requests_per_s']
+            self.stdout.write(
+                f"{result['case']:<12} {result['mode']:<7} {result['requests_per_s']:8.1f} req/s "
+                f"x{result['speedup']:.2f} queries={result['queries']:.2f} "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms"
+            )
+
+        if options['output']:
+            write_results(options['output'], {'environment': environment_info(), 'users': options['users'], 'cases': results})
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+
+    def run_case(self, case, path, mode, tokens, requests):
+        user_cache.clear()
+        # localhost passes the DEBUG host check without touching ALLOWED_HOSTS
+        clients = itertools.cycle([
+            APIClient(SERVER_NAME='localhost', HTTP_AUTHORIZATION=f'Bearer {token}') for token in tokens
+        ])
+        # One pass over every user warms the cache, as a steady stream of requests would
+        for _ in tokens:
+            response = next(clients).get(path)
+            if response.status_code != 200:
+                raise CommandError(f'{path} answered {response.status_code} with {mode} authentication')
+        queries = QueryStats()
+        with connection.execute_wrapper(queries):
+            latencies = timed(lambda: next(clients).get(path), requests)
+        stats = summarize(latencies)
+        return {
+            'case': case,
+            'mode': mode,
+            'requests_per_s': stats['throughput_per_s'],
+            'queries': queries.count / requests,
+            **stats,
+        }
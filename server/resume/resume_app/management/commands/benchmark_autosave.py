@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from rest_framework.test import APIClient
+from resume_app.benchmarks import environment_info, load_results, summarize, synthetic_resume_data, write_results
+from resume_app.models import Resume, ResumeTemplate
+from resume_app.write_buffer import write_buffer
+
+class Command(BaseCommand):
+    help = 'Load test autosave PATCH bursts against update_resume, with or without the write buffer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=float, help='RESUME_WRITE_BUFFER_WINDOW for this run (0 disables buffering)')
+        parser.add_argument('--clients', type=int, default=4, help='Concurrent editor sessions')
+        parser.add_argument('--edits', type=int, default=200, help='PATCH requests per client')
+        parser.add_argument('--shared', action='store_true', help='All clients edit one resume instead of one each')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        if options['window'] is not None:
+            settings.RESUME_WRITE_BUFFER_WINDOW = options['window']
+
+        user = get_user_model().objects.create_user(
+            username='benchmark-autosave-user', email='benchmark-autosave@example.com'
+        )
+        try:
+            template = ResumeTemplate.objects.order_by('-ats_score', 'name').first()
+            resumes = [
+                Resume.objects.create(user=user, template=template, **synthetic_resume_data(5, seed=i))
+                for i in range(1 if options['shared'] else options['clients'])
+            ]
+            results = self.run(user, resumes, options)
+            self.verify(resumes, options)
+        finally:
+            user.delete()
+
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        if options['compare']:
+            baseline = load_results(options['compare'])
+            for metric in ('edits_per_s', 'p50_ms', 'p95_ms'):
+                old, new = baseline[metric], results[metric]
+                self.stdout.write(f"{metric}: {old:.2f} -> {new:.2f} ({(new - old) / old * 100 if old else 0.0:+.1f}%)")
+
+    def run(self, user, resumes, options):
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def editor(client_index):
+            client = APIClient()
+            client.force_authenticate(user)
+            resume = resumes[client_index % len(resumes)]
+            url = f'/api/auth/resumes/{resume.id}/update/'
+            mine = []
+            try:
+                for edit in range(options['edits']):
+                    # Typing into one summary field, like the editor's autosave
+                    body = json.dumps({'professional_summary': f'client {client_index} edit {edit}'})
+                    start = time.perf_counter()
+                    response = client.patch(url, data=body, content_type='application/merge-patch+json')
+                    mine.append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        errors.append(response.status_code)
+            finally:
+                close_old_connections()
+                with lock:
+                    latencies.extend(mine)
+
+        threads = [threading.Thread(target=editor, args=(i,)) for i in range(options['clients'])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        write_buffer.flush()
+        elapsed = time.perf_counter() - start
+
+        results = {
+            'environment': environment_info(),
+            'window_s': settings.RESUME_WRITE_BUFFER_WINDOW,
+            'clients': options['clients'],
+            'shared': options['shared'],
+            'errors': len(errors),
+            'edits_per_s': len(latencies) / elapsed if elapsed else 0.0,
+            **summarize(latencies),
+        }
+        self.stdout.write(
+            f"window={results['window_s']}s clients={results['clients']} shared={results['shared']} "
+            f"edits/s={results['edits_per_s']:.1f} p50={results['p50_ms']:.2f}ms p95={results['p95_ms']:.2f}ms "
+            f"p99={results['p99_ms']:.2f}ms errors={results['errors']}"
+        )
+        return results
+
+    def verify(self, resumes, options):
+        # Every resume must hold the last edit once the buffer is flushed
+        for index, resume in enumerate(resumes):
+            resume.refresh_from_db()
+            if not options['shared'] and resume.professional_summary != f"client {index} edit {options['edits'] - 1}":
+                self.stderr.write(f'Resume {resume.id} lost edits: {resume.professional_summary!r}')
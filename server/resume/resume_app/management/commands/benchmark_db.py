@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+from collections import Counter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.utils import timezone
+from resume_app.benchmarks import environment_info, load_results, summarize, synthetic_resume_data, write_results
+from resume_app.models import Resume
+
+class Command(BaseCommand):
+    help = (
+        'Concurrent autosave and PDF-read load against the configured database. '
+        'Run once per configuration (e.g. DB_ENGINE=postgresql, or SQLITE_PRAGMAS=0 '
+        'DB_CONN_MAX_AGE=0 for the untuned SQLite baseline) and compare the JSON results'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads')
+        parser.add_argument('--ops', type=int, default=300, help='Operations per thread')
+        parser.add_argument('--resumes', type=int, default=4, help='Resumes the threads contend on')
+        parser.add_argument('--read-ratio', type=float, default=0.3, help='Share of operations that are PDF-style reads')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(
+            username='benchmark-db-user', email='benchmark-db@example.com'
+        )
+        try:
+            resumes = [
+                Resume.objects.create(user=user, **synthetic_resume_data(5, seed=i)).pk
+                for i in range(options['resumes'])
+            ]
+            results = self.run(resumes, options)
+        finally:
+            close_old_connections()
+            user.delete()
+
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        if options['compare']:
+            baseline = load_results(options['compare'])
+            for metric in ('writes_per_s', 'ops_per_s', 'p50_ms', 'p95_ms', 'errors', 'connections'):
+                old, new = baseline[metric], results[metric]
+                self.stdout.write(f"{metric}: {old:.2f} -> {new:.2f} ({(new - old) / old * 100 if old else 0.0:+.1f}%)")
+
+    def run(self, resumes, options):
+        latencies, errors, opened = [], Counter(), Counter()
+        writes = Counter()
+        lock = threading.Lock()
+
+        def on_connect(sender, **kwargs):
+            with lock:
+                opened['connections'] += 1
+
+        def autosave(pk, n):
+            # Read-then-write in one transaction, like update_resume's version check
+            with transaction.atomic():
+                version = Resume.objects.filter(pk=pk).values_list('version', flat=True).get()
+                Resume.objects.filter(pk=pk, version=version).update(
+                    professional_summary=f'edit {n}', version=F('version') + 1, updated_at=timezone.now()
+                )
+
+        def pdf_read(pk, n):
+            # Load the whole row to render it, then touch the PDF cache's LRU stamp
+            list(Resume.objects.filter(pk=pk))
+            Resume.objects.filter(pk=pk).update(pdf_accessed_at=timezone.now())
+
+        def worker(index):
+            rng = random.Random(index)
+            mine, failed, wrote = [], Counter(), 0
+            try:
+                for n in range(options['ops']):
+                    # Each operation is one request: connections are reused or
+                    # closed according to CONN_MAX_AGE, exactly as between requests
+                    close_old_connections()
+                    operation = pdf_read if rng.random() < options['read_ratio'] else autosave
+                    start = time.perf_counter()
+                    try:
+                        operation(rng.choice(resumes), n)
+                        wrote += 1
+                    except DatabaseError as e:
+                        failed[str(e).splitlines()[0][:60]] += 1
+                    mine.append(time.perf_counter() - start)
+                    close_old_connections()
+            finally:
+                connection.close()
+                with lock:
+                    latencies.extend(mine)
+                    errors.update(failed)
+                    writes['ok'] += wrote
+
+        connection_created.connect(on_connect)
+        try:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            connection_created.disconnect(on_connect)
+
+        settings_dict = connection.settings_dict
+        results = {
+            'environment': environment_info(),
+            'vendor': connection.vendor,
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'options': dict(settings_dict['OPTIONS']),
+            'threads': options['threads'],
+            'errors': sum(errors.values()),
+            'error_types': dict(errors),
+            'connections': opened['connections'],
+            # Every operation writes at least once; failed ones are not counted
+            'writes_per_s': writes['ok'] / elapsed if elapsed else 0.0,
+            'ops_per_s': len(latencies) / elapsed if elapsed else 0.0,
+            **summarize(latencies),
+        }
+        self.stdout.write(
+            f"{results['vendor']} conn_max_age={results['conn_max_age']} threads={results['threads']} "
+            f"writes/s={results['writes_per_s']:.1f} p50={results['p50_ms']:.2f}ms p95={results['p95_ms']:.2f}ms "
+            f"p99={results['p99_ms']:.2f}ms errors={results['errors']} connections={results['connections']}"
+        )
+        for message, count in errors.most_common():
+            self.stdout.write(self.style.WARNING(f'  {count} x {message}'))
+        return results
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.test import Client
+from resume_app.benchmarks import environment_info, load_results, summarize, write_results
+from resume_app.passwords import password_pool
+from resume_app.social_auth import issue_tokens
+
+EMAIL_DOMAIN = 'benchmark-login.test'
+PASSWORD = 'benchmark-login-password'
+PROBE_PATH = '/api/auth/templates/'
+
+
+class Command(BaseCommand):
+    help = (
+        'Login spike with a cheap endpoint probed alongside: the async login on the bounded '
+        'hashing pool through the ASGI application, or authenticate() on a fixed set of sync workers'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=['pool', 'blocking'], default='pool')
+        parser.add_argument('--logins', type=int, default=100, help='Total logins')
+        parser.add_argument('--concurrency', type=int, default=32, help='Logins in flight at once')
+        parser.add_argument('--workers', type=int, default=4, help='Sync worker threads in blocking mode')
+        parser.add_argument('--users', type=int, default=20, help='Distinct accounts')
+        parser.add_argument('--iterations', type=int, help='PBKDF2 iterations (default: PASSWORD_PBKDF2_ITERATIONS)')
+        parser.add_argument('--probe-interval', type=float, default=0.05, help='Seconds between probes of the cheap endpoint')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        if options['iterations']:
+            settings.PASSWORD_PBKDF2_ITERATIONS = options['iterations']
+        # One hash shared by every account keeps seeding cheap
+        encoded = make_password(PASSWORD)
+        User = get_user_model()
+        User.objects.bulk_create([
+            User(username=f'login{i}', email=f'login{i}@{EMAIL_DOMAIN}', password=encoded)
+            for i in range(options['users'])
+        ])
+        emails = [f'login{i % options["users"]}@{EMAIL_DOMAIN}' for i in range(options['logins'])]
+        try:
+            run = self.run_pool if options['mode'] == 'pool' else self.run_blocking
+            start = time.perf_counter()
+            logins, statuses, probes = run(emails, options)
+            elapsed = time.perf_counter() - start
+        finally:
+            User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+
+        login_stats = summarize(logins)
+        probe_stats = summarize(probes)
+        results = {
+            'environment': environment_info(),
+            'mode': options['mode'],
+            'iterations': settings.PASSWORD_PBKDF2_ITERATIONS,
+            'concurrency': options['concurrency'],
+            'workers': options['workers'] if options['mode'] == 'blocking' else settings.LOGIN_HASH_WORKERS,
+            'statuses': {str(code): statuses.count(code) for code in sorted(set(statuses))},
+            'logins_per_s': statuses.count(200) / elapsed if elapsed else 0.0,
+            'login_p50_ms': login_stats['p50_ms'],
+            'login_p95_ms': login_stats['p95_ms'],
+            'probes': len(probes),
+            'probe_p50_ms': probe_stats['p50_ms'],
+            'probe_p95_ms': probe_stats['p95_ms'],
+            'probe_p99_ms': probe_stats['p99_ms'],
+        }
+        if options['mode'] == 'pool':
+            results['retries'] = self.retries
+            results['pool'] = password_pool.stats()
+        self.stdout.write(
+            f"{results['mode']} workers={results['workers']} concurrency={results['concurrency']} "
+            f"logins/s={results['logins_per_s']:.1f} login p50={results['login_p50_ms']:.0f}ms "
+            f"p95={results['login_p95_ms']:.0f}ms statuses={results['statuses']} | {PROBE_PATH} "
+            f"p50={results['probe_p50_ms']:.1f}ms p95={results['probe_p95_ms']:.1f}ms p99={results['probe_p99_ms']:.1f}ms"
+        )
+        if options['mode'] == 'pool':
+            pool = results['pool']
+            self.stdout.write(
+                f"  hash p50={pool['hash_p50_ms']:.0f}ms p95={pool['hash_p95_ms']:.0f}ms "
+                f"queue wait p50={pool['wait_p50_ms']:.0f}ms p95={pool['wait_p95_ms']:.0f}ms 429s retried={results['retries']}"
+            )
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        if options['compare']:
+            baseline = load_results(options['compare'])
+            for metric in ('logins_per_s', 'login_p95_ms', 'probe_p50_ms', 'probe_p95_ms', 'probe_p99_ms'):
+                old, new = baseline[metric], results[metric]
+                self.stdout.write(f"{metric}: {old:.2f} -> {new:.2f} ({(new - old) / old * 100 if old else 0.0:+.1f}%)")
+
+    def run_pool(self, emails, options):
+        logins, statuses, probes, retries = [], [], [], []
+
+        async def main():
+            transport = httpx.ASGITransport(app=get_asgi_application())
+            semaphore = asyncio.Semaphore(options['concurrency'])
+            async with httpx.AsyncClient(transport=transport, base_url='http://localhost', timeout=None) as client:
+                done = asyncio.Event()
+
+                async def login(email):
+                    async with semaphore:
+                        start = time.perf_counter()
+                        # Clients honour Retry-After, so every login completes eventually
+                        while True:
+                            response = await client.post('/api/auth/login/', json={'email': email, 'password': PASSWORD})
+                            if response.status_code != 429:
+                                break
+                            retries.append(email)
+                            await asyncio.sleep(float(response.headers['Retry-After']))
+                        logins.append(time.perf_counter() - start)
+                        statuses.append(response.status_code)
+
+                async def probe():
+                    while not done.is_set():
+                        start = time.perf_counter()
+                        await client.get(PROBE_PATH)
+                        probes.append(time.perf_counter() - start)
+                        await asyncio.sleep(options['probe_interval'])
+
+                prober = asyncio.create_task(probe())
+                await asyncio.gather(*(login(email) for email in emails))
+                done.set()
+                await prober
+
+        asyncio.run(main())
+        self.retries = len(retries)
+        return logins, statuses, probes
+
+    def run_blocking(self, emails, options):
+        # The previous login: authenticate() on the request thread of one of a
+        # fixed number of sync workers, which the probes have to queue for too
+        def login(email, submitted_at):
+            user = authenticate(email=email, password=PASSWORD)
+            if user is not None:
+                issue_tokens(user)
+            return time.perf_counter() - submitted_at, 200 if user is not None else 401
+
+        client = Client(SERVER_NAME='localhost')
+
+        def probe(submitted_at):
+            client.get(PROBE_PATH)
+            return time.perf_counter() - submitted_at
+
+        probes = []
+        with ThreadPoolExecutor(options['workers']) as workers:
+            done = threading.Event()
+
+            def submit_probes():
+                while not done.is_set():
+                    probes.append(workers.submit(probe, time.perf_counter()))
+                    time.sleep(options['probe_interval'])
+
+            prober = threading.Thread(target=submit_probes)
+            prober.start()
+            # Clients keep at most --concurrency logins outstanding
+            with ThreadPoolExecutor(options['concurrency']) as clients:
+                outcomes = list(clients.map(lambda email: workers.submit(login, email, time.perf_counter()).result(), emails))
+            done.set()
+            prober.join()
+            probes = [future.result() for future in probes]
+        return [latency for latency, _ in outcomes], [code for _, code in outcomes], probes
@@ -0,0 +1,95 @@
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from resume_app.benchmarks import environment_info, synthetic_resume_data, write_results
+from resume_app.models import Resume, ResumeTemplate
+from resume_app.ndjson import import_resumes_ndjson, stream_resumes_ndjson
+
+EMAIL_DOMAIN = 'benchmark-ndjson.test'
+
+class Command(BaseCommand):
+    help = (
+        'Resumes per second of the NDJSON bulk import and export, against creating '
+        'resumes one create_resume call at a time. Everything is rolled back at the end'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=100_000, help='Resumes in the imported file')
+        parser.add_argument('--users', type=int, default=100, help='Owners the resumes are spread over')
+        parser.add_argument('--entries', type=int, default=3, help='Experience and project entries per resume')
+        parser.add_argument('--batch-size', type=int, help='Resumes per transaction (default: RESUME_NDJSON_BATCH_SIZE)')
+        parser.add_argument('--baseline', type=int, default=500, help='Resumes created through create_resume for comparison')
+        parser.add_argument('--memory', action='store_true', help='Also trace peak Python memory of a second export')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        template = ResumeTemplate.objects.first()
+        if template is None:
+            raise CommandError('No templates; run populate_templates first')
+        results = {'environment': environment_info(), 'resumes': options['resumes']}
+        with tempfile.TemporaryDirectory() as directory, transaction.atomic():
+            users = get_user_model().objects.bulk_create([
+                get_user_model()(username=f'ndjson{i}', email=f'ndjson{i}@{EMAIL_DOMAIN}')
+                for i in range(options['users'])
+            ])
+            path = os.path.join(directory, 'resumes.ndjson')
+            with open(path, 'w') as f:
+                # A handful of distinct documents keeps generating the file cheap
+                samples = [synthetic_resume_data(options['entries'], seed=i) for i in range(50)]
+                for i in range(options['resumes']):
+                    line = {'user': users[i % len(users)].email, 'template': str(template.id), **samples[i % len(samples)]}
+                    f.write(json.dumps(line) + '\n')
+            results['file_mb'] = os.path.getsize(path) / 2**20
+
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                report = import_resumes_ndjson(f, batch_size=options['batch_size'])
+            results['import_seconds'] = time.perf_counter() - start
+            if report.failed:
+                raise CommandError(f'{report.failed} lines failed to import: {report.errors[:3]}')
+            results['import_per_s'] = report.imported / results['import_seconds']
+            self.stdout.write(
+                f"import: {report.imported} resumes ({results['file_mb']:.0f} MB) in "
+                f"{results['import_seconds']:.1f}s, {results['import_per_s']:.0f}/s"
+            )
+
+            resumes = Resume.objects.filter(user__email__endswith='@' + EMAIL_DOMAIN)
+            start = time.perf_counter()
+            exported = sum(chunk.count(b'\n') for chunk in stream_resumes_ndjson(resumes, batch_size=options['batch_size']))
+            results['export_seconds'] = time.perf_counter() - start
+            results['export_per_s'] = exported / results['export_seconds']
+            self.stdout.write(f"export: {exported} resumes in {results['export_seconds']:.1f}s, {results['export_per_s']:.0f}/s")
+            if options['memory']:
+                tracemalloc.start()
+                for _ in stream_resumes_ndjson(resumes, batch_size=options['batch_size']):
+                    pass
+                results['export_peak_mb'] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+                self.stdout.write(f"export peak Python memory: {results['export_peak_mb']:.1f} MB")
+
+            if options['baseline']:
+                client = APIClient(SERVER_NAME='localhost', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(users[0])}')
+                start = time.perf_counter()
+                for i in range(options['baseline']):
+                    data = {'template': str(template.id), **samples[i % len(samples)]}
+                    response = client.post('/api/auth/resumes/create/', data, format='json')
+                    if response.status_code != 201:
+                        raise CommandError(f'create_resume answered {response.status_code}')
+                results['create_resume_per_s'] = options['baseline'] / (time.perf_counter() - start)
+                results['speedup'] = results['import_per_s'] / results['create_resume_per_s']
+                self.stdout.write(
+                    f"create_resume: {results['create_resume_per_s']:.0f}/s, so {options['resumes']} resumes would take "
+                    f"{options['resumes'] / results['create_resume_per_s']:.0f}s; import is x{results['speedup']:.1f}"
+                )
+            transaction.set_rollback(True)
+
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
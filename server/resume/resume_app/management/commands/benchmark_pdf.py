@@ -0,0 +1,106 @@
+import tracemalloc
+from tempfile import SpooledTemporaryFile
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from resume_app.benchmarks import (
+    environment_info, load_results, summarize, synthetic_resume_data, timed, write_results
+)
+from resume_app.fonts import available_font_families
+from resume_app.models import Resume, ResumeTemplate
+from resume_app.rendering import flowable_cache, write_resume_pdf
+from .populate_templates import TEMPLATES_DATA
+
+class Command(BaseCommand):
+    help = 'Benchmark the PDF render path of generate_resume_pdf against a synthetic resume corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,5,20,50', help='Comma separated experience/project entry counts')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed renders per case')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed renders per case')
+        parser.add_argument('--template', action='append', help='Only benchmark templates with this name (repeatable)')
+        parser.add_argument('--cold', action='store_true', help='Clear the flowable cache before every render')
+        parser.add_argument(
+            '--fonts', choices=['base14', 'embedded'], default='embedded',
+            help='Render with the base-14 PDF fonts or the embedded TTF fonts (compare the two with --output/--compare)'
+        )
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print p50/p95 deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',') if size]
+        settings.PDF_EMBED_FONTS = options['fonts'] == 'embedded'
+        if settings.PDF_EMBED_FONTS:
+            families = available_font_families()
+            self.stdout.write(f"Embedded fonts: {', '.join(families) if families else 'none found in PDF_FONT_DIRS'}")
+        templates = [
+            # Unsaved rows shaped exactly like the ones populate_templates installs
+            ResumeTemplate(updated_at=timezone.now(), **data)
+            for data in TEMPLATES_DATA
+            if not options['template'] or data['name'] in options['template']
+        ]
+
+        cases = []
+        for template in templates:
+            for entries in sizes:
+                for unicode in (False, True):
+                    resume = Resume(template=template, **synthetic_resume_data(entries, unicode=unicode))
+                    cases.append(self.run_case(resume, entries, unicode, options))
+
+        results = {
+            'environment': environment_info(),
+            'flowable_cache': 'cold' if options['cold'] else 'warm',
+            'fonts': options['fonts'],
+            'cases': cases,
+        }
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(cases)} cases to {options['output']}"))
+        if options['compare']:
+            self.compare(load_results(options['compare']), results)
+
+    def render(self, resume, cold=False):
+        if cold:
+            flowable_cache.clear()
+        # Same path as a cache miss in generate_resume_pdf
+        with SpooledTemporaryFile(max_size=settings.PDF_SPOOL_MAX_BYTES) as spool:
+            write_resume_pdf(resume, spool)
+            return spool.tell()
+
+    def run_case(self, resume, entries, unicode, options):
+        latencies = timed(lambda: self.render(resume, options['cold']), options['iterations'], options['warmup'])
+
+        # Measured separately because tracing slows the timed renders down
+        tracemalloc.start()
+        size = self.render(resume, options['cold'])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        case = {
+            'template': resume.template.name,
+            'entries': entries,
+            'unicode': unicode,
+            'pdf_bytes': size,
+            'peak_memory_kb': peak / 1024,
+            **summarize(latencies),
+        }
+        self.stdout.write(
+            f"{case['template']:<24} entries={entries:<3} unicode={unicode!s:<5} "
+            f"p50={case['p50_ms']:8.2f}ms p95={case['p95_ms']:8.2f}ms p99={case['p99_ms']:8.2f}ms "
+            f"{case['throughput_per_s']:7.1f}/s peak={case['peak_memory_kb']:9.1f}KiB"
+        )
+        return case
+
+    def compare(self, baseline, results):
+        key = lambda case: (case['template'], case['entries'], case['unicode'])
+        previous = {key(case): case for case in baseline['cases']}
+        self.stdout.write('\nChange versus baseline (negative is faster):')
+        for case in results['cases']:
+            old = previous.get(key(case))
+            if not old:
+                continue
+            deltas = [
+                f"{metric}={(case[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0:+6.1f}%"
+                for metric in ('p50_ms', 'p95_ms', 'peak_memory_kb')
+            ]
+            self.stdout.write(f"{case['template']:<24} entries={case['entries']:<3} unicode={case['unicode']!s:<5} " + ' '.join(deltas))
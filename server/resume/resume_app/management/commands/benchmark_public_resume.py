@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from resume_app.benchmarks import environment_info, summarize, synthetic_resume_data, timed, write_results
+from resume_app.models import Resume, ResumeTemplate
+from resume_app.pdf_cache import open_resume_pdf
+from resume_app.public_pages import public_cache_control, render_public_html, wait_for_public_pages
+from resume_app.rendering import render_resume_pdf
+
+class Command(BaseCommand):
+    help = (
+        'Requests per second of the public resume pages served from their pre-rendered copies and '
+        'revalidated with If-None-Match, next to the render cost every request would add without them'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=10, help='Experience and project entries in the resume')
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per case')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        template = ResumeTemplate.objects.filter(is_latex_template=False).first()
+        if template is None:
+            raise CommandError('No templates; run populate_templates first')
+        user = get_user_model().objects.create_user(username='benchmark-public', email='benchmark-public@example.com')
+        try:
+            resume = Resume.objects.create(
+                user=user, template=template, is_public=True, **synthetic_resume_data(options['entries'])
+            )
+            wait_for_public_pages()
+            # The PDF worker would normally have rendered it after the save
+            open_resume_pdf(resume)[1].close()
+            results = self.run_cases(resume, options['requests'])
+        finally:
+            user.delete()
+            wait_for_public_pages()
+
+        for result in results:
+            self.stdout.write(
+                f"{result['case']:<16} {result['requests_per_s']:9.1f} req/s "
+                f"p50={result['p50_ms']:.2f}ms p95={result['p95_ms']:.2f}ms"
+            )
+        if options['output']:
+            write_results(options['output'], {
+                'environment': environment_info(),
+                'entries': options['entries'],
+                'cache_control': public_cache_control(),
+                'cases': results,
+            })
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+
+    def run_cases(self, resume, requests):
+        client = Client(SERVER_NAME='localhost')
+        paths = {
+            'html': f'/api/auth/public/resumes/{resume.pk}/',
+            'pdf': f'/api/auth/public/resumes/{resume.pk}/pdf/',
+        }
+        etags = {}
+        for kind, path in paths.items():
+            response = client.get(path)
+            if response.status_code != 200:
+                raise CommandError(f'{path} answered {response.status_code}')
+            etags[kind] = response['ETag']
+
+        def get(path, **headers):
+            response = client.get(path, **headers)
+            # Read the body, as a client would
+            b''.join(response.streaming_content) if response.streaming else response.content
+
+        cases = [
+            # Rendering alone, on top of the request handling measured by the other cases
+            ('html_render', lambda: render_public_html(resume)),
+            ('pdf_render', lambda: render_resume_pdf(resume)),
+            ('html_cached', lambda: get(paths['html'])),
+            ('pdf_cached', lambda: get(paths['pdf'])),
+            ('html_revalidate', lambda: get(paths['html'], HTTP_IF_NONE_MATCH=etags['html'])),
+            ('pdf_revalidate', lambda: get(paths['pdf'], HTTP_IF_NONE_MATCH=etags['pdf'])),
+        ]
+        results = []
+        for case, func in cases:
+            # PDF renders are slow enough that fewer of them give the same picture
+            iterations = max(requests // 10, 10) if case == 'pdf_render' else requests
+            stats = summarize(timed(func, iterations, warmup=5))
+            results.append({'case': case, 'requests_per_s': stats['throughput_per_s'], **stats})
+        return results
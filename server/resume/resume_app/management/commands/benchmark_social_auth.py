@@ -0,0 +1,132 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import requests
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token
+from resume_app.benchmarks import environment_info, load_results, summarize, write_results
+from resume_app.oauth_stub import STUB_EMAIL_DOMAIN, OAuthStub
+from resume_app.social_auth import social_login
+
+AUDIENCE = 'oauth-stub-client'
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the social login views against a local provider stub: the async views '
+        'through the ASGI application, or the previous blocking call pattern on a thread pool'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--provider', choices=['linkedin', 'google'], default='linkedin')
+        parser.add_argument('--mode', choices=['async', 'blocking'], default='async')
+        parser.add_argument('--concurrency', type=int, default=16, help='Logins in flight; in blocking mode, the number of sync worker threads')
+        parser.add_argument('--logins', type=int, default=400, help='Total logins')
+        parser.add_argument('--users', type=int, default=50, help='Distinct identities; repeat logins find the existing user')
+        parser.add_argument('--latency', type=float, default=0.05, help='Stub provider latency per call, in seconds')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+        parser.add_argument('--compare', help='Print deltas against a previous JSON result file')
+
+    def handle(self, *args, **options):
+        stub = OAuthStub(latency=options['latency']).start()
+        settings.LINKEDIN_API_URL = stub.base_url
+        settings.GOOGLE_CERTS_URL = stub.certs_url
+        settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY = AUDIENCE
+        try:
+            if options['provider'] == 'linkedin':
+                tokens = [f'user{i}' for i in range(options['users'])]
+            else:
+                tokens = [stub.google_id_token(f'user{i}@{STUB_EMAIL_DOMAIN}', AUDIENCE) for i in range(options['users'])]
+            logins = [tokens[i % len(tokens)] for i in range(options['logins'])]
+
+            run = self.run_async if options['mode'] == 'async' else self.run_blocking
+            start = time.perf_counter()
+            latencies, errors = run(stub, logins, options)
+            elapsed = time.perf_counter() - start
+            provider_calls = stub.requests
+        finally:
+            stub.stop()
+            get_user_model().objects.filter(email__endswith=f'@{STUB_EMAIL_DOMAIN}').delete()
+
+        results = {
+            'environment': environment_info(),
+            'provider': options['provider'],
+            'mode': options['mode'],
+            'concurrency': options['concurrency'],
+            'latency_s': options['latency'],
+            'errors': errors,
+            'provider_calls': provider_calls,
+            'logins_per_s': len(latencies) / elapsed if elapsed else 0.0,
+            **summarize(latencies),
+        }
+        self.stdout.write(
+            f"{results['provider']} {results['mode']} concurrency={results['concurrency']} "
+            f"logins/s={results['logins_per_s']:.1f} p50={results['p50_ms']:.2f}ms p95={results['p95_ms']:.2f}ms "
+            f"p99={results['p99_ms']:.2f}ms errors={errors} provider_calls={provider_calls}"
+        )
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        if options['compare']:
+            baseline = load_results(options['compare'])
+            for metric in ('logins_per_s', 'p50_ms', 'p95_ms'):
+                old, new = baseline[metric], results[metric]
+                self.stdout.write(f"{metric}: {old:.2f} -> {new:.2f} ({(new - old) / old * 100 if old else 0.0:+.1f}%)")
+
+    def run_async(self, stub, logins, options):
+        path = f"/api/auth/{options['provider']}/"
+        field = 'access_token' if options['provider'] == 'linkedin' else 'credential'
+        latencies, errors = [], 0
+
+        async def main():
+            nonlocal errors
+            transport = httpx.ASGITransport(app=get_asgi_application())
+            semaphore = asyncio.Semaphore(options['concurrency'])
+            async with httpx.AsyncClient(transport=transport, base_url='http://localhost') as client:
+                async def login(token):
+                    nonlocal errors
+                    async with semaphore:
+                        start = time.perf_counter()
+                        response = await client.post(path, json={field: token})
+                        latencies.append(time.perf_counter() - start)
+                        if response.status_code != 200:
+                            errors += 1
+                await asyncio.gather(*(login(token) for token in logins))
+
+        asyncio.run(main())
+        return latencies, errors
+
+    def run_blocking(self, stub, logins, options):
+        # The call pattern the views had before: sequential blocking requests
+        # without a shared session, holding a worker thread for every round trip
+        def linkedin(token):
+            headers = {'Authorization': f'Bearer {token}'}
+            profile = requests.get(f'{stub.base_url}/v2/people/~:(id,firstName,lastName)', headers=headers, timeout=10)
+            email = requests.get(f'{stub.base_url}/v2/emailAddress?q=members', headers=headers, timeout=10)
+            address = email.json()['elements'][0]['handle~']['emailAddress']
+            first_name = profile.json()['firstName']['localized']['en_US']
+            return async_to_sync(social_login)('linkedin', address, address, first_name=first_name)
+
+        def google(token):
+            idinfo = id_token.verify_token(token, google_requests.Request(), AUDIENCE, certs_url=stub.certs_url)
+            return async_to_sync(social_login)('google', idinfo['email'], idinfo['email'].split('@')[0])
+
+        authenticate = linkedin if options['provider'] == 'linkedin' else google
+
+        def login(token):
+            start = time.perf_counter()
+            try:
+                authenticate(token)
+                return time.perf_counter() - start, 0
+            except Exception:
+                return time.perf_counter() - start, 1
+
+        with ThreadPoolExecutor(options['concurrency']) as pool:
+            outcomes = list(pool.map(login, logins))
+        return [latency for latency, _ in outcomes], sum(error for _, error in outcomes)
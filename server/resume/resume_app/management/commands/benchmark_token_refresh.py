@@ -0,0 +1,144 @@
+import time
+import uuid
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from resume_app.benchmarks import environment_info, summarize, write_results
+from resume_app.blacklist import blacklist_index, prune_expired_tokens
+from resume_app.query_budget import QueryStats
+
+SEED_PREFIX = 'benchmark-refresh-'
+
+class Command(BaseCommand):
+    help = (
+        'Token refresh throughput against a large blacklist, with and without the in-memory index, '
+        'and the time to prune its expired rows. Seeded rows are kept between runs unless --cleanup'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Blacklisted tokens in the table')
+        parser.add_argument('--expired', type=float, default=0.5, help='Share of seeded tokens already expired')
+        parser.add_argument('--refreshes', type=int, default=500, help='Timed refreshes per mode')
+        parser.add_argument('--prune', action='store_true', help='Also time pruning the expired rows')
+        parser.add_argument('--cleanup', action='store_true', help='Delete the seeded rows at the end')
+        parser.add_argument('--output', help='Write results as JSON to this path')
+
+    def handle(self, *args, **options):
+        self.seed(options['rows'], options['expired'])
+        user = get_user_model().objects.create_user(
+            username='benchmark-refresh-user', email='benchmark-refresh@example.com'
+        )
+        results = {
+            'environment': environment_info(),
+            'vendor': connection.vendor,
+            'rows': BlacklistedToken.objects.count(),
+            'modes': [],
+        }
+        try:
+            for indexed in (False, True):
+                with override_settings(TOKEN_BLACKLIST_INDEX=indexed):
+                    results['modes'].append(self.run_mode(user, indexed, options['refreshes']))
+        finally:
+            user.delete()
+
+        if options['prune']:
+            start = time.perf_counter()
+            outstanding, blacklisted = prune_expired_tokens()
+            results['prune'] = {
+                'outstanding': outstanding,
+                'blacklisted': blacklisted,
+                'seconds': time.perf_counter() - start,
+            }
+            self.stdout.write(
+                f"prune: {outstanding} outstanding and {blacklisted} blacklisted rows in {results['prune']['seconds']:.1f}s"
+            )
+        if options['cleanup']:
+            OutstandingToken.objects.filter(jti__startswith=SEED_PREFIX).delete()
+
+        if options['output']:
+            write_results(options['output'], results)
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+
+    def seed(self, rows, expired_share):
+        missing = rows - OutstandingToken.objects.filter(jti__startswith=SEED_PREFIX).count()
+        if missing <= 0:
+            return
+        self.stdout.write(f'Seeding {missing} blacklisted tokens...')
+        outstanding = connection.ops.quote_name(OutstandingToken._meta.db_table)
+        blacklisted = connection.ops.quote_name(BlacklistedToken._meta.db_table)
+        now = timezone.now()
+        expired_before = int(missing * expired_share)
+        chunk = 10000
+        for offset in range(0, missing, chunk):
+            values = []
+            for i in range(offset, min(offset + chunk, missing)):
+                # Oldest first, as real tokens are issued
+                expires_at = now + timedelta(days=-1 if i < expired_before else 1)
+                values.append((SEED_PREFIX + uuid.uuid4().hex, '', expires_at - timedelta(days=1), expires_at))
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {outstanding} (jti, token, created_at, expires_at) VALUES (%s, %s, %s, %s)', values
+                )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {blacklisted} (token_id, blacklisted_at) '
+                f'SELECT o.id, o.created_at FROM {outstanding} o LEFT JOIN {blacklisted} b ON b.token_id = o.id '
+                f'WHERE b.id IS NULL AND o.jti LIKE %s',
+                [SEED_PREFIX + '%'],
+            )
+
+    def run_mode(self, user, indexed, refreshes):
+        blacklist_index.clear()
+        cache.clear()
+        if indexed:
+            blacklist_index.rebuild()
+        client = APIClient(SERVER_NAME='localhost')
+        token = previous = str(RefreshToken.for_user(user))
+
+        def refresh():
+            nonlocal token, previous
+            response = client.post('/api/auth/token/refresh/', {'refresh': token}, format='json')
+            if response.status_code != 200:
+                raise CommandError(f'Refresh failed with {response.status_code}: {response.content[:200]!r}')
+            previous, token = token, response.json()['refresh']
+
+        refresh()
+        queries = QueryStats()
+        latencies = []
+        with connection.execute_wrapper(queries):
+            for _ in range(refreshes):
+                start = time.perf_counter()
+                refresh()
+                latencies.append(time.perf_counter() - start)
+        # The token rotated away last must still be refused
+        replay = client.post('/api/auth/token/refresh/', {'refresh': previous}, format='json')
+        if replay.status_code != 401:
+            raise CommandError(f'Replayed refresh token answered {replay.status_code}')
+        stats = summarize(latencies)
+        index = blacklist_index.stats()
+        result = {
+            'indexed': indexed,
+            'refreshes_per_s': stats['throughput_per_s'],
+            'queries': queries.count / refreshes,
+            'db_ms': queries.duration / refreshes * 1000,
+            'database_checks': index['database_checks'],
+            'index_tokens': index['tokens'],
+            'index_bytes': index['index_bytes'],
+            'index_build_seconds': index['build_seconds'],
+            **stats,
+        }
+        self.stdout.write(
+            f"index={'on ' if indexed else 'off'} {result['refreshes_per_s']:7.1f} refreshes/s "
+            f"queries={result['queries']:.2f} db={result['db_ms']:.2f}ms p50={result['p50_ms']:.2f}ms "
+            f"p95={result['p95_ms']:.2f}ms blacklist queries={result['database_checks']}"
+            + (f" index={result['index_bytes'] / 1024:.0f}KiB/{result['index_tokens']} tokens "
+               f"built in {result['index_build_seconds']:.1f}s" if indexed else '')
+        )
+        return result
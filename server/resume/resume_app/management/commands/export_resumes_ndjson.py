@@ -0,0 +1,43 @@
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from resume_app.models import Resume
+from resume_app.ndjson import stream_resumes_ndjson
+
+class Command(BaseCommand):
+    help = "Write resumes as NDJSON, one per line: a user's, every user's on an email domain, or all of them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help='Owner email; repeat for several users')
+        parser.add_argument('--domain', action='append', default=[], help='Every user with an email on this domain, e.g. an organization')
+        parser.add_argument('--all', action='store_true', help='Every resume')
+        parser.add_argument('--output', help='File to write (default: standard output)')
+        parser.add_argument('--batch-size', type=int, help='Resumes read per query (default: RESUME_NDJSON_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        resumes = Resume.objects.all()
+        if not options['all']:
+            owners = Q()
+            for email in options['user']:
+                owners |= Q(user__email__iexact=email)
+            for domain in options['domain']:
+                owners |= Q(user__email__iendswith='@' + domain.lstrip('@'))
+            if not owners:
+                raise CommandError('Pass --user, --domain or --all')
+            resumes = resumes.filter(owners)
+
+        start = time.perf_counter()
+        lines = 0
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in stream_resumes_ndjson(resumes, batch_size=options['batch_size']):
+                output.write(chunk)
+                lines += chunk.count(b'\n')
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+        # Progress goes to stderr so that standard output stays valid NDJSON
+        self.stderr.write(self.style.SUCCESS(f'Exported {lines} resumes in {time.perf_counter() - start:.1f}s'))
@@ -0,0 +1,36 @@
+import json
+import sys
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from resume_app.ndjson import import_resumes_ndjson
+
+class Command(BaseCommand):
+    help = 'Create resumes from an NDJSON file written by export_resumes_ndjson, reporting invalid lines'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="NDJSON file, or - for standard input")
+        parser.add_argument('--user', help="Owner email for every resume (default: each line's user)")
+        parser.add_argument('--batch-size', type=int, help='Resumes written per transaction (default: RESUME_NDJSON_BATCH_SIZE)')
+        parser.add_argument('--max-errors', type=int, help='Invalid lines to print (default: all)')
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['user']:
+            try:
+                owner = get_user_model().objects.get(email__iexact=options['user'])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"No user with email {options['user']}")
+
+        start = time.perf_counter()
+        source = sys.stdin.buffer if options['path'] == '-' else open(options['path'], 'rb')
+        with source:
+            report = import_resumes_ndjson(
+                source, owner=owner, batch_size=options['batch_size'], max_errors=options['max_errors']
+            )
+        for error in sorted(report.errors, key=lambda error: error['line']):
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        style = self.style.SUCCESS if not report.failed else self.style.WARNING
+        self.stdout.write(style(
+            f'Imported {report.imported} resumes, {report.failed} invalid lines, in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_app.blacklist import prune_expired_tokens, run_pruner
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens from the outstanding and blacklist tables in short batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Rows per delete transaction (default: TOKEN_BLACKLIST_PRUNE_BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, help='Seconds to sleep between batches (default: TOKEN_BLACKLIST_PRUNE_PAUSE)')
+        parser.add_argument('--every', type=float, help='Keep running, pruning again after this many seconds')
+
+    def handle(self, *args, **options):
+        if options['every']:
+            try:
+                run_pruner(options['every'], batch_size=options['batch_size'], pause=options['pause'])
+            except KeyboardInterrupt:
+                pass
+            return
+        start = time.perf_counter()
+        outstanding, blacklisted = prune_expired_tokens(batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Deleted {outstanding} outstanding and {blacklisted} blacklisted tokens in {time.perf_counter() - start:.1f}s'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from resume_app.search import rebuild_search_index
+
+class Command(BaseCommand):
+    help = 'Recreate the search document of every resume and compact the full-text index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Resumes flattened per INSERT')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} resumes'))
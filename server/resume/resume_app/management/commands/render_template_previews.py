@@ -0,0 +1,27 @@
+import shutil
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from resume_app.models import ResumeTemplate
+from resume_app.previews import update_template_previews
+
+class Command(BaseCommand):
+    help = 'Render each template against a sample resume and store page 1 as gallery thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', action='append', help='Only render templates with this name (repeatable)')
+        parser.add_argument('--widths', help='Comma separated widths in pixels (default: PREVIEW_WIDTHS)')
+
+    def handle(self, *args, **options):
+        if shutil.which(settings.PREVIEW_RASTERIZER) is None:
+            raise CommandError(f'{settings.PREVIEW_RASTERIZER} not found; install poppler-utils or set PREVIEW_RASTERIZER')
+
+        widths = [int(width) for width in options['widths'].split(',')] if options['widths'] else None
+        templates = ResumeTemplate.objects.all()
+        if options['template']:
+            templates = templates.filter(name__in=options['template'])
+
+        for template in templates:
+            images = update_template_previews(template, widths=widths)
+            self.stdout.write(
+                self.style.SUCCESS(f'{template.name}: {template.preview_image} ({len(images)} widths)')
+            )
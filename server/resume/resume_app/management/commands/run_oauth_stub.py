@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_app.oauth_stub import OAuthStub
+
+class Command(BaseCommand):
+    help = 'Serve a local stand-in for the LinkedIn API and Google signing certificates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every response')
+        parser.add_argument('--google-audience', default='oauth-stub-client', help='Client id for the issued Google tokens')
+        parser.add_argument('--issue', action='append', default=[], metavar='EMAIL', help='Print a Google ID token for this email')
+
+    def handle(self, *args, **options):
+        with OAuthStub(options['host'], options['port'], latency=options['latency']) as stub:
+            self.stdout.write(self.style.SUCCESS(f'OAuth stub listening on {stub.base_url}'))
+            self.stdout.write(f'  LINKEDIN_API_URL={stub.base_url}')
+            self.stdout.write(f'  GOOGLE_CERTS_URL={stub.certs_url}')
+            self.stdout.write(f"  GOOGLE_OAUTH2_KEY={options['google_audience']}")
+            for email in options['issue']:
+                self.stdout.write(f"Google ID token for {email}: {stub.google_id_token(email, options['google_audience'])}")
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from resume_app.pdf_jobs import queue_metrics, run_worker
+
+class Command(BaseCommand):
+    help = 'Render queued resume PDFs on a local process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, help='Number of render processes (default: PDF_WORKER_CONCURRENCY)')
+        parser.add_argument('--poll-interval', type=float, help='Seconds between queue polls (default: PDF_WORKER_POLL_INTERVAL)')
+        parser.add_argument('--once', action='store_true', help='Exit once the queue is drained')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'Queue before start: {queue_metrics()}')
+        try:
+            run_worker(
+                concurrency=options['concurrency'],
+                poll_interval=options['poll_interval'],
+                once=options['once'],
+            )
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Worker stopped. Queue: {queue_metrics()}'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from resume_app.latex import latex_available, warm_latex_formats
+from resume_app.models import ResumeTemplate
+
+class Command(BaseCommand):
+    help = 'Precompile the preamble of every LaTeX template into a TeX format file'
+
+    def handle(self, *args, **options):
+        if not latex_available():
+            raise CommandError('No TeX engine available (check LATEX_ENABLED and LATEX_ENGINE)')
+
+        for name, format_name in warm_latex_formats(ResumeTemplate.objects.filter(is_latex_template=True)).items():
+            if format_name:
+                self.stdout.write(self.style.SUCCESS(f'{name}: {format_name}.fmt'))
+            else:
+                self.stdout.write(self.style.WARNING(f'{name}: format build failed, documents will compile the full preamble'))
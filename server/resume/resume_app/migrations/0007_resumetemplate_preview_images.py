@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0006_pdfrenderjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumetemplate',
+            name='preview_images',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
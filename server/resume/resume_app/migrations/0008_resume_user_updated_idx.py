@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0007_resumetemplate_preview_images'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['user', '-updated_at', '-id'], name='resume_user_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Copies of resume_app.search as of this migration, which must not change with it
+SEARCH_FIELDS = ('title', 'professional_summary', 'experience', 'projects', 'skills')
+
+SQLITE_SCHEMA = [
+    """CREATE VIRTUAL TABLE resume_app_resumesearch USING fts5(
+        title, professional_summary, experience, projects, skills,
+        content='resume_app_resumesearchdocument', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )""",
+    # External-content triggers: the FTS index follows every write to the documents.
+    # SQLite migrations that alter the document table rebuild it and drop these.
+    """CREATE TRIGGER resume_app_resumesearch_ai AFTER INSERT ON resume_app_resumesearchdocument BEGIN
+        INSERT INTO resume_app_resumesearch(rowid, title, professional_summary, experience, projects, skills)
+        VALUES (new.id, new.title, new.professional_summary, new.experience, new.projects, new.skills);
+    END""",
+    """CREATE TRIGGER resume_app_resumesearch_ad AFTER DELETE ON resume_app_resumesearchdocument BEGIN
+        INSERT INTO resume_app_resumesearch(resume_app_resumesearch, rowid, title, professional_summary, experience, projects, skills)
+        VALUES ('delete', old.id, old.title, old.professional_summary, old.experience, old.projects, old.skills);
+    END""",
+    """CREATE TRIGGER resume_app_resumesearch_au AFTER UPDATE ON resume_app_resumesearchdocument BEGIN
+        INSERT INTO resume_app_resumesearch(resume_app_resumesearch, rowid, title, professional_summary, experience, projects, skills)
+        VALUES ('delete', old.id, old.title, old.professional_summary, old.experience, old.projects, old.skills);
+        INSERT INTO resume_app_resumesearch(rowid, title, professional_summary, experience, projects, skills)
+        VALUES (new.id, new.title, new.professional_summary, new.experience, new.projects, new.skills);
+    END""",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS resume_app_resumesearch_ai',
+    'DROP TRIGGER IF EXISTS resume_app_resumesearch_ad',
+    'DROP TRIGGER IF EXISTS resume_app_resumesearch_au',
+    'DROP TABLE IF EXISTS resume_app_resumesearch',
+]
+
+POSTGRESQL_SCHEMA = [
+    """CREATE INDEX resume_search_document_idx ON resume_app_resumesearchdocument USING GIN ((
+        setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', professional_summary), 'B')
+        || setweight(to_tsvector('english', experience), 'B') || setweight(to_tsvector('english', projects), 'C')
+        || setweight(to_tsvector('english', skills), 'B')
+    ))""",
+]
+POSTGRESQL_DROP = ['DROP INDEX IF EXISTS resume_search_document_idx']
+
+
+def flatten_text(value):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return '\n'.join(filter(None, (flatten_text(item) for key, item in value.items() if key != 'id')))
+    if isinstance(value, list):
+        return '\n'.join(filter(None, (flatten_text(item) for item in value)))
+    return ''
+
+
+def create_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_SCHEMA, 'postgresql': POSTGRESQL_SCHEMA}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+    Resume = apps.get_model('resume_app', 'Resume')
+    ResumeSearchDocument = apps.get_model('resume_app', 'ResumeSearchDocument')
+    ResumeSearchDocument.objects.bulk_create(
+        (
+            ResumeSearchDocument(resume_id=resume.pk, **{field: flatten_text(getattr(resume, field)) for field in SEARCH_FIELDS})
+            for resume in Resume.objects.only(*SEARCH_FIELDS).iterator()
+        ),
+        batch_size=500,
+    )
+
+
+def drop_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_DROP, 'postgresql': POSTGRESQL_DROP}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_app', '0009_resume_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeSearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.TextField(blank=True, default='')),
+                ('professional_summary', models.TextField(blank=True, default='')),
+                ('experience', models.TextField(blank=True, default='')),
+                ('projects', models.TextField(blank=True, default='')),
+                ('skills', models.TextField(blank=True, default='')),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_document', to='resume_app.resume')),
+            ],
+        ),
+        # SQLite FTS5 table or PostgreSQL GIN index over the documents, then a backfill
+        migrations.RunPython(create_index, drop_index),
+    ]
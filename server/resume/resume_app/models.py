@@ -62,6 +62,7 @@ class ResumeTemplate(models.Model):
     template_type = models.CharField(max_length=20, choices=TEMPLATE_TYPES)
     description = models.TextField()
     preview_image = models.URLField(blank=True, null=True)
+    preview_images = models.JSONField(default=dict, blank=True)  # {width: {format: url}}
     css_styles = models.JSONField(default=dict)  # Store template styling
     latex_styles = models.JSONField(default=dict)  # Add this for LaTeX templates
     layout_config = models.JSONField(default=dict)  # Store layout configuration
@@ -107,11 +108,73 @@ class Resume(models.Model):
     # Metadata
     is_public = models.BooleanField(default=False)
     pdf_file = models.FileField(upload_to='resume_pdfs/', blank=True, null=True)
+    
+    # Render cache bookkeeping for pdf_file (content hash, size in bytes, last hit)
+    pdf_hash = models.CharField(max_length=64, blank=True, default='')
+    pdf_size = models.PositiveIntegerField(default=0)
+    pdf_accessed_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    
+    # Bumped on every content change; clients send it back in If-Match
+    version = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Keyset pagination of a user's resumes (UpdatedAtCursorPagination)
+            models.Index(fields=['user', '-updated_at', '-id'], name='resume_user_updated_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets saves tell a resume that stopped being public from one that never was; None when deferred
+        instance._stored_is_public = instance.__dict__.get('is_public')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.version += 1
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        super().save(*args, **kwargs)
+    
+    def __str__(self):
+        return f"{self.title} - {self.user.get_full_name()}"
+
+class ResumeSearchDocument(models.Model):
+    # Flattened text of a resume's searchable fields; the full-text index is
+    # built over these columns (see search.py)
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='search_document')
+    title = models.TextField(blank=True, default='')
+    professional_summary = models.TextField(blank=True, default='')
+    experience = models.TextField(blank=True, default='')
+    projects = models.TextField(blank=True, default='')
+    skills = models.TextField(blank=True, default='')
+    
+    def __str__(self):
+        return f"Search document for {self.resume_id}"
+
+class PdfRenderJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='pdf_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', db_index=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['created_at']
     
     def __str__(self):
-        return f"{self.title} - {self.user.get_full_name()}"
\ No newline at end of file
+        return f"PDF job {self.id} ({self.status})"
@@ -0,0 +1,153 @@
+import json
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from .models import Resume, ResumeSearchDocument, ResumeTemplate
+from .public_pages import public_resume_changed
+from .search import document_fields
+from .serializers import ResumeImportSerializer
+
+# Keys of an exported line: ``user`` is the owner's email, ``template`` the template id
+EXPORT_FIELDS = (
+    'id', 'user', 'template', 'title', 'personal_info', 'professional_summary', 'experience', 'education',
+    'skills', 'projects', 'additional_sections', 'template_options', 'is_public', 'created_at', 'updated_at',
+)
+EXPORT_COLUMNS = tuple('user__email' if name == 'user' else name for name in EXPORT_FIELDS)
+
+# Errors kept in an import report when the caller sets no limit of its own
+MAX_REPORTED_ERRORS = 100
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def stream_resumes_ndjson(resumes, batch_size=None):
+    """Yield the resumes as NDJSON, one line per resume, one chunk of lines per batch.
+
+    Rows are read ``batch_size`` at a time (through a server-side cursor on
+    PostgreSQL), so memory does not grow with the number of resumes. Callers
+    flush buffered edits to the resumes first.
+    """
+    batch_size = batch_size or settings.RESUME_NDJSON_BATCH_SIZE
+    rows = resumes.order_by('pk').values_list(*EXPORT_COLUMNS).iterator(chunk_size=batch_size)
+    lines = []
+    for row in rows:
+        lines.append(_encoder.encode(dict(zip(EXPORT_FIELDS, row))))
+        if len(lines) >= batch_size:
+            yield ('\n'.join(lines) + '\n').encode()
+            lines = []
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode()
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    failed: int = 0
+    # [{'line': number, 'errors': {field: [messages]}}], the first max_errors of them
+    errors: list = field(default_factory=list)
+    max_errors: int = None
+
+    def fail(self, line, errors):
+        self.failed += 1
+        if self.max_errors is None or len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'errors': errors})
+
+
+def import_resumes_ndjson(lines, owner=None, batch_size=None, max_errors=MAX_REPORTED_ERRORS):
+    """Create resumes from NDJSON lines as written by stream_resumes_ndjson.
+
+    Lines are validated one by one, then owners, templates and ids are
+    checked and the valid ones written ``batch_size`` at a time, each batch
+    in its own transaction. Every resume belongs to ``owner`` when given,
+    otherwise to the user with the line's ``user`` email. Ids are kept and
+    must be new; timestamps are those of the import. Invalid lines are
+    skipped and reported by line number in the returned ImportReport.
+    """
+    batch_size = batch_size or settings.RESUME_NDJSON_BATCH_SIZE
+    report = ImportReport(max_errors=max_errors)
+    serializer = ResumeImportSerializer()
+    template_ids = set(ResumeTemplate.objects.values_list('id', flat=True))
+    batch = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            report.fail(number, {'non_field_errors': [f'Invalid JSON: {e}']})
+            continue
+        if not isinstance(data, dict):
+            report.fail(number, {'non_field_errors': ['Expected a JSON object']})
+            continue
+        try:
+            batch.append((number, serializer.run_validation(data)))
+        except serializers.ValidationError as e:
+            report.fail(number, e.detail)
+            continue
+        if len(batch) >= batch_size:
+            _import_batch(batch, owner, template_ids, report)
+            batch = []
+    _import_batch(batch, owner, template_ids, report)
+    return report
+
+def _import_batch(batch, owner, template_ids, report):
+    if not batch:
+        return
+    # One query each for the batch's owners and for ids that are already taken
+    if owner is None:
+        emails = {data['user'] for _, data in batch if 'user' in data}
+        owners = dict(get_user_model().objects.filter(email__in=emails).values_list('email', 'id'))
+    ids = [data['id'] for _, data in batch if 'id' in data]
+    taken = set(Resume.objects.filter(id__in=ids).values_list('id', flat=True))
+
+    resumes = []
+    for number, data in batch:
+        errors = {}
+        email = data.pop('user', None)
+        if owner is not None:
+            user_id = owner.pk
+        elif email is None:
+            errors['user'] = ['This field is required.']
+        elif email not in owners:
+            errors['user'] = [f'No user with email {email}.']
+        else:
+            user_id = owners[email]
+        template_id = data.pop('template', None)
+        if template_id is not None and template_id not in template_ids:
+            errors['template'] = [f'No template with id {template_id}.']
+        if data.get('id') in taken:
+            errors['id'] = ['A resume with this id already exists.']
+        if errors:
+            report.fail(number, errors)
+            continue
+        resume = Resume(user_id=user_id, template_id=template_id, **data)
+        taken.add(resume.pk)
+        resumes.append((number, resume))
+
+    try:
+        with transaction.atomic():
+            _create_resumes([resume for _, resume in resumes])
+        report.imported += len(resumes)
+    except IntegrityError:
+        # Another writer took an id or removed an owner meanwhile: find the lines one by one
+        for number, resume in resumes:
+            try:
+                with transaction.atomic():
+                    _create_resumes([resume])
+            except IntegrityError as e:
+                report.fail(number, {'non_field_errors': [str(e)]})
+            else:
+                report.imported += 1
+
+def _create_resumes(resumes):
+    Resume.objects.bulk_create(resumes)
+    # bulk_create sends no post_save, so the search documents are written here
+    ResumeSearchDocument.objects.bulk_create(
+        [ResumeSearchDocument(resume_id=resume.pk, **document_fields(resume)) for resume in resumes]
+    )
+    for resume in resumes:
+        if resume.is_public:
+            public_resume_changed(resume.pk)
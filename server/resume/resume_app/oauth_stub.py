@@ -0,0 +1,150 @@
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+STUB_EMAIL_DOMAIN = 'oauth-stub.test'
+
+
+def _signing_key(key_id):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'oauth-stub')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(key_pem, key_id=key_id)
+    return signer, cert.public_bytes(serialization.Encoding.PEM).decode('ascii')
+
+
+class OAuthStub:
+    """Local stand-in for the LinkedIn profile/email API and Google's signing certificates.
+
+    The access token is the identity: token ``alice`` is alice@oauth-stub.test,
+    and tokens starting with ``invalid`` get a 401. Every response is delayed
+    by ``latency`` seconds to model the provider round trip.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, certs_max_age=3600):
+        self.latency = latency
+        self.certs_max_age = certs_max_age
+        self.key_id = 'oauth-stub-1'
+        self.signer, cert_pem = _signing_key(self.key_id)
+        self.certs = {self.key_id: cert_pem}
+        self.requests = 0
+        self.cert_requests = 0
+        self.fail_certs = False  # answer the certificate endpoint with 503s
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def certs_url(self):
+        return f'{self.base_url}/oauth2/v1/certs'
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='oauth-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def rotate_key(self):
+        """Sign new tokens with a fresh key, published next to the old one as Google does."""
+        self.key_id = f'oauth-stub-{len(self.certs) + 1}'
+        self.signer, cert_pem = _signing_key(self.key_id)
+        self.certs = {**self.certs, self.key_id: cert_pem}
+
+    def google_id_token(self, email, audience, lifetime=3600, **claims):
+        """An ID token for ``email`` signed with the stub's key, as Google would issue it."""
+        now = int(time.time())
+        payload = {
+            'iss': 'https://accounts.google.com',
+            'aud': audience,
+            'sub': email,
+            'email': email,
+            'email_verified': True,
+            'given_name': email.split('@')[0].title(),
+            'family_name': 'Stub',
+            'iat': now,
+            'exp': now + lifetime,
+            **claims,
+        }
+        return jwt.encode(self.signer, payload).decode('ascii')
+
+    def _respond(self, path, authorization):
+        if path == '/oauth2/v1/certs':
+            with self._lock:
+                self.cert_requests += 1
+            if self.fail_certs:
+                return 503, {'message': 'Unavailable'}, {}
+            return 200, self.certs, {'Cache-Control': f'public, max-age={self.certs_max_age}, must-revalidate'}
+
+        token = authorization.removeprefix('Bearer ').strip()
+        if not token or token.startswith('invalid'):
+            return 401, {'message': 'Invalid access token'}, {}
+        if path.startswith('/v2/people/'):
+            localized = lambda value: {'localized': {'en_US': value}}
+            return 200, {'id': token, 'firstName': localized(token.title()), 'lastName': localized('Stub')}, {}
+        if path == '/v2/emailAddress':
+            return 200, {'elements': [{'handle~': {'emailAddress': f'{token}@{STUB_EMAIL_DOMAIN}'}}]}, {}
+        return 404, {'message': 'Not found'}, {}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive, so clients can reuse pooled connections; without
+            # TCP_NODELAY the split header/body writes stall on delayed ACKs
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                status, payload, headers = stub._respond(urlsplit(self.path).path, self.headers.get('Authorization', ''))
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,89 @@
+import base64
+import binascii
+import json
+import uuid
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+CURSOR_VERSION = 1
+
+
+def encode_cursor(updated_at, pk):
+    """Opaque, URL-safe cursor for the position just after a row."""
+    payload = json.dumps({'v': CURSOR_VERSION, 'u': updated_at.isoformat(), 'i': str(pk)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Return ``(updated_at, id)`` from a cursor, or raise ValueError."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if payload['v'] != CURSOR_VERSION:
+            raise ValueError('Unsupported cursor version')
+        updated_at = parse_datetime(payload['u'])
+        if updated_at is None:
+            raise ValueError('Invalid cursor timestamp')
+        return updated_at, uuid.UUID(payload['i'])
+    except (binascii.Error, UnicodeError, TypeError, KeyError, json.JSONDecodeError) as e:
+        raise ValueError('Malformed cursor') from e
+
+
+class UpdatedAtCursorPagination(BasePagination):
+    """Keyset pagination over ``(-updated_at, -id)``.
+
+    Each page is one index range scan from the cursor, so the cost does not
+    grow with how deep the client pages or how many rows the user owns.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    ordering = ('-updated_at', '-id')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            try:
+                updated_at, pk = decode_cursor(cursor)
+            except ValueError:
+                raise NotFound('Invalid cursor')
+            queryset = queryset.filter(Q(updated_at__lt=updated_at) | Q(updated_at=updated_at, id__lt=pk))
+
+        # The last row's key builds the next cursor, so keep it in a column projection
+        field_names, defer = queryset.query.deferred_loading
+        if not defer and 'updated_at' not in field_names:
+            queryset = queryset.only(*field_names, 'updated_at')
+
+        # One extra row tells whether another page follows
+        rows = list(queryset.order_by(*self.ordering)[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encode_cursor(last.updated_at, last.pk))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,101 @@
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.db import close_old_connections
+from .stats import percentile
+
+# Recent hash and queue wait durations kept for the metrics
+METRICS_WINDOW = 1000
+
+
+class PoolSaturated(Exception):
+    """Every hashing worker is busy and the queue is full."""
+
+    def __init__(self, retry_after):
+        super().__init__(f'Password hashing is saturated, retry in {retry_after}s')
+        self.retry_after = retry_after
+
+
+def authenticate_password(request, email, password):
+    """``authenticate()`` for a hashing worker, which has its own database connection.
+
+    The backends do the rest: ModelBackend hashes even for unknown emails,
+    refuses inactive users and rewrites outdated hashes, and a failure
+    sends ``user_login_failed``.
+    """
+    close_old_connections()
+    try:
+        return authenticate(request, email=email, password=password)
+    finally:
+        close_old_connections()
+
+
+class PasswordHashPool:
+    """Bounded thread pool for password hashing, with admission control.
+
+    hashlib's PBKDF2 releases the GIL, so LOGIN_HASH_WORKERS threads hash in
+    parallel while the event loop keeps serving other requests. At most
+    LOGIN_HASH_QUEUE_DEPTH hashes wait for a free worker; past that ``run()``
+    raises PoolSaturated at once, with a retry delay estimated from recent
+    hash times, instead of queueing the login behind the spike.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._hash_times = deque(maxlen=METRICS_WINDOW)
+        self._wait_times = deque(maxlen=METRICS_WINDOW)
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, func, *args):
+        """Run ``func(*args)`` on a hashing worker, or raise PoolSaturated."""
+        with self._lock:
+            if self._in_flight >= settings.LOGIN_HASH_WORKERS + settings.LOGIN_HASH_QUEUE_DEPTH:
+                self.rejected += 1
+                raise PoolSaturated(self._retry_after())
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(settings.LOGIN_HASH_WORKERS, thread_name_prefix='password-hash')
+            # Released by the worker, so an abandoned request still holds its slot until the hash ends
+            self._in_flight += 1
+        return await asyncio.wrap_future(self._executor.submit(self._timed, time.perf_counter(), func, args))
+
+    def _timed(self, submitted_at, func, args):
+        started_at = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+                self._wait_times.append(started_at - submitted_at)
+                self._hash_times.append(finished_at - started_at)
+
+    def _retry_after(self):
+        # Seconds for the hashes already admitted to drain at the recent rate
+        mean = sum(self._hash_times) / len(self._hash_times) if self._hash_times else 1.0
+        return max(math.ceil(self._in_flight * mean / settings.LOGIN_HASH_WORKERS), 1)
+
+    def stats(self):
+        with self._lock:
+            hash_times, wait_times = list(self._hash_times), list(self._wait_times)
+            return {
+                'workers': settings.LOGIN_HASH_WORKERS,
+                'queue_depth': settings.LOGIN_HASH_QUEUE_DEPTH,
+                'in_flight': self._in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'hash_p50_ms': percentile(hash_times, 50) * 1000,
+                'hash_p95_ms': percentile(hash_times, 95) * 1000,
+                'wait_p50_ms': percentile(wait_times, 50) * 1000,
+                'wait_p95_ms': percentile(wait_times, 95) * 1000,
+            }
+
+password_pool = PasswordHashPool()
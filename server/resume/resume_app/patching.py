@@ -0,0 +1,234 @@
+import copy
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework.parsers import JSONParser
+from .models import Resume
+from .public_pages import PUBLIC_FIELDS, public_resume_changed
+from .search import SEARCH_FIELDS, update_search_document
+
+JSON_PATCH = 'application/json-patch+json'
+MERGE_PATCH = 'application/merge-patch+json'
+
+# Resume fields a patch may touch, as they appear in ResumeSerializer
+PATCHABLE_FIELDS = (
+    'title', 'template', 'personal_info', 'professional_summary', 'experience', 'education',
+    'skills', 'projects', 'additional_sections', 'template_options', 'is_public',
+)
+
+
+class JSONPatchParser(JSONParser):
+    media_type = JSON_PATCH
+
+
+class MergePatchParser(JSONParser):
+    media_type = MERGE_PATCH
+
+
+class PatchError(Exception):
+    """The patch document is malformed or does not apply to the resume."""
+
+
+class PatchTestFailed(PatchError):
+    """A ``test`` operation did not match the current resume."""
+
+
+def version_etag(resume):
+    return f'"{resume.version}"'
+
+def if_match_version(header):
+    """Resume version required by an If-Match header; None when any version will do.
+
+    Raises ValueError for tags that cannot name a resume version.
+    """
+    tags = parse_etags(header)
+    if tags == ['*']:
+        return None
+    if len(tags) != 1:
+        raise ValueError('If-Match must name a single version')
+    tag = tags[0].removeprefix('W/').strip('"')
+    if not tag.isdigit():
+        raise ValueError(f'Not a resume version: {tags[0]}')
+    return int(tag)
+
+def _pointer(path):
+    if not isinstance(path, str) or (path and not path.startswith('/')):
+        raise PatchError(f'Invalid JSON pointer: {path!r}')
+    tokens = [token.replace('~1', '/').replace('~0', '~') for token in path.split('/')[1:]]
+    if not tokens or tokens[0] not in PATCHABLE_FIELDS:
+        raise PatchError(f'Path does not name a patchable resume field: {path!r}')
+    return tokens
+
+def _array_index(array, token, path, allow_end=False):
+    """Index for a pointer token into a list.
+
+    Besides RFC 6901 indexes (and ``-`` for the end), a token may be the
+    ``id`` of an entry, which keeps patches valid when entries are reordered.
+    """
+    if token == '-' and allow_end:
+        return len(array)
+    if token.isdigit() and (token == '0' or not token.startswith('0')):
+        index = int(token)
+        if index > len(array) or (index == len(array) and not allow_end):
+            raise PatchError(f'Index out of range: {path}')
+        return index
+    for index, item in enumerate(array):
+        if isinstance(item, dict) and str(item.get('id')) == token:
+            return index
+    raise PatchError(f'No entry with id {token!r}: {path}')
+
+def _parent(document, tokens, path):
+    target = document
+    for token in tokens[:-1]:
+        if isinstance(target, list):
+            target = target[_array_index(target, token, path)]
+        elif isinstance(target, dict) and token in target:
+            target = target[token]
+        else:
+            raise PatchError(f'Path not found: {path}')
+    return target, tokens[-1]
+
+def _get(document, path):
+    parent, key = _parent(document, _pointer(path), path)
+    if isinstance(parent, list):
+        return parent[_array_index(parent, key, path)]
+    if isinstance(parent, dict) and key in parent:
+        return parent[key]
+    raise PatchError(f'Path not found: {path}')
+
+def _add(document, path, value):
+    parent, key = _parent(document, _pointer(path), path)
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, key, path, allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[key] = value
+    else:
+        raise PatchError(f'Path not found: {path}')
+
+def _remove(document, path):
+    tokens = _pointer(path)
+    if len(tokens) == 1:
+        raise PatchError(f'Resume fields cannot be removed: {path}')
+    parent, key = _parent(document, tokens, path)
+    if isinstance(parent, list):
+        return parent.pop(_array_index(parent, key, path))
+    if isinstance(parent, dict) and key in parent:
+        return parent.pop(key)
+    raise PatchError(f'Path not found: {path}')
+
+def _replace(document, path, value):
+    parent, key = _parent(document, _pointer(path), path)
+    if isinstance(parent, list):
+        parent[_array_index(parent, key, path)] = value
+    elif isinstance(parent, dict) and key in parent:
+        parent[key] = value
+    else:
+        raise PatchError(f'Path not found: {path}')
+
+def apply_json_patch(document, operations):
+    """Apply RFC 6902 operations to ``document`` in place."""
+    if not isinstance(operations, list):
+        raise PatchError('A JSON Patch document must be an array of operations')
+    for operation in operations:
+        if not isinstance(operation, dict) or 'op' not in operation or 'path' not in operation:
+            raise PatchError('Each operation needs "op" and "path"')
+        op, path = operation['op'], operation['path']
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'"{op}" needs a "value"')
+        if op in ('move', 'copy') and 'from' not in operation:
+            raise PatchError(f'"{op}" needs a "from"')
+
+        if op == 'add':
+            _add(document, path, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(document, path)
+        elif op == 'replace':
+            _replace(document, path, copy.deepcopy(operation['value']))
+        elif op == 'move':
+            _add(document, path, _remove(document, operation['from']))
+        elif op == 'copy':
+            _add(document, path, copy.deepcopy(_get(document, operation['from'])))
+        elif op == 'test':
+            if _get(document, path) != operation['value']:
+                raise PatchTestFailed(f'Test failed: {path}')
+        else:
+            raise PatchError(f'Unknown operation: {op!r}')
+    return document
+
+def apply_merge_patch(target, patch):
+    """RFC 7396 merge patch: objects merge recursively, null deletes, anything else replaces."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+def _field_value(resume, field):
+    if field == 'template':
+        return str(resume.template_id) if resume.template_id else None
+    return copy.deepcopy(getattr(resume, field))
+
+def patched_fields(resume, content_type, patch):
+    """Apply a JSON Patch or merge patch to the resume's fields.
+
+    Returns only the fields whose values changed, shaped like ResumeSerializer
+    input, so that the unchanged JSON columns are neither validated nor written.
+    """
+    if content_type == JSON_PATCH:
+        if not isinstance(patch, list):
+            raise PatchError('A JSON Patch document must be an array of operations')
+        touched = {
+            _pointer(path)[0]
+            for operation in patch if isinstance(operation, dict)
+            for path in (operation.get('path'), operation.get('from')) if path is not None
+        }
+        document = {field: _field_value(resume, field) for field in touched}
+        apply_json_patch(document, patch)
+    else:
+        if not isinstance(patch, dict):
+            raise PatchError('A merge patch must be a JSON object')
+        unknown = set(patch) - set(PATCHABLE_FIELDS)
+        if unknown:
+            raise PatchError(f"Not patchable: {', '.join(sorted(unknown))}")
+        document = {
+            field: apply_merge_patch(_field_value(resume, field), value) if value is not None else None
+            for field, value in patch.items()
+        }
+    return {field: value for field, value in document.items() if value != _field_value(resume, field)}
+
+def save_resume_changes(resume, changes, expected_version=None):
+    """Write ``changes`` (validated serializer data) as a single UPDATE of the changed columns.
+
+    With ``expected_version`` the write only happens if the stored version
+    still matches, returning False otherwise. Without it the version read
+    with ``resume`` is tried first and a lost race falls back to last write wins.
+    """
+    changes = {field: value for field, value in changes.items() if getattr(resume, field) != value}
+    if not changes:
+        return True
+
+    now = timezone.now()
+    version = expected_version if expected_version is not None else resume.version
+    updated = Resume.objects.filter(pk=resume.pk, version=version).update(
+        **changes, version=F('version') + 1, updated_at=now
+    )
+    if not updated:
+        if expected_version is not None:
+            return False
+        Resume.objects.filter(pk=resume.pk).update(**changes, version=F('version') + 1, updated_at=now)
+        resume.refresh_from_db(fields=['version'])
+    else:
+        resume.version = version + 1
+
+    for field, value in changes.items():
+        setattr(resume, field, value)
+    resume.updated_at = now
+    if not changes.keys().isdisjoint(SEARCH_FIELDS):
+        update_search_document(resume)
+    if (resume.is_public or 'is_public' in changes) and not changes.keys().isdisjoint(PUBLIC_FIELDS):
+        public_resume_changed(resume.pk)
+    return True
@@ -0,0 +1,133 @@
+import hashlib
+import json
+from tempfile import SpooledTemporaryFile
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.db.models import Sum
+from django.utils import timezone
+from .models import Resume
+from .fonts import available_font_families
+from .latex import uses_latex
+from .rendering import write_resume_pdf
+
+# Resume fields that affect the rendered document
+CONTENT_FIELDS = (
+    'personal_info', 'experience', 'education', 'skills', 'projects',
+    'professional_summary', 'template_options',
+)
+
+# Bump whenever the render output changes so stale PDFs are not served
+RENDERER_VERSION = 1
+
+
+def resume_content_hash(resume):
+    """Hash the resume content and template revision into a stable cache key."""
+    template = resume.template
+    payload = {field: getattr(resume, field) for field in CONTENT_FIELDS}
+    payload['template'] = [str(template.id), template.updated_at.isoformat()] if template else None
+    payload['renderer'] = RENDERER_VERSION
+    # LaTeX templates fall back to ReportLab when no TeX engine is installed
+    payload['engine'] = 'latex' if template and uses_latex(template) else 'reportlab'
+    # Installing or removing font files changes the output of the same content
+    payload['fonts'] = available_font_families()
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def open_cached_pdf(resume, digest):
+    """Open the stored PDF if it was rendered from ``digest``; the caller closes it."""
+    if resume.pdf_hash != digest or not resume.pdf_file:
+        return None
+    try:
+        return resume.pdf_file.open('rb')
+    except OSError:
+        return None
+
+def read_cached_pdf(resume, digest):
+    """Return the stored PDF bytes if they were rendered from ``digest``."""
+    pdf = open_cached_pdf(resume, digest)
+    if pdf is None:
+        return None
+    with pdf:
+        return pdf.read()
+
+def _delete_pdf_file(storage, name):
+    if name:
+        try:
+            storage.delete(name)
+        except OSError:
+            pass
+
+def store_resume_pdf(resume, digest, content):
+    """Persist rendered bytes (or a File) into ``Resume.pdf_file`` without touching ``updated_at``."""
+    if not isinstance(content, File):
+        content = ContentFile(content)
+    size = content.size
+    storage = resume.pdf_file.storage
+    old_name = resume.pdf_file.name
+    name = storage.save(f'resume_pdfs/{resume.id}/{digest}.pdf', content)
+    if old_name and old_name != name:
+        _delete_pdf_file(storage, old_name)
+
+    now = timezone.now()
+    # queryset update() skips auto_now, so caching never changes the cache key
+    Resume.objects.filter(pk=resume.pk).update(
+        pdf_file=name, pdf_hash=digest, pdf_size=size, pdf_accessed_at=now
+    )
+    # A fresh FieldFile, so the next open() does not reuse a closed handle to the old file
+    resume.pdf_file = name
+    resume.pdf_hash = digest
+    resume.pdf_size = size
+    resume.pdf_accessed_at = now
+
+def discard_resume_pdf(resume):
+    """Drop the cached PDF of a resume."""
+    _delete_pdf_file(resume.pdf_file.storage, resume.pdf_file.name)
+    Resume.objects.filter(pk=resume.pk).update(
+        pdf_file=None, pdf_hash='', pdf_size=0, pdf_accessed_at=None
+    )
+
+def open_resume_pdf(resume):
+    """Return ``(etag, file)`` for the resume's PDF, rendering only when the content hash changed.
+
+    The PDF is streamed from storage, so the caller (usually a FileResponse)
+    owns and closes the returned file.
+    """
+    digest = resume_content_hash(resume)
+    pdf = open_cached_pdf(resume, digest)
+    if pdf is not None:
+        Resume.objects.filter(pk=resume.pk).update(pdf_accessed_at=timezone.now())
+        return digest, pdf
+
+    # Small documents stay in memory, large ones spill to disk before being stored
+    with SpooledTemporaryFile(max_size=settings.PDF_SPOOL_MAX_BYTES) as spool:
+        write_resume_pdf(resume, spool)
+        spool.seek(0)
+        store_resume_pdf(resume, digest, File(spool))
+    pdf = resume.pdf_file.open('rb')
+    # Evict after opening so a cache smaller than this PDF cannot pull it from under us
+    evict_pdf_cache()
+    return digest, pdf
+
+def evict_pdf_cache(max_bytes=None):
+    """Delete least recently used PDFs until the cache fits in ``max_bytes``."""
+    if max_bytes is None:
+        max_bytes = settings.PDF_CACHE_MAX_BYTES
+
+    cached = Resume.objects.exclude(pdf_hash='')
+    total = cached.aggregate(total=Sum('pdf_size'))['total'] or 0
+    evicted = 0
+    if total <= max_bytes:
+        return evicted
+
+    storage = Resume._meta.get_field('pdf_file').storage
+    for resume_id, name, size in cached.order_by('pdf_accessed_at').values_list('id', 'pdf_file', 'pdf_size').iterator():
+        # Only evict the row if it was not re-rendered in the meantime
+        if Resume.objects.filter(pk=resume_id, pdf_file=name).update(
+            pdf_file=None, pdf_hash='', pdf_size=0, pdf_accessed_at=None
+        ):
+            _delete_pdf_file(storage, name)
+            evicted += 1
+        total -= size
+        if total <= max_bytes:
+            break
+    return evicted
@@ -0,0 +1,158 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+import django
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from .models import PdfRenderJob, Resume
+from .pdf_cache import evict_pdf_cache, resume_content_hash, store_resume_pdf
+from .rendering import render_resume_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def create_render_pool(max_workers=None):
+    """Create a process pool whose workers can render pickled Resume instances."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers or settings.PDF_WORKER_CONCURRENCY,
+        mp_context=multiprocessing.get_context('spawn'),
+        # Spawned children start without loaded apps, which unpickling models needs
+        initializer=django.setup,
+    )
+
+def enqueue_pdf_render(resume):
+    """Queue a render of the resume, completing immediately when the cached PDF is current."""
+    digest = resume_content_hash(resume)
+    if resume.pdf_hash == digest and resume.pdf_file:
+        now = timezone.now()
+        return PdfRenderJob.objects.create(
+            resume=resume, status='done', content_hash=digest, started_at=now, finished_at=now
+        )
+    return PdfRenderJob.objects.create(resume=resume, content_hash=digest)
+
+def claim_jobs(limit):
+    """Atomically move up to ``limit`` queued jobs to running and return them."""
+    if limit <= 0:
+        return []
+
+    with transaction.atomic():
+        queued = PdfRenderJob.objects.filter(status='queued').order_by('created_at')
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        candidate_ids = list(queued.values_list('id', flat=True)[:limit])
+
+        claimed = []
+        now = timezone.now()
+        for job_id in candidate_ids:
+            # The status filter makes the claim safe on SQLite where rows cannot be locked
+            if PdfRenderJob.objects.filter(pk=job_id, status='queued').update(status='running', started_at=now):
+                claimed.append(job_id)
+
+    return list(PdfRenderJob.objects.filter(pk__in=claimed).select_related('resume__template'))
+
+def requeue_stale_jobs(max_age=None):
+    """Return jobs stuck in running (e.g. after a worker crash) to the queue."""
+    if max_age is None:
+        max_age = settings.PDF_WORKER_STALE_AFTER
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    return PdfRenderJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='queued', started_at=None
+    )
+
+def finish_job(job, data=None, error=None):
+    """Store a rendered PDF (or the failure) and mark the job finished.
+
+    Returns False when the job, or its resume along with it, was deleted
+    while it ran; nothing is stored then.
+    """
+    job.finished_at = timezone.now()
+    if error is not None:
+        job.status = 'failed'
+        job.error = error
+    else:
+        if data is not None:
+            if not PdfRenderJob.objects.filter(pk=job.pk).exists():
+                logger.info('PDF render job %s was deleted while rendering', job.id)
+                return False
+            store_resume_pdf(job.resume, job.content_hash, data)
+            evict_pdf_cache()
+        job.status = 'done'
+    finished = PdfRenderJob.objects.filter(pk=job.pk).update(
+        status=job.status, error=job.error, content_hash=job.content_hash, finished_at=job.finished_at
+    )
+    if not finished:
+        logger.info('PDF render job %s was deleted while rendering', job.id)
+        if data is not None and not Resume.objects.filter(pk=job.resume_id).exists():
+            # The resume went between storing and now; its delete did not see this file
+            job.resume.pdf_file.delete(save=False)
+    return bool(finished)
+
+def queue_metrics():
+    """Return job counts per status plus the age of the oldest queued job."""
+    counts = dict(PdfRenderJob.objects.values_list('status').annotate(count=Count('id')).order_by())
+    oldest = PdfRenderJob.objects.filter(status='queued').aggregate(oldest=Min('created_at'))['oldest']
+    metrics = {status: counts.get(status, 0) for status, _ in PdfRenderJob.STATUS_CHOICES}
+    metrics['queue_depth'] = metrics['queued']
+    metrics['oldest_queued_seconds'] = (timezone.now() - oldest).total_seconds() if oldest else 0
+    return metrics
+
+def run_worker(concurrency=None, poll_interval=None, once=False):
+    """Claim queued jobs and render them on a process pool until interrupted."""
+    concurrency = concurrency or settings.PDF_WORKER_CONCURRENCY
+    poll_interval = poll_interval if poll_interval is not None else settings.PDF_WORKER_POLL_INTERVAL
+    requeue_stale_jobs()
+
+    in_flight = {}
+    pool = create_render_pool(concurrency)
+    try:
+        while True:
+            for job in claim_jobs(concurrency - len(in_flight)):
+                resume = job.resume
+                if resume.template is None:
+                    finish_job(job, error='No template selected for this resume')
+                    continue
+                # Render what the resume holds now, which may be newer than at enqueue time
+                job.content_hash = resume_content_hash(resume)
+                if resume.pdf_hash == job.content_hash and resume.pdf_file:
+                    finish_job(job)
+                    continue
+                # The template is loaded by select_related and pickled along with the resume
+                in_flight[pool.submit(render_resume_pdf, resume)] = job
+
+            if not in_flight:
+                if once:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                job = in_flight.pop(future)
+                try:
+                    finish_job(job, data=future.result())
+                except BrokenProcessPool as e:
+                    logger.exception('PDF render process died while rendering job %s', job.id)
+                    finish_job(job, error=str(e))
+                    broken = True
+                except Exception as e:
+                    logger.exception('PDF render job %s failed', job.id)
+                    finish_job(job, error=str(e))
+
+            if broken:
+                # Every pending future of a broken pool fails too; start over with a fresh pool
+                for job in in_flight.values():
+                    PdfRenderJob.objects.filter(pk=job.pk).update(status='queued', started_at=None)
+                in_flight.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = create_render_pool(concurrency)
+
+            if done:
+                logger.info('PDF queue metrics: %s', queue_metrics())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+from io import BytesIO
+from urllib.parse import urljoin
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+from .catalog import bump_catalog_version
+from .models import Resume, ResumeTemplate
+from .rendering import render_resume_pdf
+
+# Rendered against every template to produce its gallery thumbnail
+SAMPLE_RESUME = {
+    'title': 'Sample Resume',
+    'personal_info': {
+        'name': 'Jordan Lee',
+        'email': 'jordan.lee@example.com',
+        'phone': '(555) 010-2030',
+        'linkedin': 'linkedin.com/in/jordanlee',
+    },
+    'professional_summary': (
+        'Software engineer with six years of experience building reliable web platforms. '
+        'Comfortable across the stack, from database tuning to accessible frontends.'
+    ),
+    'experience': [
+        {
+            'id': 'sample-exp-1',
+            'jobTitle': 'Senior Software Engineer',
+            'company': 'Northwind Labs',
+            'location': 'Seattle, WA',
+            'startDate': '2021-03',
+            'endDate': 'Present',
+            'description': 'Led the migration of the billing platform to an event-driven architecture, '
+                           'cutting invoice latency by 60% and on-call pages by half.',
+        },
+        {
+            'id': 'sample-exp-2',
+            'jobTitle': 'Software Engineer',
+            'company': 'Contoso',
+            'location': 'Portland, OR',
+            'startDate': '2018-06',
+            'endDate': '2021-02',
+            'description': 'Built internal analytics dashboards used by 400 account managers and '
+                           'introduced automated regression testing for the reporting API.',
+        },
+    ],
+    'education': [
+        {
+            'id': 'sample-edu-1',
+            'degree': 'B.S. Computer Science',
+            'institution': 'University of Washington',
+            'location': 'Seattle, WA',
+            'graduationDate': '2018',
+        },
+    ],
+    'skills': [
+        {'id': f'sample-skill-{i}', 'name': name}
+        for i, name in enumerate(['Python', 'Django', 'TypeScript', 'React', 'PostgreSQL', 'AWS', 'Docker'])
+    ],
+    'projects': [
+        {
+            'id': 'sample-proj-1',
+            'name': 'Open Transit Map',
+            'description': 'Real-time map of city transit vehicles with arrival predictions.',
+            'technologies': 'Python, Leaflet, Redis',
+        },
+    ],
+}
+
+
+def rasterize_first_page(pdf, width):
+    """Render page 1 of a PDF to a PIL image ``width`` pixels wide using poppler's pdftoppm."""
+    with tempfile.TemporaryDirectory() as workdir:
+        pdf_path = os.path.join(workdir, 'preview.pdf')
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf)
+        subprocess.run(
+            [settings.PREVIEW_RASTERIZER, '-png', '-f', '1', '-l', '1', '-singlefile',
+             '-scale-to-x', str(width), '-scale-to-y', '-1', pdf_path, os.path.join(workdir, 'page')],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            timeout=60, check=True,
+        )
+        with Image.open(os.path.join(workdir, 'page.png')) as image:
+            image.load()
+            return image.convert('RGB')
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'webp':
+        image.save(buffer, 'WEBP', quality=85, method=6)
+    else:
+        image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+def store_preview(data, width, image_format):
+    """Save an encoded image under a content-addressed name and return its URL."""
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    name = f'template_previews/{digest}-{width}.{image_format}'
+    # Identical renders map to the same file, so re-running is a no-op
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+    # The frontend runs on another origin, so local media URLs are made absolute
+    return urljoin(settings.SITE_URL, default_storage.url(name))
+
+def render_template_previews(template, widths=None, formats=None):
+    """Render a template against the sample resume and store page 1 at each width and format.
+
+    Returns the stored URLs as ``{width: {format: url}}``.
+    """
+    widths = sorted(widths or settings.PREVIEW_WIDTHS)
+    formats = formats or settings.PREVIEW_FORMATS
+
+    pdf = render_resume_pdf(Resume(template=template, **SAMPLE_RESUME))
+    # Rasterize once at the largest width and downscale for the others
+    page = rasterize_first_page(pdf, widths[-1])
+
+    images = {}
+    for width in widths:
+        height = round(page.height * width / page.width)
+        scaled = page if width == page.width else page.resize((width, height), Image.LANCZOS)
+        images[str(width)] = {
+            image_format: store_preview(_encode(scaled, image_format), width, image_format)
+            for image_format in formats
+        }
+    return images
+
+def update_template_previews(template, widths=None, formats=None):
+    """Render and attach previews without touching ``updated_at`` (which keys the render caches)."""
+    images = render_template_previews(template, widths, formats)
+    default_width = str(settings.PREVIEW_DEFAULT_WIDTH)
+    sizes = images.get(default_width) or images[max(images, key=int)]
+    preview_image = sizes.get('webp') or next(iter(sizes.values()))
+    ResumeTemplate.objects.filter(pk=template.pk).update(preview_image=preview_image, preview_images=images)
+    # update() sends no post_save, so the catalog is told directly
+    bump_catalog_version()
+    template.preview_image = preview_image
+    template.preview_images = images
+    return images
@@ -0,0 +1,182 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from .models import PdfRenderJob, Resume
+from .pdf_cache import CONTENT_FIELDS, resume_content_hash
+from .pdf_jobs import enqueue_pdf_render
+from .rendering import DEFAULT_SECTIONS_ORDER, SECTION_RENDERERS
+
+logger = logging.getLogger(__name__)
+
+# Resume fields that change what the public pages show, or whether they exist
+PUBLIC_FIELDS = (*CONTENT_FIELDS, 'template', 'is_public')
+
+PAGE_DIRECTORY = 'public_resumes/{}'
+# Digest of the resume's current page, set once that page is fully stored
+PAGE_DIGEST_KEY = 'resume_app:public_page:{}'
+
+
+def _page_name(resume_id, digest):
+    return f'{PAGE_DIRECTORY.format(resume_id)}/{digest}.html'
+
+def public_cache_control():
+    # Browsers recheck soon; shared caches keep the page until it is purged or expires
+    return (
+        f'public, max-age={settings.PUBLIC_RESUME_BROWSER_MAX_AGE}, '
+        f's-maxage={settings.PUBLIC_RESUME_MAX_AGE}'
+    )
+
+def render_public_html(resume):
+    """The resume as a standalone HTML page, styled and ordered like its PDF."""
+    template = resume.template
+    css_styles = template.css_styles if template else {}
+    personal_info = resume.personal_info if isinstance(resume.personal_info, dict) else {}
+    colors = css_styles.get('colors', {})
+    spacing = css_styles.get('spacing', {})
+    sections_order = template.layout_config.get('sections_order', DEFAULT_SECTIONS_ORDER) if template else DEFAULT_SECTIONS_ORDER
+    return render_to_string('resume_app/public_resume.html', {
+        'resume': resume,
+        'contact': ' | '.join(filter(None, (personal_info.get(key) for key in ('email', 'phone', 'linkedin')))),
+        'sections': [section for section in sections_order if section in SECTION_RENDERERS],
+        'skills': ', '.join(skill.get('name', '') for skill in resume.skills if isinstance(skill, dict) and skill.get('name')),
+        'style': {
+            'font_family': css_styles.get('fontFamily', 'Helvetica, sans-serif'),
+            'font_size': css_styles.get('fontSize', '11px'),
+            'line_height': css_styles.get('lineHeight', '1.4'),
+            'primary': colors.get('primary', '#000000'),
+            'secondary': colors.get('secondary', '#333333'),
+            'accent': colors.get('accent', '#2E86AB'),
+            'section_spacing': spacing.get('sectionSpacing', '16px'),
+            'item_spacing': spacing.get('itemSpacing', '8px'),
+        },
+    }).encode('utf-8')
+
+def store_public_html(resume, digest):
+    """Render the page for ``digest``, store it and drop the resume's older pages; returns the HTML."""
+    content = render_public_html(resume)
+    name = _page_name(resume.pk, digest)
+    if not default_storage.exists(name):
+        saved = default_storage.save(name, ContentFile(content))
+        if saved != name:
+            # Another process stored the same page first
+            default_storage.delete(saved)
+    purge_public_pages(resume.pk, keep=name)
+    # Without a shared CACHES backend other processes may serve the previous
+    # page until this expires, as browsers may anyway
+    cache.set(PAGE_DIGEST_KEY.format(resume.pk), digest, settings.PUBLIC_RESUME_BROWSER_MAX_AGE)
+    return content
+
+def public_page(resume_id):
+    """``(digest, html)`` of a public resume's page, None when the resume is not public.
+
+    The page stored for the current digest is served without loading the
+    resume itself; when the digest is not known or its page is missing,
+    the page is rendered from the resume now.
+    """
+    if not Resume.objects.filter(pk=resume_id, is_public=True).exists():
+        return None
+    digest = cache.get(PAGE_DIGEST_KEY.format(resume_id))
+    if digest is not None:
+        try:
+            with default_storage.open(_page_name(resume_id, digest), 'rb') as page:
+                return digest, page.read()
+        except OSError:
+            # Purged by a newer sync meanwhile
+            pass
+    resume = Resume.objects.select_related('template').filter(pk=resume_id, is_public=True).first()
+    if resume is None:
+        return None
+    digest = resume_content_hash(resume)
+    return digest, store_public_html(resume, digest)
+
+def purge_public_pages(resume_id, keep=None):
+    """Delete the resume's stored pages except ``keep``; returns how many were deleted."""
+    try:
+        _, files = default_storage.listdir(PAGE_DIRECTORY.format(resume_id))
+    except OSError:
+        return 0
+    deleted = 0
+    for filename in files:
+        name = f'{PAGE_DIRECTORY.format(resume_id)}/{filename}'
+        if name != keep:
+            default_storage.delete(name)
+            deleted += 1
+    return deleted
+
+def sync_public_resume(resume_id):
+    """Pre-render the pages of a public resume, or purge them once it is private or deleted.
+
+    The HTML is rendered here; the PDF is queued for the PDF worker and
+    rendered on the first request when no worker got to it yet.
+    """
+    resume = Resume.objects.select_related('template').filter(pk=resume_id).first()
+    if resume is None or not resume.is_public:
+        cache.delete(PAGE_DIGEST_KEY.format(resume_id))
+        changed = purge_public_pages(resume_id)
+    else:
+        digest = resume_content_hash(resume)
+        # No page for this digest yet: first publication or new content
+        changed = not default_storage.exists(_page_name(resume_id, digest))
+        store_public_html(resume, digest)
+        pdf_current = resume.pdf_hash == digest and resume.pdf_file
+        # The worker renders what the resume holds when it claims the job, so one queued job is enough
+        if resume.template and not pdf_current and not PdfRenderJob.objects.filter(resume=resume, status='queued').exists():
+            enqueue_pdf_render(resume)
+    if changed:
+        purge_proxy(resume_id)
+
+def purge_proxy(resume_id):
+    """Ask the reverse proxy (PUBLIC_RESUME_PURGE_URL) to drop its copies of the resume's public pages."""
+    base = settings.PUBLIC_RESUME_PURGE_URL.rstrip('/')
+    if not base:
+        return
+    with httpx.Client(timeout=settings.PUBLIC_RESUME_PURGE_TIMEOUT) as client:
+        for name in ('public_resume', 'public_resume_pdf'):
+            url = base + reverse(name, args=[resume_id])
+            try:
+                client.request('PURGE', url)
+            except httpx.HTTPError as e:
+                logger.warning('Purging %s from the proxy failed: %s', url, e)
+
+
+# Syncs run one at a time off the request thread; a resume already waiting
+# for one is not queued again, as the sync reads whatever was saved last
+_sync_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='public-pages')
+_pending = set()
+_pending_lock = threading.Lock()
+
+def public_resume_changed(resume_id):
+    """Re-sync the resume's public pages in the background once the current transaction commits."""
+    transaction.on_commit(lambda: _schedule_sync(resume_id))
+
+def _schedule_sync(resume_id):
+    # Until the sync stores the new page, requests render it from the committed resume
+    cache.delete(PAGE_DIGEST_KEY.format(resume_id))
+    with _pending_lock:
+        if resume_id in _pending:
+            return
+        _pending.add(resume_id)
+    _sync_executor.submit(_run_sync, resume_id)
+
+def _run_sync(resume_id):
+    with _pending_lock:
+        # Saves from now on need a sync of their own
+        _pending.discard(resume_id)
+    try:
+        sync_public_resume(resume_id)
+    except Exception:
+        logger.exception('Syncing the public pages of resume %s failed', resume_id)
+    finally:
+        connection.close()
+
+def wait_for_public_pages():
+    """Block until the syncs scheduled so far have finished."""
+    _sync_executor.submit(lambda: None).result()
@@ -0,0 +1,104 @@
+import logging
+import time
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('resume_app.queries')
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(max_queries):
+    """Declare the most SQL queries a view may run per request, authentication included.
+
+    Apply it above ``@api_view`` so that the budget sits on the final view.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class QueryStats:
+    """Execute wrapper counting the queries and DB time of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class QueryBudgetMiddleware:
+    """Count SQL queries and DB time per view, and flag views that exceed their budget.
+
+    Views declare budgets with ``@query_budget``. Overruns are logged, or
+    raised as QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is on (as in
+    tests). Queries run while a streaming response is consumed happen after
+    the middleware returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        with self.counting(stats):
+            response = self.get_response(request)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        # Async views run their ORM calls in the request's sync thread, so the
+        # wrappers are installed on that thread's connections
+        stats = QueryStats()
+        counting = await sync_to_async(self.counting)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(counting.close)()
+        return self.report(request, response, stats)
+
+    def counting(self, stats):
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def report(self, request, response, stats):
+        match = request.resolver_match
+        url_name = match.view_name if match else request.path
+        budget = getattr(request, 'query_budget', None)
+        response.query_stats = stats
+        response.query_budget = budget
+
+        if settings.DEBUG:
+            response['Server-Timing'] = f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries"'
+
+        if budget is not None and stats.count > budget:
+            message = f'{url_name} ran {stats.count} queries (budget {budget}) in {stats.duration * 1000:.1f}ms'
+            if settings.QUERY_BUDGET_ENFORCE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        else:
+            logger.debug('%s ran %d queries in %.1fms', url_name, stats.count, stats.duration * 1000)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = getattr(view_func, 'query_budget', None)
@@ -0,0 +1,365 @@
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from django.conf import settings
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from .fonts import resolve_font
+from .latex import LatexError, uses_latex, write_latex_pdf
+
+logger = logging.getLogger(__name__)
+
+
+def get_font_family(font_family):
+    """Get the appropriate font family with fallbacks."""
+    # Extract the first font from the font-family string
+    primary_font = font_family.split(',')[0].strip().strip('"\'')
+
+    # Map of font families to their ReportLab equivalents
+    font_map = {
+        'Calibri': 'Helvetica',  # Fallback to Helvetica
+        'Arial': 'Helvetica',    # Fallback to Helvetica
+        'Helvetica': 'Helvetica',
+        'Times New Roman': 'Times-Roman',
+        'Times': 'Times-Roman',
+        'Courier': 'Courier',
+        'Georgia': 'Times-Roman',  # Fallback to Times-Roman
+        'Lora': 'Times-Roman',     # Fallback to Times-Roman
+        'sans-serif': 'Helvetica',
+        'serif': 'Times-Roman',
+        'monospace': 'Courier'
+    }
+
+    # Return the mapped font or default to Helvetica
+    return font_map.get(primary_font, 'Helvetica')
+
+def convert_to_points(value, default=12):
+    """Convert CSS units (px, pt, in) to points for PDF generation."""
+    if not value:
+        return default
+
+    # Remove any whitespace
+    value = str(value).strip()
+
+    # Extract number and unit
+    number = ''
+    unit = ''
+    for char in value:
+        if char.isdigit() or char == '.':
+            number += char
+        else:
+            unit += char
+
+    try:
+        number = float(number)
+    except ValueError:
+        return default
+
+    # Convert to points based on unit
+    if unit == 'px':
+        # Approximate conversion: 1px ≈ 0.75pt
+        return number * 0.75
+    elif unit == 'pt':
+        return number
+    elif unit == 'in':
+        return number * 72  # 1 inch = 72 points
+    elif unit == 'mm':
+        return number * 2.83465  # 1 mm ≈ 2.83465 points
+    else:
+        return default
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """Everything about a template that does not depend on the resume being rendered."""
+    key: tuple
+    margins: dict
+    title_style: ParagraphStyle
+    heading_style: ParagraphStyle
+    normal_style: ParagraphStyle
+    section_spacing: float
+    item_spacing: float
+    sections: tuple
+
+
+class FlowableCache:
+    """Bounded LRU cache of the flowables built for one resume entry under one render plan."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            flowables = self._entries.get(key)
+            if flowables is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if flowables is None:
+            flowables = build()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = flowables
+                while len(self._entries) > settings.PDF_FLOWABLE_CACHE_SIZE:
+                    self._entries.popitem(last=False)
+        # Layout stores wrap state on each flowable, so every document gets its own copies
+        return [copy.copy(flowable) for flowable in flowables]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'max_entries': settings.PDF_FLOWABLE_CACHE_SIZE,
+            }
+
+flowable_cache = FlowableCache()
+
+def cached_flowables(plan, kind, content, build):
+    """Flowables for one entry, parsed only when the entry or the plan changed."""
+    digest = hashlib.sha1(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    return flowable_cache.get_or_build((plan.key, kind, digest), lambda: build(content, plan))
+
+def build_heading(title, plan):
+    return [Paragraph(title, plan.heading_style)]
+
+def build_summary(summary, plan):
+    return [Paragraph(summary, plan.normal_style)]
+
+def build_experience_entry(exp, plan):
+    exp_title = f"<b>{exp.get('jobTitle', '')}</b> at {exp.get('company', '')}"
+    exp_details = f"{exp.get('location', '')} | {exp.get('startDate', '')} - {exp.get('endDate', '')}"
+    flowables = [Paragraph(exp_title, plan.normal_style), Paragraph(exp_details, plan.normal_style)]
+
+    if exp.get('description'):
+        flowables.append(Paragraph(exp['description'], plan.normal_style))
+    flowables.append(Spacer(1, plan.item_spacing))
+    return flowables
+
+def build_education_entry(edu, plan):
+    edu_title = f"<b>{edu.get('degree', '')}</b> - {edu.get('institution', '')}"
+    edu_details = f"{edu.get('location', '')} | {edu.get('graduationDate', '')}"
+    return [
+        Paragraph(edu_title, plan.normal_style),
+        Paragraph(edu_details, plan.normal_style),
+        Spacer(1, plan.item_spacing),
+    ]
+
+def build_skills(skills, plan):
+    skills_text = ', '.join([skill.get('name', '') for skill in skills if skill.get('name')])
+    return [Paragraph(skills_text, plan.normal_style)]
+
+def build_project_entry(proj, plan):
+    flowables = [Paragraph(f"<b>{proj.get('name', '')}</b>", plan.normal_style)]
+
+    if proj.get('description'):
+        flowables.append(Paragraph(proj['description'], plan.normal_style))
+
+    if proj.get('technologies'):
+        flowables.append(Paragraph(f"Technologies: {proj['technologies']}", plan.normal_style))
+    flowables.append(Spacer(1, plan.item_spacing))
+    return flowables
+
+def build_personal_info(personal_info, plan):
+    flowables = []
+    if personal_info.get('name'):
+        flowables.append(Paragraph(personal_info['name'], plan.title_style))
+
+    contact_info = []
+    if personal_info.get('email'):
+        contact_info.append(personal_info['email'])
+    if personal_info.get('phone'):
+        contact_info.append(personal_info['phone'])
+    if personal_info.get('linkedin'):
+        contact_info.append(personal_info['linkedin'])
+
+    if contact_info:
+        flowables.append(Paragraph(' | '.join(contact_info), plan.normal_style))
+    return flowables
+
+def render_summary(resume, plan, story):
+    if not resume.professional_summary:
+        return
+    story += cached_flowables(plan, 'heading', "PROFESSIONAL SUMMARY", build_heading)
+    story += cached_flowables(plan, 'summary', resume.professional_summary, build_summary)
+    story.append(Spacer(1, plan.section_spacing))
+
+def render_experience(resume, plan, story):
+    if not resume.experience:
+        return
+    story += cached_flowables(plan, 'heading', "EXPERIENCE", build_heading)
+    for exp in resume.experience:
+        story += cached_flowables(plan, 'experience', exp, build_experience_entry)
+    story.append(Spacer(1, plan.section_spacing))
+
+def render_education(resume, plan, story):
+    if not resume.education:
+        return
+    story += cached_flowables(plan, 'heading', "EDUCATION", build_heading)
+    for edu in resume.education:
+        story += cached_flowables(plan, 'education', edu, build_education_entry)
+    story.append(Spacer(1, plan.section_spacing))
+
+def render_skills(resume, plan, story):
+    if not resume.skills:
+        return
+    story += cached_flowables(plan, 'heading', "SKILLS", build_heading)
+    story += cached_flowables(plan, 'skills', resume.skills, build_skills)
+    story.append(Spacer(1, plan.section_spacing))
+
+def render_projects(resume, plan, story):
+    if not resume.projects:
+        return
+    story += cached_flowables(plan, 'heading', "PROJECTS", build_heading)
+    for proj in resume.projects:
+        story += cached_flowables(plan, 'projects', proj, build_project_entry)
+    story.append(Spacer(1, plan.section_spacing))
+
+# Section names used in layout_config['sections_order'] and their renderers
+SECTION_RENDERERS = {
+    'summary': render_summary,
+    'experience': render_experience,
+    'education': render_education,
+    'skills': render_skills,
+    'projects': render_projects,
+}
+
+DEFAULT_SECTIONS_ORDER = ['summary', 'experience', 'education', 'skills', 'projects']
+
+def compile_render_plan(template):
+    """Resolve a template's CSS styles and section order into a RenderPlan."""
+    css_styles = template.css_styles
+    spacing = css_styles.get('spacing', {})
+    colors = css_styles.get('colors', {})
+
+    # Set margins based on template
+    margins = css_styles.get('margins', {})
+    margins = {
+        'rightMargin': convert_to_points(margins.get('right', '0.5in')),
+        'leftMargin': convert_to_points(margins.get('left', '0.5in')),
+        'topMargin': convert_to_points(margins.get('top', '0.5in')),
+        'bottomMargin': convert_to_points(margins.get('bottom', '0.5in')),
+    }
+
+    # Get styles
+    styles = getSampleStyleSheet()
+
+    # Prefer the embedded TTF stand-in, falling back to the base-14 fonts
+    css_font_family = css_styles.get('fontFamily', 'Helvetica, sans-serif')
+    font_family = resolve_font(css_font_family) or get_font_family(css_font_family)
+
+    # Create custom styles based on template
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontName=font_family,
+        fontSize=convert_to_points(css_styles.get('fontSize', '18pt')),
+        spaceAfter=convert_to_points(spacing.get('sectionSpacing', '30pt')),
+        alignment=1,  # Center alignment
+        textColor=colors.get('primary', '#000000')
+    )
+
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontName=font_family,
+        fontSize=convert_to_points(css_styles.get('fontSize', '14pt')),
+        spaceAfter=convert_to_points(spacing.get('itemSpacing', '12pt')),
+        textColor=colors.get('accent', '#2E86AB'),
+        fontStyle='bold'
+    )
+
+    normal_style = ParagraphStyle(
+        'CustomNormal',
+        parent=styles['Normal'],
+        fontName=font_family,
+        fontSize=convert_to_points(css_styles.get('fontSize', '10pt')),
+        spaceAfter=convert_to_points(spacing.get('itemSpacing', '12pt')),
+        textColor=colors.get('secondary', '#333333'),
+        leading=convert_to_points(css_styles.get('fontSize', '10pt')) * float(css_styles.get('lineHeight', '1.4'))
+    )
+
+    # Unknown section names (personalInfo, positions, ...) are dropped here once
+    sections_order = template.layout_config.get('sections_order', DEFAULT_SECTIONS_ORDER)
+    sections = tuple(SECTION_RENDERERS[section] for section in sections_order if section in SECTION_RENDERERS)
+
+    return RenderPlan(
+        key=(template.id, template.updated_at),
+        margins=margins,
+        title_style=title_style,
+        heading_style=heading_style,
+        normal_style=normal_style,
+        section_spacing=convert_to_points(spacing.get('sectionSpacing', '12pt')),
+        item_spacing=convert_to_points(spacing.get('itemSpacing', '6pt')),
+        sections=sections,
+    )
+
+_render_plans = {}
+_render_plans_lock = threading.Lock()
+
+def get_render_plan(template):
+    """Return the memoized RenderPlan for the template's current revision."""
+    key = (template.id, template.updated_at)
+    plan = _render_plans.get(key)
+    if plan is None:
+        plan = compile_render_plan(template)
+        with _render_plans_lock:
+            _forget_render_plans(template.id)
+            _render_plans[key] = plan
+    return plan
+
+def invalidate_render_plan(template_id):
+    """Forget every compiled plan of a template."""
+    with _render_plans_lock:
+        _forget_render_plans(template_id)
+
+def _forget_render_plans(template_id):
+    # Callers hold _render_plans_lock
+    for key in [key for key in _render_plans if key[0] == template_id]:
+        del _render_plans[key]
+
+def write_resume_pdf(resume, output):
+    """Render a resume with its template's styles into a writable file object."""
+    if uses_latex(resume.template):
+        try:
+            write_latex_pdf(resume, output)
+            return
+        except LatexError as e:
+            # Text TeX cannot typeset (say, characters outside its fonts) still gets a PDF
+            logger.warning('Rendering resume %s with ReportLab: %s', resume.pk, e)
+
+    plan = get_render_plan(resume.template)
+    doc = SimpleDocTemplate(output, pagesize=A4, **plan.margins)
+
+    # Build PDF content
+    story = []
+
+    # Personal Info
+    story += cached_flowables(plan, 'personal_info', resume.personal_info, build_personal_info)
+    story.append(Spacer(1, plan.section_spacing))
+
+    # Process sections in the order compiled from the template
+    for render_section in plan.sections:
+        render_section(resume, plan, story)
+
+    # Build PDF
+    doc.build(story)
+
+def render_resume_pdf(resume):
+    """Render a resume and return the PDF bytes."""
+    buffer = BytesIO()
+    write_resume_pdf(resume, buffer)
+    return buffer.getvalue()
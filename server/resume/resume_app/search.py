@@ -0,0 +1,147 @@
+import re
+import uuid
+from django.db import connection
+from django.utils.html import escape
+from .models import Resume, ResumeSearchDocument
+
+# Resume fields flattened into ResumeSearchDocument
+SEARCH_FIELDS = ('title', 'professional_summary', 'experience', 'projects', 'skills')
+
+FTS_TABLE = 'resume_app_resumesearch'
+DOCUMENT_TABLE = ResumeSearchDocument._meta.db_table
+RESUME_TABLE = Resume._meta.db_table
+SEARCH_CONFIG = 'english'
+
+# Private-use characters mark matches in snippets until the text is escaped
+MATCH_START, MATCH_END = '\ue000', '\ue001'
+
+# Column weights, in SEARCH_FIELDS order (bm25 on SQLite, setweight classes on PostgreSQL)
+FTS_WEIGHTS = (10.0, 4.0, 3.0, 2.0, 3.0)
+TSVECTOR_WEIGHTS = ('A', 'B', 'B', 'C', 'B')
+
+def _tsvector(alias=''):
+    return ' || '.join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', {alias}{field}), '{weight}')"
+        for field, weight in zip(SEARCH_FIELDS, TSVECTOR_WEIGHTS)
+    )
+
+# Queries must repeat the expression of the GIN index (migration 0010) exactly for PostgreSQL to use it
+TSVECTOR = _tsvector('d.')
+
+
+class SearchUnavailable(Exception):
+    """The database backend has no full-text index for resumes."""
+
+
+def flatten_text(value):
+    """All the text in a JSON value, one string per line; entry ids are skipped."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return '\n'.join(filter(None, (flatten_text(item) for key, item in value.items() if key != 'id')))
+    if isinstance(value, list):
+        return '\n'.join(filter(None, (flatten_text(item) for item in value)))
+    return ''
+
+def document_fields(resume):
+    return {field: flatten_text(getattr(resume, field)) for field in SEARCH_FIELDS}
+
+def update_search_document(resume, created=False):
+    """Re-index one resume; ``created`` skips the UPDATE attempt for new resumes."""
+    fields = document_fields(resume)
+    if created or not ResumeSearchDocument.objects.filter(resume_id=resume.pk).update(**fields):
+        ResumeSearchDocument.objects.create(resume_id=resume.pk, **fields)
+
+def reindex_resume(resume_id):
+    """Re-index a resume written with QuerySet.update(), which sends no post_save."""
+    resume = Resume.objects.only(*SEARCH_FIELDS).filter(pk=resume_id).first()
+    if resume is not None:
+        update_search_document(resume)
+
+def rebuild_search_index(batch_size=500):
+    """Recreate every search document and compact the index; returns the resume count."""
+    count = 0
+    ResumeSearchDocument.objects.all().delete()
+    resumes = Resume.objects.only(*SEARCH_FIELDS).order_by('pk').iterator(chunk_size=batch_size)
+    batch = []
+    for resume in resumes:
+        batch.append(ResumeSearchDocument(resume_id=resume.pk, **document_fields(resume)))
+        if len(batch) >= batch_size:
+            count += len(ResumeSearchDocument.objects.bulk_create(batch))
+            batch = []
+    count += len(ResumeSearchDocument.objects.bulk_create(batch))
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return count
+
+def _terms(query):
+    # Words only: user input never reaches the FTS query syntax
+    return re.findall(r'\w+', query)
+
+def _sqlite_search(terms, where, params, limit):
+    # Every term must match; the last one may be a prefix, for search-as-you-type
+    match = ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    sql = f"""
+        SELECT d.resume_id,
+               -bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))}) AS rank,
+               snippet({FTS_TABLE}, -1, %s, %s, '…', 16) AS snippet
+        FROM {FTS_TABLE}
+        JOIN {DOCUMENT_TABLE} d ON d.id = {FTS_TABLE}.rowid
+        JOIN {RESUME_TABLE} r ON r.id = d.resume_id
+        WHERE {FTS_TABLE} MATCH %s AND {where}
+        ORDER BY bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))})
+        LIMIT %s
+    """
+    return sql, [MATCH_START, MATCH_END, match, *params, limit]
+
+def _postgresql_search(terms, where, params, limit):
+    tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+    # Headlines are only built for the rows that made the page
+    sql = f"""
+        SELECT hit.resume_id, hit.rank,
+               ts_headline('{SEARCH_CONFIG}', concat_ws(' … ', hit.professional_summary, hit.experience, hit.projects, hit.skills),
+                           hit.query, %s) AS snippet
+        FROM (
+            SELECT d.*, q.query, ts_rank_cd({TSVECTOR}, q.query) AS rank
+            FROM {DOCUMENT_TABLE} d
+            JOIN {RESUME_TABLE} r ON r.id = d.resume_id
+            CROSS JOIN to_tsquery('{SEARCH_CONFIG}', %s) AS q(query)
+            WHERE ({TSVECTOR}) @@ q.query AND {where}
+            ORDER BY rank DESC
+            LIMIT %s
+        ) hit
+        ORDER BY hit.rank DESC
+    """
+    options = f'StartSel={MATCH_START}, StopSel={MATCH_END}, MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+    return sql, [options, tsquery, *params, limit]
+
+def highlight(snippet):
+    """HTML-escape a snippet and wrap its matches in <mark>."""
+    return escape(snippet or '').replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+def search_resume_index(query, user, scope='all', limit=20):
+    """Rank resumes matching ``query``: the user's own ('mine'), public ones ('public'), or both.
+
+    Returns ``(resume_id, rank, snippet)`` tuples, best first. Matching and
+    ranking run on the full-text index; the JSON columns are never scanned.
+    """
+    builders = {'sqlite': _sqlite_search, 'postgresql': _postgresql_search}
+    if connection.vendor not in builders:
+        raise SearchUnavailable(f'Full-text search is not supported on {connection.vendor}')
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    if scope == 'mine':
+        where, params = 'r.user_id = %s', [user.pk]
+    elif scope == 'public':
+        where, params = 'r.is_public', []
+    else:
+        where, params = '(r.user_id = %s OR r.is_public)', [user.pk]
+
+    sql, params = builders[connection.vendor](terms, where, params, limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [(uuid.UUID(str(resume_id)), rank, highlight(snippet)) for resume_id, rank, snippet in cursor.fetchall()]
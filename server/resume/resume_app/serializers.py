@@ -1,10 +1,131 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
 from django.contrib.auth.password_validation import validate_password
-from .models import Resume, ResumeTemplate
+from .models import Resume, ResumeTemplate, PdfRenderJob
 
 User = get_user_model()
 
+def _query_list(request, param):
+    # Only reads are trimmed; a write must still see every field it was sent
+    if request is None or request.method not in SAFE_METHODS or param not in request.query_params:
+        return None
+    return [name.strip() for name in request.query_params[param].split(',') if name.strip()]
+
+def sparse_fields(request):
+    """Serializer kwargs for the request's ``?fields=``/``?exclude=``; empty when it has neither."""
+    params = {'fields': _query_list(request, 'fields'), 'exclude': _query_list(request, 'exclude')}
+    return {key: value for key, value in params.items() if value is not None}
+
+def _nested(field):
+    field = getattr(field, 'child', field)
+    return field if isinstance(field, serializers.Serializer) else None
+
+def prune_fields(serializer, fields=None, exclude=None):
+    """Drop serializer fields not listed in ``fields`` or listed in ``exclude``.
+
+    Dotted names such as ``template_details.name`` reach into nested serializers.
+    """
+    if fields is not None:
+        wanted = {}
+        for name in fields:
+            head, _, rest = name.partition('.')
+            wanted.setdefault(head, []).append(rest)
+        unknown = set(wanted) - set(serializer.fields)
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        for name in list(serializer.fields):
+            nested = _nested(serializer.fields[name])
+            if name not in wanted:
+                serializer.fields.pop(name)
+            elif nested is not None and all(wanted[name]):
+                prune_fields(nested, fields=wanted[name])
+
+    for name in exclude or ():
+        head, _, rest = name.partition('.')
+        nested = _nested(serializer.fields.get(head))
+        if rest and nested is not None:
+            prune_fields(nested, exclude=[rest])
+        else:
+            serializer.fields.pop(head, None)
+
+def projection(serializer, model, prefix=''):
+    """Column lookups and joins needed to serialize ``model`` rows.
+
+    Returns ``(only, select_related)``, or None when a field reads something
+    other than model columns and the whole row has to be loaded.
+    """
+    only, related = [prefix + model._meta.pk.name], []
+    columns = getattr(getattr(serializer, 'Meta', None), 'field_columns', {})
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in columns:
+            lookups = columns[name]
+        elif field.source == '*':
+            return None
+        else:
+            lookups = [field.source.replace('.', '__')]
+
+        for lookup in lookups:
+            current, attrs = model, lookup.split('__')
+            for depth, attr in enumerate(attrs, 1):
+                try:
+                    model_field = current._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    return None
+                if model_field.is_relation and depth < len(attrs):
+                    related.append(prefix + '__'.join(attrs[:depth]))
+                    current = model_field.related_model
+            nested = _nested(field) if name not in columns else None
+            if nested is not None and model_field.is_relation:
+                related.append(prefix + lookup)
+                nested_projection = projection(nested, model_field.related_model, prefix + lookup + '__')
+                if nested_projection is None:
+                    # Without a column list the joined row is loaded in full
+                    only.append(prefix + lookup)
+                else:
+                    only.extend(nested_projection[0])
+                    related.extend(nested_projection[1])
+            else:
+                only.append(prefix + lookup)
+    return only, related
+
+
+class SparseListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        if isinstance(data, QuerySet):
+            data = self.child.project(data)
+        return super().to_representation(data)
+
+
+class SparseFieldsMixin:
+    """Accepts ``fields``/``exclude`` kwargs (see ``sparse_fields``) to trim the representation.
+
+    ``project()`` narrows a queryset to the columns the remaining fields read,
+    so trimmed fields are never loaded or decoded. Fields computed from
+    something other than columns are mapped with ``Meta.field_columns``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None or exclude:
+            prune_fields(self, fields, exclude)
+
+    def project(self, queryset):
+        """Restrict ``queryset`` to the columns and joins this serializer reads."""
+        plan = projection(self, queryset.model)
+        if plan is None:
+            return queryset
+        only, related = plan
+        if related:
+            queryset = queryset.select_related(*dict.fromkeys(related))
+        return queryset.only(*dict.fromkeys(only))
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
@@ -23,14 +144,16 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         user = User.objects.create_user(**validated_data)
         return user
     
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
+        list_serializer_class = SparseListSerializer
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'profile_picture', 'provider')
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
+        list_serializer_class = SparseListSerializer
         fields = (
             'id', 'username', 'email', 'first_name', 'last_name', 'profile_picture', 
             'provider', 'phone', 'linkedin_url', 'github_url', 'portfolio_url', 
@@ -38,12 +161,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
         )
         read_only_fields = ('id', 'username', 'email', 'provider')
 
-class ResumeTemplateSerializer(serializers.ModelSerializer):
+class ResumeTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ResumeTemplate
+        list_serializer_class = SparseListSerializer
         fields = '__all__'
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     template_details = ResumeTemplateSerializer(source='template', read_only=True)
     user_name = serializers.CharField(source='user.get_full_name', read_only=True)
     
@@ -53,16 +177,54 @@ class ResumeSerializer(serializers.ModelSerializer):
             'id', 'user', 'template', 'template_details', 'title', 'personal_info',
             'professional_summary', 'experience', 'education', 'skills', 'projects',
             'additional_sections', 'template_options', 'is_public', 'pdf_file',
-            'created_at', 'updated_at', 'user_name'
+            'version', 'created_at', 'updated_at', 'user_name'
         ]
-        read_only_fields = ('id', 'user', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'user', 'version', 'created_at', 'updated_at')
+        list_serializer_class = SparseListSerializer
+        field_columns = {'user_name': ['user__first_name', 'user__last_name']}
 
-class ResumeListSerializer(serializers.ModelSerializer):
+class ResumeListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     template_name = serializers.CharField(source='template.name', read_only=True)
     
     class Meta:
         model = Resume
         fields = ['id', 'title', 'template_name', 'created_at', 'updated_at']
+        list_serializer_class = SparseListSerializer
+        
+class ResumeSearchResultSerializer(ResumeListSerializer):
+    # Set on each resume by the search view
+    rank = serializers.FloatField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+    
+    class Meta(ResumeListSerializer.Meta):
+        fields = ['id', 'title', 'template_name', 'is_public', 'rank', 'snippet', 'created_at', 'updated_at']
+        field_columns = {'rank': [], 'snippet': []}
+        
+class PdfRenderJobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = PdfRenderJob
+        fields = ['id', 'resume', 'status', 'error', 'created_at', 'started_at', 'finished_at']
+        list_serializer_class = SparseListSerializer
+        
+class ResumeImportSerializer(serializers.ModelSerializer):
+    """One line of an NDJSON import; owners and templates are looked up a batch at a time by the importer."""
+    id = serializers.UUIDField(required=False)
+    user = serializers.EmailField(required=False)
+    template = serializers.UUIDField(required=False, allow_null=True)
+    personal_info = serializers.DictField(required=False)
+    experience = serializers.ListField(required=False)
+    education = serializers.ListField(required=False)
+    skills = serializers.ListField(required=False)
+    projects = serializers.ListField(required=False)
+    additional_sections = serializers.DictField(required=False)
+    template_options = serializers.DictField(required=False)
+    
+    class Meta:
+        model = Resume
+        fields = [
+            'id', 'user', 'template', 'title', 'personal_info', 'professional_summary', 'experience',
+            'education', 'skills', 'projects', 'additional_sections', 'template_options', 'is_public'
+        ]
         
 class SocialAuthSerializer(serializers.Serializer):
     provider = serializers.CharField(required=False)
@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .models import Resume, ResumeTemplate
+from .catalog import bump_catalog_version
+from .rendering import invalidate_render_plan
+from .search import SEARCH_FIELDS, update_search_document
+from .public_pages import PUBLIC_FIELDS, public_resume_changed
+from .authentication import invalidate_user
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=Resume)
+def delete_cached_pdf(sender, instance, **kwargs):
+    """Remove the cached PDF from storage along with its resume."""
+    if instance.pdf_file:
+        instance.pdf_file.delete(save=False)
+
+@receiver(post_save, sender=Resume)
+def index_resume(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the resume's search document current; its row goes with the resume on delete."""
+    if created or update_fields is None or not update_fields.isdisjoint(SEARCH_FIELDS):
+        update_search_document(instance, created=created)
+
+@receiver(post_save, sender=Resume)
+def sync_public_pages(sender, instance, created, update_fields=None, **kwargs):
+    """Pre-render a public resume's pages, or purge them once it is no longer public."""
+    if update_fields is not None and update_fields.isdisjoint(PUBLIC_FIELDS):
+        return
+    # A resume that was private before and still is has no pages; an instance
+    # not loaded with is_public (None) may have had some
+    if instance.is_public or (not created and getattr(instance, '_stored_is_public', None) is not False):
+        public_resume_changed(instance.pk)
+    instance._stored_is_public = instance.is_public
+
+@receiver(post_delete, sender=Resume)
+def purge_deleted_public_pages(sender, instance, **kwargs):
+    """Delete a public resume's stored pages along with it."""
+    if instance.is_public:
+        public_resume_changed(instance.pk)
+
+@receiver(post_save, sender=ResumeTemplate)
+def resync_template_public_pages(sender, instance, **kwargs):
+    """Stored public pages of the template's resumes carry its old styles."""
+    for resume_id in Resume.objects.filter(template=instance, is_public=True).values_list('pk', flat=True):
+        public_resume_changed(resume_id)
+
+@receiver(post_save, sender=ResumeTemplate)
+@receiver(post_delete, sender=ResumeTemplate)
+def invalidate_template_render_plan(sender, instance, **kwargs):
+    """Recompile the template's render plan on its next use."""
+    invalidate_render_plan(instance.id)
+
+@receiver(post_save, sender=ResumeTemplate)
+@receiver(post_delete, sender=ResumeTemplate)
+def invalidate_template_catalog(sender, **kwargs):
+    """Rebuild the cached template catalog on its next request."""
+    bump_catalog_version()
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Reload the user on its next authenticated request."""
+    invalidate_user(instance.pk)
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """Group and permission edits in the admin change what a cached user may do."""
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_user(instance.pk)
+        return
+    if action == 'pre_clear':
+        # Clearing a group or permission: its users are only known beforehand
+        field = 'groups' if sender is User.groups.through else 'user_permissions'
+        pk_set = set(User.objects.filter(**{field: instance}).values_list('pk', flat=True))
+    elif action not in ('post_add', 'post_remove'):
+        return
+    for user_id in pk_set or ():
+        invalidate_user(user_id)
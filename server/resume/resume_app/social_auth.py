@@ -0,0 +1,141 @@
+import asyncio
+import weakref
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt
+from rest_framework_simplejwt.tokens import RefreshToken
+from .google_certs import CertificateFetchError, google_cert_cache
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+GOOGLE_ISSUERS = ('accounts.google.com', 'https://accounts.google.com')
+
+# One pooled client per event loop: under ASGI that is one per worker, while
+# WSGI runs each async view in a fresh loop that a client must not outlive
+_clients = weakref.WeakKeyDictionary()
+
+
+class SocialAuthError(Exception):
+    """The provider rejected the token or did not return a usable identity."""
+
+
+async def http_client():
+    """Shared keep-alive HTTP client for outbound provider calls on the running loop.
+
+    The client is closed when its loop shuts down: asyncio.run, which both
+    asgiref (async views under WSGI) and ASGI servers run their loop with,
+    closes the loop's suspended async generators before returning.
+    """
+    loop = asyncio.get_running_loop()
+    client, _ = _clients.get(loop, (None, None))
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.SOCIAL_AUTH_HTTP_TIMEOUT, connect=settings.SOCIAL_AUTH_HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SOCIAL_AUTH_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SOCIAL_AUTH_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60,
+            ),
+        )
+        closer = _close_with_loop(loop, client)
+        await anext(closer)
+        # The loop only keeps a weak reference to the generator
+        _clients[loop] = client, closer
+    return client
+
+async def _close_with_loop(loop, client):
+    try:
+        yield
+    finally:
+        # The client's connections can refer back to the loop, which would keep the entry alive
+        if _clients.get(loop, (None,))[0] is client:
+            del _clients[loop]
+        await client.aclose()
+
+async def _get_json(url, access_token):
+    try:
+        response = await (await http_client()).get(url, headers={'Authorization': f'Bearer {access_token}'})
+    except httpx.HTTPError as e:
+        raise SocialAuthError(f'Could not reach the provider: {e.__class__.__name__}') from e
+    if response.status_code != 200:
+        raise SocialAuthError(f'Provider returned HTTP {response.status_code}')
+    return response.json()
+
+async def fetch_linkedin_identity(access_token):
+    """Email, names and picture of a LinkedIn member; profile and email are fetched concurrently."""
+    base = settings.LINKEDIN_API_URL.rstrip('/')
+    profile_data, email_data = await asyncio.gather(
+        _get_json(f'{base}/v2/people/~:(id,firstName,lastName,profilePicture(displayImage~:playableStreams))', access_token),
+        _get_json(f'{base}/v2/emailAddress?q=members&projection=(elements*(handle~))', access_token),
+    )
+    try:
+        email = email_data['elements'][0]['handle~']['emailAddress']
+    except (KeyError, IndexError, TypeError) as e:
+        raise SocialAuthError('LinkedIn did not return an email address') from e
+
+    picture = ''
+    if 'profilePicture' in profile_data:
+        picture_data = profile_data['profilePicture'].get('displayImage~', {})
+        if 'elements' in picture_data and picture_data['elements']:
+            picture = picture_data['elements'][-1]['identifiers'][0]['identifier']
+    return {
+        'email': email,
+        'first_name': profile_data.get('firstName', {}).get('localized', {}).get('en_US', ''),
+        'last_name': profile_data.get('lastName', {}).get('localized', {}).get('en_US', ''),
+        'picture': picture,
+    }
+
+async def verify_google_id_token(token):
+    """Claims of a Google ID token issued to this app.
+
+    The signature is checked against cached certificates; the network is
+    only used when none are cached or the token names an unknown key.
+    """
+    try:
+        kid = jwt.decode_header(token).get('kid')
+    except (ValueError, TypeError, google_exceptions.GoogleAuthError) as e:
+        raise SocialAuthError(str(e)) from e
+    certs = google_cert_cache.peek(kid)
+    if certs is None:
+        try:
+            certs = await sync_to_async(google_cert_cache.certs, thread_sensitive=False)(kid)
+        except CertificateFetchError as e:
+            raise SocialAuthError(str(e)) from e
+    try:
+        idinfo = jwt.decode(token, certs=certs, audience=settings.SOCIAL_AUTH_GOOGLE_OAUTH2_KEY or None, clock_skew_in_seconds=10)
+    except (ValueError, google_exceptions.GoogleAuthError) as e:
+        raise SocialAuthError(str(e)) from e
+    if idinfo.get('iss') not in GOOGLE_ISSUERS:
+        raise SocialAuthError('Wrong issuer.')
+    return idinfo
+
+def issue_tokens(user):
+    # Outstanding refresh tokens are recorded in the database by the blacklist app
+    refresh = RefreshToken.for_user(user)
+    return {
+        'user': UserSerializer(user).data,
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+async def social_login(provider, email, username, first_name='', last_name='', picture=''):
+    """Find or create the user for a verified social identity and issue JWTs."""
+    user, created = await User.objects.aget_or_create(
+        email=email,
+        defaults={
+            'username': username,
+            'first_name': first_name,
+            'last_name': last_name,
+            'profile_picture': picture,
+            'provider': provider,
+        }
+    )
+    if not created and not user.provider:
+        user.provider = provider
+        user.profile_picture = picture
+        await user.asave()
+    return await sync_to_async(issue_tokens)(user)
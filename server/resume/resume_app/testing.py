@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+from django.db import connections
+from django.test.utils import override_settings
+from .query_budget import QueryStats
+
+
+def enforce_query_budgets(test_item):
+    """Class or method decorator: requests over their view's query budget raise QueryBudgetExceeded."""
+    return override_settings(QUERY_BUDGET_ENFORCE=True)(test_item)
+
+
+class QueryBudgetMixin:
+    """TestCase mixin with assertions over the stats QueryBudgetMiddleware attaches to responses."""
+
+    def assertWithinQueryBudget(self, response, max_queries=None):
+        stats = response.query_stats
+        budget = response.query_budget if max_queries is None else max_queries
+        if budget is None:
+            self.fail('View declares no query budget; decorate it with @query_budget')
+        self.assertLessEqual(
+            stats.count, budget,
+            f'{stats.count} queries ({stats.duration * 1000:.1f}ms) over a budget of {budget}',
+        )
+
+    @contextmanager
+    def assertMaxQueries(self, max_queries, using='default'):
+        """Like assertNumQueries, but passes for any count up to ``max_queries``."""
+        stats = QueryStats()
+        with connections[using].execute_wrapper(stats):
+            yield stats
+        self.assertLessEqual(stats.count, max_queries, f'{stats.count} queries over a budget of {max_queries}')
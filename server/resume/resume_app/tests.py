@@ -1,3 +1,1295 @@
-from django.test import TestCase
+import asyncio
+import base64
+import io
+import json
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest import mock
+import httpx
+from reportlab import rl_config
+from django.contrib.auth.signals import user_login_failed
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+from .authentication import user_cache
+from .benchmarks import synthetic_resume_data
+from .blacklist import FingerprintSet, IndexedRefreshToken, blacklist_index, prune_expired_tokens
+from .delivery import parse_range
+from .google_certs import CertificateFetchError, GoogleCertCache
+from .latex import latex_escape
+from .models import CustomUser, PdfRenderJob, Resume, ResumeSearchDocument, ResumeTemplate
+from .pagination import encode_cursor
+from .pdf_cache import evict_pdf_cache, open_resume_pdf, resume_content_hash
+from .public_pages import PAGE_DIGEST_KEY, wait_for_public_pages
+from .rendering import flowable_cache, get_render_plan, render_resume_pdf
+from .pdf_jobs import claim_jobs, enqueue_pdf_render, finish_job, requeue_stale_jobs, run_worker
+from .passwords import PasswordHashPool
+from .testing import QueryBudgetMixin, enforce_query_budgets
+from .write_buffer import write_buffer
 
-# Create your tests here.
+
+class TemporaryMediaMixin:
+    """Rendered PDFs and public pages go to a throwaway MEDIA_ROOT."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+
+
+class APITestCase(TemporaryMediaMixin, QueryBudgetMixin, TestCase):
+    """Requests authenticated with a JWT, as the frontend sends them, against the stock templates."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('populate_templates', stdout=io.StringIO())
+        cls.template = ResumeTemplate.objects.filter(is_latex_template=False).order_by('name').first()
+        cls.user = CustomUser.objects.create_user(email='alex@example.com', username='alex')
+
+    def setUp(self):
+        # Users, catalog versions and buffered edits outlive the rolled back test data
+        cache.clear()
+        user_cache.clear()
+        write_buffer._entries.clear()
+        self.addCleanup(write_buffer._entries.clear)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def create_resume(self, entries=5, **fields):
+        return Resume.objects.create(user=self.user, **{'template': self.template, **synthetic_resume_data(entries), **fields})
+
+
+@enforce_query_budgets
+class QueryBudgetTests(APITestCase):
+    """Every budgeted view, with enough data that a per-row query would show."""
+
+    def test_user_resumes(self):
+        for i in range(45):
+            self.create_resume(entries=3, title=f'Resume {i}')
+        url, seen = '/api/auth/resumes/', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertWithinQueryBudget(response)
+            seen += [resume['id'] for resume in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(len(seen), 45)
+
+    def test_resume_detail(self):
+        resume = self.create_resume(entries=20)
+        response = self.client.get(f'/api/auth/resumes/{resume.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(response.data['template_details']['id'], str(self.template.pk))
+
+    def test_create_resume(self):
+        data = {**synthetic_resume_data(20), 'template': str(self.template.pk)}
+        response = self.client.post('/api/auth/resumes/create/', data, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertWithinQueryBudget(response)
+        # Indexed by the post_save signal, inside the same budget
+        resume = Resume.objects.get(pk=response.data['id'])
+        self.assertEqual(resume.user, self.user)
+        self.assertEqual(ResumeSearchDocument.objects.get(resume=resume).title, data['title'])
+
+    def test_update_resume(self):
+        resume = self.create_resume(entries=20)
+        url = f'/api/auth/resumes/{resume.pk}/update/'
+        response = self.client.put(url, {'title': 'Renamed', 'is_public': True}, format='json', HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+        response = self.client.patch(
+            url, [{'op': 'replace', 'path': '/experience/exp-3/company', 'value': 'Acme'}],
+            content_type='application/json-patch+json', HTTP_IF_MATCH='"2"',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertWithinQueryBudget(response)
+        self.assertEqual(response['ETag'], '"3"')
+
+    def test_generate_resume_pdf(self):
+        resume = self.create_resume(entries=10)
+        url = f'/api/auth/resumes/{resume.pk}/pdf/'
+        # The first request renders, the second is served from the render cache
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertWithinQueryBudget(response)
+            self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_resume_templates(self):
+        self.client.credentials()
+        for query in ('', '?fields=id,name,ats_score'):
+            response = self.client.get(f'/api/auth/templates/{query}')
+            self.assertEqual(response.status_code, 200)
+            self.assertWithinQueryBudget(response)
+            self.assertEqual(len(response.json()), ResumeTemplate.objects.count())
+
+
+class CursorPaginationTests(APITestCase):
+
+    def list_all(self, limit):
+        url, pages, seen = f'/api/auth/resumes/?limit={limit}', 0, []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages += 1
+            seen += [resume['id'] for resume in response.data['results']]
+            url = response.data['next']
+        return pages, seen
+
+    def test_tied_updated_at(self):
+        resumes = [self.create_resume(entries=1, title=f'Resume {i}') for i in range(23)]
+        # Three timestamps shared by several rows each, so page boundaries fall inside ties
+        now = timezone.now()
+        for i, resume in enumerate(resumes):
+            Resume.objects.filter(pk=resume.pk).update(updated_at=now - timedelta(minutes=i % 3))
+        expected = [
+            str(pk) for pk in Resume.objects.filter(user=self.user).order_by('-updated_at', '-id').values_list('id', flat=True)
+        ]
+        for limit in (1, 4, 7, 100):
+            pages, seen = self.list_all(limit)
+            self.assertEqual(seen, expected, f'limit={limit}')
+            self.assertEqual(pages, -(-len(expected) // limit))
+
+    def test_only_own_resumes(self):
+        other = CustomUser.objects.create_user(email='sam@example.com', username='sam')
+        Resume.objects.create(user=other, title='Not mine')
+        mine = self.create_resume(entries=1)
+        self.assertEqual(self.list_all(10)[1], [str(mine.pk)])
+
+    def test_malformed_cursor(self):
+        resume = self.create_resume(entries=1)
+        def b64(text):
+            return base64.urlsafe_b64encode(text.encode()).decode().rstrip('=')
+        cursors = [
+            'not-a-cursor!',
+            b64('not json'),
+            b64('[1, 2]'),
+            b64(json.dumps({'v': 99, 'u': resume.updated_at.isoformat(), 'i': str(resume.pk)})),
+            b64(json.dumps({'v': 1, 'u': 'yesterday', 'i': str(resume.pk)})),
+            b64(json.dumps({'v': 1, 'u': resume.updated_at.isoformat(), 'i': 'not-a-uuid'})),
+            encode_cursor(resume.updated_at, resume.pk)[:-3],
+        ]
+        for cursor in cursors:
+            response = self.client.get('/api/auth/resumes/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+        response = self.client.get('/api/auth/resumes/', {'cursor': encode_cursor(resume.updated_at, resume.pk)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {'next': None, 'results': []})
+
+
+class TemplateCatalogTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.credentials()
+
+    def test_served_from_memory(self):
+        response = self.client.get('/api/auth/templates/')
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            again = self.client.get('/api/auth/templates/')
+        self.assertEqual((again.content, again['ETag']), (response.content, response['ETag']))
+
+    def test_conditional_get(self):
+        for url in ('/api/auth/templates/', f'/api/auth/templates/{self.template.pk}/'):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+    def test_template_edit_changes_etag(self):
+        listing = self.client.get('/api/auth/templates/')
+        detail = self.client.get(f'/api/auth/templates/{self.template.pk}/')
+        self.template.name = 'Renamed'
+        self.template.save()
+
+        response = self.client.get('/api/auth/templates/', HTTP_IF_NONE_MATCH=listing['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renamed', [template['name'] for template in response.json()])
+        response = self.client.get(f'/api/auth/templates/{self.template.pk}/', HTTP_IF_NONE_MATCH=detail['ETag'])
+        self.assertEqual((response.status_code, response.json()['name']), (200, 'Renamed'))
+
+    def test_unknown_template(self):
+        response = self.client.get('/api/auth/templates/00000000-0000-0000-0000-000000000000/')
+        self.assertEqual(response.status_code, 404)
+
+
+class SparseFieldsetTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume(entries=3)
+        self.url = f'/api/auth/resumes/{self.resume.pk}/'
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,title'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'id', 'title'})
+        # The JSON content columns are not even loaded
+        self.assertNotIn('"experience"', queries[-1]['sql'])
+
+    def test_nested_fields(self):
+        response = self.client.get(self.url, {'fields': 'id,template_details.name'})
+        self.assertEqual(response.data['template_details'], {'name': self.template.name})
+
+    def test_exclude(self):
+        response = self.client.get(self.url, {'exclude': 'experience,template_details.css_styles'})
+        self.assertNotIn('experience', response.data)
+        self.assertIn('education', response.data)
+        self.assertNotIn('css_styles', response.data['template_details'])
+        self.assertIn('name', response.data['template_details'])
+
+    def test_unknown_field(self):
+        response = self.client.get(self.url, {'fields': 'id,salary'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('salary', str(response.data['fields']))
+
+    def test_list_within_budget(self):
+        for _ in range(3):
+            self.create_resume(entries=1)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/auth/resumes/', {'fields': 'id'})
+        self.assertEqual([set(item) for item in response.data['results']], [{'id'}] * 4)
+
+    def test_writes_return_every_field(self):
+        response = self.client.post(
+            '/api/auth/resumes/create/?fields=id', {'title': 'New', 'template': str(self.template.pk)}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('experience', response.data)
+
+
+class SearchTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other = CustomUser.objects.create_user(email='sam@example.com', username='sam')
+
+    def add(self, title, summary='', user=None, **fields):
+        return Resume.objects.create(
+            user=user or self.user, template=self.template, title=title, professional_summary=summary, **fields
+        )
+
+    def search(self, q, **params):
+        response = self.client.get('/api/auth/resumes/search/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def titles(self, q, **params):
+        return [result['title'] for result in self.search(q, **params)]
+
+    def test_ranked_and_highlighted(self):
+        self.add('Backend Engineer', 'Builds services.')
+        self.add('Team Lead', 'Former backend engineer, now leading teams.')
+        results = self.search('backend')
+        self.assertEqual([result['title'] for result in results], ['Backend Engineer', 'Team Lead'])
+        self.assertIn('<mark>backend</mark>', results[1]['snippet'].lower())
+
+    def test_every_term_and_last_as_prefix(self):
+        self.add('Platform', 'Runs Kubernetes clusters on bare metal.')
+        self.add('Data', 'Runs Spark clusters.')
+        self.assertEqual(self.titles('clusters kube'), ['Platform'])
+        self.assertEqual(sorted(self.titles('runs clust')), ['Data', 'Platform'])
+
+    def test_json_sections_are_indexed(self):
+        self.add('Engineer', experience=[{'jobTitle': 'Developer', 'company': 'Initech', 'description': 'TPS reports'}])
+        self.assertEqual(self.titles('initech'), ['Engineer'])
+
+    def test_scopes(self):
+        self.add('Mine', 'golang')
+        self.add('Theirs, public', 'golang', user=self.other, is_public=True)
+        self.add('Theirs, private', 'golang', user=self.other)
+        self.assertEqual(sorted(self.titles('golang')), ['Mine', 'Theirs, public'])
+        self.assertEqual(self.titles('golang', scope='mine'), ['Mine'])
+        self.assertEqual(self.titles('golang', scope='public'), ['Theirs, public'])
+
+    def test_index_follows_edits_and_deletes(self):
+        resume = self.add('Rust developer')
+        resume.title = 'Zig developer'
+        resume.save()
+        self.assertEqual(self.titles('rust'), [])
+        self.assertEqual(self.titles('zig'), ['Zig developer'])
+        resume.delete()
+        self.assertEqual(self.titles('zig'), [])
+
+    def test_query_syntax_and_html_are_inert(self):
+        self.add('Frontend', 'Writes <script> tags AND "quotes" carefully.')
+        results = self.search('script" AND (tag')
+        self.assertEqual(len(results), 1)
+        self.assertNotIn('<script>', results[0]['snippet'])
+        self.assertEqual(self.search('*'), [])
+
+    def test_bad_requests(self):
+        for params in ({}, {'q': ' '}, {'q': 'x', 'scope': 'everyone'}):
+            self.assertEqual(self.client.get('/api/auth/resumes/search/', params).status_code, 400)
+
+
+class JWTUserCacheTests(APITestCase):
+
+    def get_profile(self, client=None):
+        return (client or self.client).get('/api/auth/profile/')
+
+    def client_for(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(self.get_profile().status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get_profile().status_code, 200)
+        self.assertFalse([q for q in queries if CustomUser._meta.db_table in q['sql']])
+        self.assertEqual(user_cache.stats()['hits'], 1)
+
+    def test_save_reloads_the_user(self):
+        self.get_profile()
+        self.user.first_name = 'Alex'
+        self.user.save()
+        self.assertEqual(self.get_profile().data['first_name'], 'Alex')
+
+    def test_inactive_and_deleted_users_are_refused(self):
+        self.get_profile()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.get_profile().status_code, 401)
+        self.user.delete()
+        self.assertEqual(self.get_profile().status_code, 401)
+
+    @mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_revokes_tokens(self):
+        self.user.set_password('old password')
+        self.user.save()
+        old_client = self.client_for(AccessToken.for_user(self.user))
+        self.assertEqual(self.get_profile(old_client).status_code, 200)
+
+        self.user.set_password('new password')
+        self.user.save()
+        # The new token caches the new password; the old one is refused from the cache too
+        new_client = self.client_for(AccessToken.for_user(self.user))
+        self.assertEqual(self.get_profile(new_client).status_code, 200)
+        response = self.get_profile(old_client)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'password_changed')
+        self.assertEqual(self.get_profile(new_client).status_code, 200)
+
+    @override_settings(JWT_TRUST_TOKEN_CLAIMS=True)
+    def test_trusted_claims_skip_the_lookup(self):
+        Resume.objects.create(user=self.user, template=self.template, title='Mine')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/auth/resumes/')
+        self.assertEqual([item['title'] for item in response.data['results']], ['Mine'])
+        self.assertFalse([q for q in queries if f'FROM "{CustomUser._meta.db_table}"' in q['sql']])
+        self.assertEqual(user_cache.stats()['misses'], 0)
+        # Profile needs the full user
+        self.assertEqual(self.get_profile().data['email'], self.user.email)
+
+
+class TokenBlacklistTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        blacklist_index.clear()
+        self.addCleanup(blacklist_index.clear)
+
+    def outstanding(self, jti, expires_in):
+        now = timezone.now()
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token=jti, created_at=now, expires_at=now + timedelta(seconds=expires_in)
+        )
+
+    def test_rotation_and_logout(self):
+        refresh = str(IndexedRefreshToken.for_user(self.user))
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data['refresh']
+        # The rotated token is recorded, the old one is blacklisted
+        self.assertTrue(OutstandingToken.objects.filter(token=rotated).exists())
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+        self.assertEqual(self.client.post('/api/auth/logout/', {'refresh': rotated}, format='json').status_code, 205)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': rotated}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_prune_expired_tokens(self):
+        expired = [self.outstanding(f'expired-{i}', -60) for i in range(5)]
+        live = [self.outstanding(f'live-{i}', 3600) for i in range(2)]
+        for token in (expired[0], expired[3], live[0]):
+            BlacklistedToken.objects.create(token=token)
+
+        self.assertEqual(prune_expired_tokens(batch_size=2, pause=0), (5, 2))
+        self.assertEqual(set(OutstandingToken.objects.values_list('jti', flat=True)), {'live-0', 'live-1'})
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['live-0'])
+        self.assertEqual(prune_expired_tokens(batch_size=2, pause=0), (0, 0))
+
+    def test_fingerprint_set(self):
+        fingerprints = FingerprintSet(f'jti-{i}' for i in range(1000))
+        self.assertEqual(len(fingerprints), 1000)
+        self.assertTrue(all(f'jti-{i}' in fingerprints for i in range(1000)))
+        self.assertLess(sum(f'other-{i}' in fingerprints for i in range(1000)), 2)
+
+    @override_settings(TOKEN_BLACKLIST_INDEX=True)
+    def test_index_answers_without_queries(self):
+        BlacklistedToken.objects.create(token=self.outstanding('revoked', 3600))
+        BlacklistedToken.objects.create(token=self.outstanding('expired', -60))
+        self.outstanding('live', 3600)
+        self.assertEqual(len(blacklist_index.rebuild().fingerprints), 1)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(blacklist_index.is_blacklisted('live'))
+        with self.assertNumQueries(1):
+            self.assertTrue(blacklist_index.is_blacklisted('revoked'))
+
+    @override_settings(TOKEN_BLACKLIST_INDEX=True)
+    def test_blacklisted_after_the_snapshot(self):
+        token = IndexedRefreshToken.for_user(self.user)
+        blacklist_index.rebuild()
+        token.blacklist()
+        with self.assertRaises(TokenError):
+            IndexedRefreshToken(str(token))
+        self.assertEqual(blacklist_index.stats()['database_checks'], 1)
+
+
+class PatchResumeTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume(entries=3)
+        self.url = f'/api/auth/resumes/{self.resume.pk}/update/'
+
+    def json_patch(self, operations, **headers):
+        return self.client.patch(self.url, operations, content_type='application/json-patch+json', **headers)
+
+    def merge_patch(self, patch, **headers):
+        return self.client.patch(self.url, patch, content_type='application/merge-patch+json', **headers)
+
+    def test_stale_if_match(self):
+        response = self.json_patch([{'op': 'replace', 'path': '/title', 'value': 'First'}], HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"2"')
+        # A second session still holding version 1
+        response = self.merge_patch({'title': 'Second'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(response.data['version'], 2)
+        self.resume.refresh_from_db()
+        self.assertEqual((self.resume.title, self.resume.version), ('First', 2))
+
+    def test_missing_if_match(self):
+        # Without a precondition the last write wins
+        for title in ('First', 'Second'):
+            response = self.merge_patch({'title': title})
+            self.assertEqual(response.status_code, 200)
+        self.resume.refresh_from_db()
+        self.assertEqual((self.resume.title, self.resume.version), ('Second', 3))
+        response = self.merge_patch({'title': 'Third'}, HTTP_IF_MATCH='*')
+        self.assertEqual(response.status_code, 200)
+
+    def test_malformed_if_match(self):
+        for header in ('"abc"', '"1", "2"'):
+            response = self.merge_patch({'title': 'Renamed'}, HTTP_IF_MATCH=header)
+            self.assertEqual(response.status_code, 400, header)
+
+    def test_invalid_pointer(self):
+        for path in ('title', '/user', '/nope', '/experience/7/company', '/experience/01/company', '/experience/no-such-id/company'):
+            response = self.json_patch([{'op': 'replace', 'path': path, 'value': 'x'}])
+            self.assertEqual(response.status_code, 400, path)
+        self.assertEqual(self.json_patch({'op': 'replace', 'path': '/title', 'value': 'x'}).status_code, 400)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.version, 1)
+
+    def test_test_operation(self):
+        company = self.resume.experience[1]['company']
+        response = self.json_patch([{'op': 'test', 'path': '/experience/1/company'}])
+        self.assertEqual(response.status_code, 400)
+        # A failed test rejects the whole patch
+        response = self.json_patch([
+            {'op': 'replace', 'path': '/title', 'value': 'Renamed'},
+            {'op': 'test', 'path': '/experience/1/company', 'value': 'Someone else'},
+        ])
+        self.assertEqual(response.status_code, 409)
+        response = self.json_patch([
+            {'op': 'test', 'path': '/experience/exp-1/company', 'value': company},
+            {'op': 'replace', 'path': '/experience/exp-1/company', 'value': 'Acme'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.experience[1]['company'], 'Acme')
+        self.assertEqual(self.resume.title, 'Synthetic 3')
+
+    def test_array_append(self):
+        skills = list(self.resume.skills)
+        response = self.json_patch([
+            {'op': 'add', 'path': '/skills/-', 'value': {'id': 'skill-new', 'name': 'Rust'}},
+            {'op': 'remove', 'path': '/skills/skill-0'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.resume.refresh_from_db()
+        self.assertEqual(self.resume.skills, skills[1:] + [{'id': 'skill-new', 'name': 'Rust'}])
+        self.assertIn('Rust', ResumeSearchDocument.objects.get(resume=self.resume).skills)
+
+    def test_merge_patch_null_deletes(self):
+        response = self.merge_patch({'personal_info': {'phone': None, 'website': 'example.com'}})
+        self.assertEqual(response.status_code, 200)
+        self.resume.refresh_from_db()
+        self.assertNotIn('phone', self.resume.personal_info)
+        self.assertEqual(self.resume.personal_info['website'], 'example.com')
+        self.assertEqual(self.resume.personal_info['email'], 'alex@example.com')
+        self.assertEqual(self.merge_patch({'user': 5}).status_code, 400)
+
+
+@override_settings(RESUME_WRITE_BUFFER_WINDOW=3600)
+class WriteBufferTests(APITestCase):
+    """Autosave PATCHes are held in the buffer; the window is long enough that only explicit flushes write."""
+
+    def setUp(self):
+        super().setUp()
+        self.resume = self.create_resume(entries=3)
+        self.url = f'/api/auth/resumes/{self.resume.pk}/update/'
+
+    def autosave(self, patch, **headers):
+        return self.client.patch(self.url, patch, content_type='application/merge-patch+json', **headers)
+
+    def stored(self):
+        return Resume.objects.values('title', 'professional_summary', 'version').get(pk=self.resume.pk)
+
+    def test_edits_merge_until_flushed(self):
+        self.assertEqual(self.autosave({'title': 'Draft'}, HTTP_IF_MATCH='"1"').status_code, 200)
+        response = self.autosave({'professional_summary': 'Builds things.'}, HTTP_IF_MATCH='"2"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], '"3"')
+        self.assertEqual(self.stored()['version'], 1)
+
+        # Reads in this process see the staged edits
+        response = self.client.get(f'/api/auth/resumes/{self.resume.pk}/')
+        self.assertEqual((response.data['title'], response['ETag']), ('Draft', '"3"'))
+        response = self.client.get('/api/auth/resumes/')
+        self.assertEqual(response.data['results'][0]['title'], 'Draft')
+
+        with CaptureQueriesContext(connection) as queries:
+            write_buffer.flush()
+        updates = [q['sql'] for q in queries if q['sql'].startswith(f'UPDATE "{Resume._meta.db_table}"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.stored(), {'title': 'Draft', 'professional_summary': 'Builds things.', 'version': 3})
+        self.assertEqual(ResumeSearchDocument.objects.get(resume=self.resume).title, 'Draft')
+
+        # Nothing left to write
+        with self.assertNumQueries(0):
+            write_buffer.flush()
+
+    def test_later_edit_wins(self):
+        for title in ('One', 'Two', 'Three'):
+            self.autosave({'title': title})
+        write_buffer.flush([self.resume.pk])
+        self.assertEqual(self.stored()['title'], 'Three')
+        self.assertEqual(self.stored()['version'], 4)
+
+    def test_unchanged_edit_is_not_staged(self):
+        response = self.autosave({'title': self.resume.title}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response['ETag'], '"1"')
+        with self.assertNumQueries(0):
+            write_buffer.flush()
+
+    def test_stale_if_match_against_buffered_version(self):
+        self.autosave({'title': 'Draft'}, HTTP_IF_MATCH='"1"')
+        response = self.autosave({'title': 'Other session'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(response['ETag'], '"2"')
+
+    def test_put_writes_through(self):
+        self.autosave({'title': 'Draft'})
+        response = self.client.put(self.url, {'professional_summary': 'Saved.'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.stored(), {'title': 'Draft', 'professional_summary': 'Saved.', 'version': 3})
+
+    def test_flush_after_outside_write(self):
+        self.autosave({'title': 'Draft'})
+        # The admin or another process saved the row meanwhile: the buffered edit still lands
+        Resume.objects.filter(pk=self.resume.pk).update(professional_summary='Edited elsewhere.', version=5)
+        with self.assertLogs('resume_app.write_buffer', 'WARNING'):
+            write_buffer.flush()
+        self.assertEqual(self.stored(), {'title': 'Draft', 'professional_summary': 'Edited elsewhere.', 'version': 6})
+        self.assertEqual(self.client.get(f'/api/auth/resumes/{self.resume.pk}/')['ETag'], '"6"')
+
+    def test_delete_discards_staged_edits(self):
+        self.autosave({'title': 'Draft'})
+        self.assertEqual(self.client.delete(f'/api/auth/resumes/{self.resume.pk}/delete/').status_code, 204)
+        with self.assertNumQueries(0):
+            write_buffer.flush()
+
+
+@override_settings(RESUME_WRITE_BUFFER_WINDOW=3600, RESUME_NDJSON_BATCH_SIZE=2)
+class NdjsonTests(APITestCase):
+
+    def export(self):
+        response = self.client.get('/api/auth/resumes/export/ndjson/')
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def import_lines(self, body):
+        response = self.client.post('/api/auth/resumes/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_round_trip(self):
+        resumes = [self.create_resume(entries=3, title=f'Resume {i}') for i in range(3)]
+        body = self.export()
+        lines = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([line['id'] for line in lines], sorted(str(resume.pk) for resume in resumes))
+        self.assertEqual({line['user'] for line in lines}, {self.user.email})
+
+        fields = ('id', 'title', 'personal_info', 'experience', 'skills', 'template_id', 'is_public')
+        exported = list(Resume.objects.order_by('pk').values(*fields))
+        Resume.objects.all().delete()
+        self.assertEqual(self.import_lines(body), {'imported': 3, 'failed': 0, 'errors': []})
+        self.assertEqual(list(Resume.objects.order_by('pk').values(*fields)), exported)
+        self.assertEqual(ResumeSearchDocument.objects.count(), 3)
+
+    def test_export_includes_buffered_edits(self):
+        resume = self.create_resume(entries=1)
+        response = self.client.patch(
+            f'/api/auth/resumes/{resume.pk}/update/', {'title': 'Draft'}, content_type='application/merge-patch+json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(Resume.objects.get(pk=resume.pk).title, 'Draft')
+
+        self.assertEqual(json.loads(self.export())['title'], 'Draft')
+        self.assertEqual(Resume.objects.get(pk=resume.pk).title, 'Draft')
+
+    def test_malformed_lines(self):
+        taken = self.create_resume(entries=1)
+        body = '\n'.join([
+            json.dumps({'title': 'Good'}),
+            '{"title": ',
+            '["not", "an", "object"]',
+            '',
+            json.dumps({'title': 'Bad id', 'id': 'nope'}),
+            json.dumps({'title': 'Unknown template', 'template': '00000000-0000-0000-0000-000000000000'}),
+            json.dumps({'title': 'Duplicate', 'id': str(taken.pk)}),
+            json.dumps({'title': 'Also good', 'template': str(self.template.pk)}),
+        ])
+        report = self.import_lines(body)
+        self.assertEqual((report['imported'], report['failed']), (2, 5))
+        self.assertEqual([error['line'] for error in report['errors']], [2, 3, 5, 6, 7])
+        self.assertIn('Invalid JSON', report['errors'][0]['errors']['non_field_errors'][0])
+        self.assertEqual(report['errors'][1]['errors'], {'non_field_errors': ['Expected a JSON object']})
+        self.assertIn('id', report['errors'][2]['errors'])
+        self.assertIn('template', report['errors'][3]['errors'])
+        self.assertIn('id', report['errors'][4]['errors'])
+        self.assertEqual(
+            set(Resume.objects.filter(user=self.user).values_list('title', flat=True)),
+            {taken.title, 'Good', 'Also good'},
+        )
+
+
+class ParseRangeTests(SimpleTestCase):
+
+    def test_ranges(self):
+        self.assertEqual(parse_range('bytes=0-', 1000), (0, 999))
+        self.assertEqual(parse_range('bytes=100-199', 1000), (100, 199))
+        self.assertEqual(parse_range('bytes=900-5000', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-5000', 1000), (0, 999))
+
+    def test_ignored(self):
+        for header in ('bytes=0-1,5-6', 'items=0-1', 'bytes=-', 'bytes=a-b'):
+            self.assertIsNone(parse_range(header, 1000), header)
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=1000-', 'bytes=200-100', 'bytes=-0'):
+            with self.assertRaises(ValueError, msg=header):
+                parse_range(header, 1000)
+
+
+class PdfCacheTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.renders = 0
+        patcher = mock.patch('resume_app.pdf_cache.write_resume_pdf', side_effect=self.render)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def render(self, resume, output):
+        self.renders += 1
+        output.write(b'%PDF-1.4 ' + resume.title.encode() + b' ' * 100)
+
+    def open_pdf(self, resume):
+        etag, pdf = open_resume_pdf(resume)
+        with pdf:
+            return etag, pdf.read()
+
+    def test_hit_and_miss(self):
+        resume = self.create_resume(entries=2, title='First')
+        etag, pdf = self.open_pdf(resume)
+        self.assertEqual(self.open_pdf(resume), (etag, pdf))
+        self.assertEqual(self.renders, 1)
+
+        old_name = resume.pdf_file.name
+        resume.title = 'Second'
+        resume.professional_summary = 'Changed.'
+        resume.save()
+        new_etag, new_pdf = self.open_pdf(resume)
+        self.assertNotEqual(new_etag, etag)
+        self.assertIn(b'Second', new_pdf)
+        self.assertEqual(self.renders, 2)
+        self.assertFalse(default_storage.exists(old_name))
+
+    def test_title_alone_is_not_rendered(self):
+        resume = self.create_resume(entries=2)
+        etag = resume_content_hash(resume)
+        resume.title = 'Renamed'
+        self.assertEqual(resume_content_hash(resume), etag)
+
+    def test_template_edit_changes_hash(self):
+        resume = self.create_resume(entries=2)
+        etag = resume_content_hash(resume)
+        self.template.save()
+        resume.template.refresh_from_db()
+        self.assertNotEqual(resume_content_hash(resume), etag)
+
+    def test_least_recently_used_are_evicted(self):
+        resumes = [self.create_resume(entries=1, title=f'Resume {i}') for i in range(3)]
+        for resume in resumes:
+            self.open_pdf(resume)
+        # Reading the oldest makes the second the least recently used
+        self.open_pdf(Resume.objects.get(pk=resumes[0].pk))
+        size = Resume.objects.get(pk=resumes[0].pk).pdf_size
+
+        self.assertEqual(evict_pdf_cache(max_bytes=2 * size), 1)
+        cached = dict(Resume.objects.values_list('pk', 'pdf_hash'))
+        self.assertEqual([bool(cached[resume.pk]) for resume in resumes], [True, False, True])
+        self.assertFalse(default_storage.exists(resumes[1].pdf_file.name))
+        self.assertEqual(evict_pdf_cache(max_bytes=2 * size), 0)
+
+
+class PdfDeliveryTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        resume = self.create_resume(entries=10)
+        self.url = f'/api/auth/resumes/{resume.pk}/pdf/'
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.pdf = b''.join(response.streaming_content)
+        self.etag = response['ETag']
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_body(self):
+        response, body = self.get()
+        self.assertEqual(body, self.pdf)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(int(response['Content-Length']), len(self.pdf))
+
+    def test_open_ended_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 0-{len(self.pdf) - 1}/{len(self.pdf)}')
+        self.assertEqual(body, self.pdf)
+        response, body = self.get(HTTP_RANGE='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual((body, response['Content-Length']), (self.pdf[100:200], '100'))
+
+    def test_suffix_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=-500')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes {len(self.pdf) - 500}-{len(self.pdf) - 1}/{len(self.pdf)}')
+        self.assertEqual(body, self.pdf[-500:])
+
+    def test_unsatisfiable_range(self):
+        response, _ = self.get(HTTP_RANGE=f'bytes={len(self.pdf)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.pdf)}')
+
+    def test_multiple_ranges_send_everything(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-99,200-299')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, self.pdf)
+
+    def test_if_range(self):
+        response, body = self.get(HTTP_RANGE='bytes=0-99', HTTP_IF_RANGE=self.etag)
+        self.assertEqual((response.status_code, body), (206, self.pdf[:100]))
+        # The client's partial copy is of another version
+        response, body = self.get(HTTP_RANGE='bytes=0-99', HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, self.pdf))
+
+    def test_not_modified(self):
+        response, body = self.get(HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual((response.status_code, body), (304, b''))
+        self.assertEqual(response['ETag'], self.etag)
+        response, _ = self.get(HTTP_IF_NONE_MATCH=f'"other", {self.etag}')
+        self.assertEqual(response.status_code, 304)
+        response, body = self.get(HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual((response.status_code, body), (200, self.pdf))
+
+
+@override_settings(LOGIN_HASH_WORKERS=1, LOGIN_HASH_QUEUE_DEPTH=0, PASSWORD_PBKDF2_ITERATIONS=1000)
+class LoginPoolTests(TransactionTestCase):
+    """Password logins on a hashing pool of a single slot, whose thread needs committed users."""
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(email='alex@example.com', username='alex', password='correct horse')
+        self.pool = PasswordHashPool()
+        patcher = mock.patch('resume_app.views.password_pool', self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def login(self, email='alex@example.com', password='correct horse'):
+        return await self.async_client.post('/api/auth/login/', {'email': email, 'password': password}, content_type='application/json')
+
+    async def test_login(self):
+        response = await self.login()
+        self.assertEqual(response.status_code, 200)
+        tokens = response.json()
+        self.assertEqual(tokens['user']['email'], 'alex@example.com')
+        self.assertTrue(tokens['access'] and tokens['refresh'])
+        self.assertEqual((await self.login(password='wrong')).status_code, 401)
+        self.assertEqual((await self.login(email='nobody@example.com')).status_code, 401)
+        self.assertEqual(self.pool.stats()['completed'], 3)
+
+    async def test_full_pool_answers_429(self):
+        release = threading.Event()
+        busy = asyncio.ensure_future(self.pool.run(release.wait))
+        await asyncio.sleep(0)
+        try:
+            for email in ('alex@example.com', 'nobody@example.com'):
+                response = await self.login(email=email)
+                self.assertEqual(response.status_code, 429)
+                self.assertGreaterEqual(int(response['Retry-After']), 1)
+        finally:
+            release.set()
+            await busy
+        self.assertEqual(self.pool.stats()['rejected'], 2)
+        # The slot is free again
+        self.assertEqual((await self.login()).status_code, 200)
+
+    @override_settings(PASSWORD_PBKDF2_ITERATIONS=2000)
+    async def test_outdated_hash_is_rewritten(self):
+        self.assertEqual((await self.login()).status_code, 200)
+        await self.user.arefresh_from_db(fields=['password'])
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    async def test_failures_go_through_the_backends(self):
+        failures = []
+        handler = lambda sender, credentials, **kwargs: failures.append(credentials['email'])
+        user_login_failed.connect(handler)
+        self.addCleanup(user_login_failed.disconnect, handler)
+
+        self.assertEqual((await self.login(password='wrong')).status_code, 401)
+        self.user.is_active = False
+        await self.user.asave(update_fields=['is_active'])
+        self.assertEqual((await self.login()).status_code, 401)
+        self.assertEqual(failures, ['alex@example.com', 'alex@example.com'])
+
+
+class InlinePool:
+    """Stands in for the render process pool: runs each render at submit, on the test's connection."""
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def submit(self, func, *args):
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@mock.patch('resume_app.pdf_jobs.create_render_pool', InlinePool)
+class PdfJobTests(APITestCase):
+
+    def test_claim_jobs(self):
+        jobs = [enqueue_pdf_render(self.create_resume(entries=1)) for _ in range(3)]
+        claimed = claim_jobs(2)
+        self.assertEqual([job.pk for job in claimed], [job.pk for job in jobs[:2]])
+        self.assertEqual({job.status for job in claimed}, {'running'})
+        # Claimed jobs are not handed out twice
+        self.assertEqual([job.pk for job in claim_jobs(5)], [jobs[2].pk])
+        self.assertEqual(claim_jobs(5), [])
+
+    def test_requeue_stale_jobs(self):
+        job = enqueue_pdf_render(self.create_resume(entries=1))
+        claim_jobs(1)
+        self.assertEqual(requeue_stale_jobs(max_age=60), 0)
+        PdfRenderJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale_jobs(max_age=60), 1)
+        self.assertEqual(PdfRenderJob.objects.get(pk=job.pk).status, 'queued')
+
+    def test_render(self):
+        resume = self.create_resume(entries=3)
+        job = enqueue_pdf_render(resume)
+        run_worker(concurrency=2, poll_interval=0, once=True)
+        job.refresh_from_db()
+        resume.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(resume.pdf_hash, job.content_hash)
+        with resume.pdf_file.open('rb') as pdf:
+            self.assertEqual(pdf.read(4), b'%PDF')
+        # A current PDF completes the next job at once
+        self.assertEqual(enqueue_pdf_render(resume).status, 'done')
+
+    def test_failed_render(self):
+        job = enqueue_pdf_render(self.create_resume(entries=1))
+        no_template = enqueue_pdf_render(self.create_resume(entries=1, template=None))
+        with mock.patch('resume_app.pdf_jobs.render_resume_pdf', side_effect=ValueError('Bad layout')), \
+                self.assertLogs('resume_app.pdf_jobs', 'ERROR'):
+            run_worker(concurrency=2, poll_interval=0, once=True)
+        job.refresh_from_db()
+        no_template.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'Bad layout'))
+        self.assertEqual(no_template.status, 'failed')
+        self.assertIsNotNone(job.finished_at)
+
+    def test_resume_deleted_while_rendering(self):
+        resume = self.create_resume(entries=1)
+        job = enqueue_pdf_render(resume)
+        other = enqueue_pdf_render(self.create_resume(entries=1))
+
+        def render_and_delete(rendered):
+            if rendered.pk == resume.pk:
+                Resume.objects.filter(pk=resume.pk).delete()
+            return b'%PDF-1.4 rendered'
+
+        with mock.patch('resume_app.pdf_jobs.render_resume_pdf', side_effect=render_and_delete):
+            run_worker(concurrency=2, poll_interval=0, once=True)
+        self.assertFalse(PdfRenderJob.objects.filter(pk=job.pk).exists())
+        self.assertEqual(PdfRenderJob.objects.get(pk=other.pk).status, 'done')
+        self.assertFalse(resume.pdf_file.storage.exists(f'resume_pdfs/{resume.pk}'))
+
+    def test_job_deleted_after_store(self):
+        resume = self.create_resume(entries=1)
+        enqueue_pdf_render(resume)
+        job = claim_jobs(1)[0]
+        job.content_hash = 'abc'
+        # The resume and its job go while the result is being stored
+        with mock.patch('resume_app.pdf_jobs.evict_pdf_cache', side_effect=lambda: resume.delete()):
+            self.assertFalse(finish_job(job, data=b'%PDF-1.4 rendered'))
+        self.assertFalse(job.resume.pdf_file.storage.exists(f'resume_pdfs/{resume.pk}/abc.pdf'))
+        # A failure report for a vanished job is dropped quietly too
+        self.assertFalse(finish_job(job, error='Render process died'))
+
+
+@mock.patch('resume_app.bulk_export.get_export_pool', InlinePool)
+class ZipExportTests(APITestCase):
+
+    def export(self, *resumes):
+        ids = ','.join(str(resume.pk) for resume in resumes)
+        return self.client.get(f'/api/auth/resumes/export/?ids={ids}')
+
+    def archive(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_export(self):
+        first = self.create_resume(entries=2, title='Backend Engineer')
+        second = self.create_resume(entries=2, title='Team Lead')
+        untemplated = self.create_resume(entries=1, title='Draft', template=None)
+        with self.archive(self.export(first, second, untemplated)) as archive:
+            names = sorted(archive.namelist())
+            self.assertEqual(names, sorted([
+                f'backend-engineer-{str(first.pk)[:8]}.pdf', f'team-lead-{str(second.pk)[:8]}.pdf', 'errors.txt',
+            ]))
+            self.assertTrue(archive.read(names[0]).startswith(b'%PDF'))
+            self.assertIn(b'No template selected', archive.read('errors.txt'))
+        # Rendered PDFs land in the cache the PDF endpoint reads
+        self.assertTrue(Resume.objects.get(pk=first.pk).pdf_hash)
+
+    def test_cached_pdfs_are_not_rendered_again(self):
+        resume = self.create_resume(entries=2)
+        self.archive(self.export(resume)).close()
+        with mock.patch('resume_app.bulk_export.render_resume_pdf') as render:
+            with self.archive(self.export(resume)) as archive:
+                self.assertEqual(len(archive.namelist()), 1)
+        render.assert_not_called()
+
+    def test_all_resumes_by_post(self):
+        self.create_resume(entries=1)
+        self.create_resume(entries=1)
+        with self.archive(self.client.post('/api/auth/resumes/export/', {'ids': []}, format='json')) as archive:
+            self.assertEqual(len(archive.namelist()), 2)
+
+    def test_bad_ids(self):
+        self.assertEqual(self.client.get('/api/auth/resumes/export/?ids=nope').status_code, 400)
+        other = CustomUser.objects.create_user(email='sam@example.com', username='sam')
+        resume = Resume.objects.create(user=other, template=self.template, title='Theirs')
+        self.assertEqual(self.export(resume).status_code, 404)
+
+
+class RenderPlanTests(APITestCase):
+
+    def test_plan_follows_template_edits(self):
+        plan = get_render_plan(self.template)
+        self.assertIs(get_render_plan(self.template), plan)
+
+        self.template.save()
+        edited = get_render_plan(self.template)
+        self.assertIsNot(edited, plan)
+        self.assertIs(get_render_plan(self.template), edited)
+
+
+# Fixed document ids and dates, so two renders of the same resume can be compared byte for byte
+@mock.patch.object(rl_config, 'invariant', 1)
+class FlowableCacheTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        flowable_cache.clear()
+        self.addCleanup(flowable_cache.clear)
+        self.resume = self.create_resume(entries=3)
+
+    def test_edit_reparses_only_that_entry(self):
+        cold = render_resume_pdf(self.resume)
+        built = flowable_cache.stats()['misses']
+        self.assertGreater(built, 3)
+
+        self.assertEqual(render_resume_pdf(self.resume), cold)
+        stats = flowable_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (built, built))
+
+        self.resume.experience[0]['jobTitle'] = 'Principal Engineer'
+        edited = render_resume_pdf(self.resume)
+        self.assertNotEqual(edited, cold)
+        self.assertEqual(flowable_cache.stats()['misses'], built + 1)
+
+    def test_template_edit_reparses_everything(self):
+        render_resume_pdf(self.resume)
+        built = flowable_cache.stats()['misses']
+        self.template.save()
+        render_resume_pdf(self.resume)
+        self.assertEqual(flowable_cache.stats()['misses'], 2 * built)
+
+    @override_settings(PDF_FLOWABLE_CACHE_SIZE=2)
+    def test_bounded(self):
+        render_resume_pdf(self.resume)
+        self.assertEqual(flowable_cache.stats()['entries'], 2)
+
+
+class LatexRenderingTests(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        format_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, format_dir, ignore_errors=True)
+        settings = override_settings(LATEX_ENABLED=True, LATEX_FORMAT_DIR=format_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # No TeX engine here: every run of it is mocked
+        patcher = mock.patch('resume_app.latex._engine_installed', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resume = self.create_resume(
+            entries=3, template=ResumeTemplate.objects.filter(is_latex_template=True).first(),
+            professional_summary='Shipped 10x faster builds <with> care | 東京',
+        )
+
+    def test_escape(self):
+        self.assertEqual(latex_escape('a<b> | 50% & $5_x'), r'a\textless{}b\textgreater{} \textbar{} 50\% \& \$5\_x')
+
+    def test_failed_compilation_falls_back_to_reportlab(self):
+        failure = subprocess.CompletedProcess([], 1, stdout=b'! LaTeX Error: Unicode character \xe6\x9d\xb1 not set up')
+        with mock.patch('resume_app.latex._run_engine', return_value=failure) as run_engine, \
+                self.assertLogs('resume_app.rendering', 'WARNING') as logs:
+            pdf = render_resume_pdf(self.resume)
+        self.assertTrue(run_engine.called)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        self.assertIn('LaTeX compilation failed', logs.output[0])
+
+    def test_missing_engine_falls_back_over_http(self):
+        with mock.patch('resume_app.latex._run_engine', side_effect=FileNotFoundError('pdflatex')), \
+                self.assertLogs('resume_app.rendering', 'WARNING'):
+            response = self.client.get(f'/api/auth/resumes/{self.resume.pk}/pdf/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+
+class PublicPageTests(TemporaryMediaMixin, TransactionTestCase):
+    """Pages are synced by the background executor, which needs committed rows to see."""
+
+    def setUp(self):
+        cache.clear()
+        user = CustomUser.objects.create_user(email='alex@example.com', username='alex')
+        template = ResumeTemplate.objects.create(name='Plain', template_type='minimal', description='Plain')
+        self.resume = Resume.objects.create(user=user, template=template, **synthetic_resume_data(3))
+        self.url = f'/api/auth/public/resumes/{self.resume.pk}/'
+
+    def save(self, **fields):
+        for name, value in fields.items():
+            setattr(self.resume, name, value)
+        self.resume.save()
+        wait_for_public_pages()
+
+    def stored_pages(self):
+        try:
+            return default_storage.listdir(f'public_resumes/{self.resume.pk}')[1]
+        except OSError:
+            return []
+
+    def test_private_saves_schedule_nothing(self):
+        with mock.patch('resume_app.public_pages._schedule_sync') as schedule:
+            self.save(title='Still private')
+            Resume.objects.get(pk=self.resume.pk).save()
+        schedule.assert_not_called()
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_publish_and_serve(self):
+        self.save(is_public=True)
+        self.assertEqual(len(self.stored_pages()), 1)
+        self.assertTrue(PdfRenderJob.objects.filter(resume=self.resume, status='queued').exists())
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.resume.personal_info['name'])
+        self.assertIn('s-maxage=', response['Cache-Control'])
+        self.assertEqual(f'{response["ETag"].strip(chr(34))}.html', self.stored_pages()[0])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        response = self.client.get(f'{self.url}pdf/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_edit_replaces_page(self):
+        self.save(is_public=True)
+        etag = self.client.get(self.url)['ETag']
+        self.save(personal_info={**self.resume.personal_info, 'name': 'Sam Rivera'})
+        response = self.client.get(self.url)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, 'Sam Rivera')
+        self.assertEqual(len(self.stored_pages()), 1)
+
+    def test_unpublish(self):
+        self.save(is_public=True)
+        with mock.patch('resume_app.public_pages.purge_proxy') as purge_proxy:
+            self.save(is_public=False)
+        purge_proxy.assert_called_once_with(self.resume.pk)
+        self.assertEqual(self.stored_pages(), [])
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}pdf/').status_code, 404)
+
+    def test_only_the_current_page_is_served(self):
+        self.save(is_public=True)
+        etag = self.client.get(self.url)['ETag']
+        # A leftover page of older content, and the current one gone from storage
+        default_storage.save(f'public_resumes/{self.resume.pk}/0000.html', ContentFile(b'<p>stale</p>'))
+        default_storage.delete(f'public_resumes/{self.resume.pk}/{etag.strip(chr(34))}.html')
+        for _ in range(2):
+            response = self.client.get(self.url)
+            self.assertEqual(response['ETag'], etag)
+            self.assertNotContains(response, 'stale')
+        cache.delete(PAGE_DIGEST_KEY.format(self.resume.pk))
+        self.assertNotContains(self.client.get(self.url), 'stale')
+
+
+@override_settings(GOOGLE_CERTS_CACHE_FILE='', GOOGLE_CERTS_REFRESH_MARGIN=60, GOOGLE_CERTS_STALE_IF_ERROR=3600)
+class GoogleCertCacheTests(SimpleTestCase):
+    """The certificate endpoint is answered by an httpx mock transport."""
+
+    def setUp(self):
+        self.certs = {'key-1': 'PEM 1'}
+        self.fetches = 0
+        self.unavailable = False
+        self.cache = GoogleCertCache()
+        self.cache._client = httpx.Client(transport=httpx.MockTransport(self.respond))
+
+    def respond(self, request):
+        self.fetches += 1
+        if self.unavailable:
+            return httpx.Response(503)
+        return httpx.Response(200, json=self.certs, headers={'Cache-Control': 'public, max-age=600'})
+
+    def expire_in(self, seconds):
+        self.cache._expires_at = time.time() + seconds
+
+    def test_fetch_once_then_memory(self):
+        self.assertIsNone(self.cache.peek())
+        self.assertEqual(self.cache.certs(), {'key-1': 'PEM 1'})
+        self.assertAlmostEqual(self.cache._expires_at, time.time() + 600, delta=5)
+        for _ in range(3):
+            self.assertEqual(self.cache.peek('key-1'), {'key-1': 'PEM 1'})
+        self.assertEqual(self.fetches, 1)
+
+    def test_rotated_key(self):
+        self.cache.certs()
+        self.certs = {'key-1': 'PEM 1', 'key-2': 'PEM 2'}
+        self.assertIsNone(self.cache.peek('key-2'))
+        self.assertIn('key-2', self.cache.certs('key-2'))
+        self.assertEqual(self.fetches, 2)
+        # Unknown key ids force at most one fetch per interval
+        self.assertNotIn('made-up', self.cache.certs('made-up'))
+        self.assertEqual(self.fetches, 2)
+        self.cache._forced_at -= 61
+        for _ in range(3):
+            self.assertNotIn('made-up', self.cache.certs('made-up'))
+        self.assertEqual(self.fetches, 3)
+
+    def test_background_refresh_near_expiry(self):
+        self.cache.certs()
+        self.certs = {'key-2': 'PEM 2'}
+        self.expire_in(30)
+        # Still served from memory while the refresh runs
+        with self.cache._fetch_lock:
+            self.assertEqual(self.cache.peek(), {'key-1': 'PEM 1'})
+        for _ in range(100):
+            if self.cache.peek() == {'key-2': 'PEM 2'}:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.cache.peek(), {'key-2': 'PEM 2'})
+        self.assertEqual(self.fetches, 2)
+
+    def test_peek_does_not_wait_for_a_fetch(self):
+        self.cache.certs()
+        self.expire_in(30)
+        # A fetch in progress holds the lock for a whole network round trip
+        with self.cache._fetch_lock:
+            started = time.perf_counter()
+            for _ in range(10):
+                self.assertEqual(self.cache.peek(), {'key-1': 'PEM 1'})
+            self.assertLess(time.perf_counter() - started, 0.5)
+
+    def test_stale_if_error(self):
+        self.cache.certs()
+        self.unavailable = True
+        self.expire_in(-60)
+        with self.assertLogs('resume_app.google_certs', 'WARNING'):
+            self.assertEqual(self.cache.certs(), {'key-1': 'PEM 1'})
+        # Retries wait for the backoff instead of fetching on every login
+        self.assertEqual(self.cache.certs(), {'key-1': 'PEM 1'})
+        self.assertEqual(self.fetches, 2)
+        self.expire_in(-3601)
+        with self.assertRaises(CertificateFetchError):
+            self.cache.certs()
+
+    def test_nothing_cached(self):
+        self.unavailable = True
+        with self.assertLogs('resume_app.google_certs', 'WARNING'), self.assertRaises(CertificateFetchError):
+            self.cache.certs()
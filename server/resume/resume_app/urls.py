@@ -5,6 +5,7 @@ from . import views
 urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
+    path('login/metrics/', views.login_metrics, name='login_metrics'),
     path('logout/', views.logout, name='logout'),
     path('profile/', views.profile, name='profile'),
     path('profile/update/', views.update_profile, name='update_profile'),
@@ -17,9 +18,19 @@ urlpatterns = [
     path('templates/<uuid:template_id>/', views.resume_template_detail, name='resume_template_detail'),
     
     path('resumes/', views.user_resumes, name='user_resumes'),
+    path('resumes/search/', views.search_resumes, name='search_resumes'),
+    path('resumes/export/', views.export_resumes, name='export_resumes'),
+    path('resumes/export/ndjson/', views.export_resumes_ndjson, name='export_resumes_ndjson'),
+    path('resumes/import/', views.import_resumes, name='import_resumes'),
     path('resumes/create/', views.create_resume, name='create_resume'),
     path('resumes/<uuid:resume_id>/', views.resume_detail, name='resume_detail'),
     path('resumes/<uuid:resume_id>/update/', views.update_resume, name='update_resume'),
     path('resumes/<uuid:resume_id>/delete/', views.delete_resume, name='delete_resume'),
     path('resumes/<uuid:resume_id>/pdf/', views.generate_resume_pdf, name='generate_resume_pdf'),
+    path('resumes/<uuid:resume_id>/pdf/jobs/', views.enqueue_resume_pdf, name='enqueue_resume_pdf'),
+    path('public/resumes/<uuid:resume_id>/', views.public_resume, name='public_resume'),
+    path('public/resumes/<uuid:resume_id>/pdf/', views.public_resume_pdf, name='public_resume_pdf'),
+    path('pdf-jobs/metrics/', views.pdf_job_metrics, name='pdf_job_metrics'),
+    path('pdf-jobs/<uuid:job_id>/', views.pdf_job_status, name='pdf_job_status'),
+    path('pdf-jobs/<uuid:job_id>/download/', views.pdf_job_download, name='pdf_job_download'),
 ]
\ No newline at end of file
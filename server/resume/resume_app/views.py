@@ -1,93 +1,46 @@
-import os
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework import status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import get_user_model, authenticate
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
-import requests
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from .serializers import (
     UserRegistrationSerializer, UserSerializer, SocialAuthSerializer,
     UserProfileSerializer, ResumeSerializer, ResumeListSerializer, 
-    ResumeTemplateSerializer
+    ResumeTemplateSerializer, ResumeSearchResultSerializer, PdfRenderJobSerializer, sparse_fields
 )
-from .models import Resume, ResumeTemplate
-from django.http import HttpResponse
-from django.template.loader import render_to_string
+from .models import Resume, ResumeTemplate, PdfRenderJob
+from .pdf_cache import open_cached_pdf, open_resume_pdf, resume_content_hash
+from .public_pages import public_cache_control, public_page
+from .delivery import cached_json_response, not_modified, pdf_file_response, streaming_content
+from .catalog import get_catalog, serialize_template
+from .query_budget import query_budget
+from .authentication import invalidate_user, trusts_token_claims
+from .blacklist import IndexedRefreshToken
+from .pagination import UpdatedAtCursorPagination
+from .search import SearchUnavailable, search_resume_index
+from .write_buffer import write_buffer
+from .patching import (
+    JSON_PATCH, MERGE_PATCH, JSONPatchParser, MergePatchParser, PatchError, PatchTestFailed,
+    if_match_version, patched_fields, save_resume_changes, version_etag
+)
+from .pdf_jobs import enqueue_pdf_render, queue_metrics
+from .bulk_export import stream_resume_zip
+from .ndjson import import_resumes_ndjson, stream_resumes_ndjson
+from .social_auth import SocialAuthError, fetch_linkedin_identity, issue_tokens, social_login, verify_google_id_token
+from .passwords import PoolSaturated, authenticate_password, password_pool
+from .rendering import flowable_cache
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
 import json
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.units import inch, mm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib.fonts import addMapping
-from io import BytesIO
 import uuid
 
 User = get_user_model()
 
-def get_font_family(font_family):
-    """Get the appropriate font family with fallbacks."""
-    # Extract the first font from the font-family string
-    primary_font = font_family.split(',')[0].strip().strip('"\'')
-    
-    # Map of font families to their ReportLab equivalents
-    font_map = {
-        'Calibri': 'Helvetica',  # Fallback to Helvetica
-        'Arial': 'Helvetica',    # Fallback to Helvetica
-        'Helvetica': 'Helvetica',
-        'Times New Roman': 'Times-Roman',
-        'Times': 'Times-Roman',
-        'Courier': 'Courier',
-        'Georgia': 'Times-Roman',  # Fallback to Times-Roman
-        'Lora': 'Times-Roman',     # Fallback to Times-Roman
-        'sans-serif': 'Helvetica',
-        'serif': 'Times-Roman',
-        'monospace': 'Courier'
-    }
-    
-    # Return the mapped font or default to Helvetica
-    return font_map.get(primary_font, 'Helvetica')
-
-def convert_to_points(value, default=12):
-    """Convert CSS units (px, pt, in) to points for PDF generation."""
-    if not value:
-        return default
-    
-    # Remove any whitespace
-    value = str(value).strip()
-    
-    # Extract number and unit
-    number = ''
-    unit = ''
-    for char in value:
-        if char.isdigit() or char == '.':
-            number += char
-        else:
-            unit += char
-    
-    try:
-        number = float(number)
-    except ValueError:
-        return default
-    
-    # Convert to points based on unit
-    if unit == 'px':
-        # Approximate conversion: 1px ≈ 0.75pt
-        return number * 0.75
-    elif unit == 'pt':
-        return number
-    elif unit == 'in':
-        return number * 72  # 1 inch = 72 points
-    elif unit == 'mm':
-        return number * 2.83465  # 1 mm ≈ 2.83465 points
-    else:
-        return default
-
 # Authentication Views
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
@@ -105,158 +58,104 @@ def register(request):
         
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def login(request):
-    email = request.data.get('email')
-    password = request.data.get('password')
-    
-    if email and password:
-        user = authenticate(email=email, password=password)
+def _json_body(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return None, JsonResponse({'error': 'Invalid JSON'}, status=status.HTTP_400_BAD_REQUEST)
+    return (data if isinstance(data, dict) else {}), None
 
-        if user:
-            refresh = RefreshToken.for_user(user)
+# Password checks run on a bounded hashing pool, so a login spike cannot
+# occupy every worker; when the pool is full the client is told to retry
+@csrf_exempt
+@require_POST
+async def login(request):
+    data, error = _json_body(request)
+    if error:
+        return error
+    email, password = data.get('email'), data.get('password')
+    if not (isinstance(email, str) and isinstance(password, str) and email and password):
+        return JsonResponse({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
-            return Response({
-                'user': UserSerializer(user).data,
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            })
-            
-    return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+    try:
+        user = await password_pool.run(authenticate_password, request, email, password)
+    except PoolSaturated as e:
+        response = JsonResponse({'error': 'Too many logins right now, please retry shortly'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+        response['Retry-After'] = str(e.retry_after)
+        return response
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def google_auth(request):
-    serializer = SocialAuthSerializer(data=request.data)
-    if serializer.is_valid():
-        token = serializer.validated_data.get('credential') or serializer.validated_data.get('token')
-        if not token:
-            return Response({'error': 'Token or credential is required'}, status=status.HTTP_400_BAD_REQUEST)
-        
-        try:
-            # Specify your client ID as the audience
-            idinfo = id_token.verify_oauth2_token(
-                token, 
-                google_requests.Request(), 
-                os.getenv('GOOGLE_OAUTH2_KEY')
-            )
-            
-            # Check if the token is issued by Google
-            if idinfo['iss'] not in ['accounts.google.com', 'https://accounts.google.com']:
-                raise ValueError('Wrong issuer.')
-            
-            email = idinfo.get('email')
-            first_name = idinfo.get('given_name', '')
-            last_name = idinfo.get('family_name', '')
-            picture = idinfo.get('picture', '')
-            
-            if not email:
-                return Response({'error': 'Email not provided by Google'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Create username from email if it doesn't exist
-            username = email.split('@')[0]
-            
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    'username': username,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'profile_picture': picture,
-                    'provider': 'google'
-                }
-            )
-            
-            if not created and not user.provider:
-                user.provider = 'google'
-                user.profile_picture = picture
-                user.save()
-
-            refresh = RefreshToken.for_user(user)
-            
-            return Response({
-                'user': UserSerializer(user).data,
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            })
-            
-        except ValueError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if user is None:
+        return JsonResponse({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
+    return JsonResponse(await sync_to_async(issue_tokens)(user))
 
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def login_metrics(request):
+    # Per process, like the pool itself
+    return Response(password_pool.stats())
 
-@api_view(['POST'])
-@permission_classes([permissions.AllowAny])
-def linkedin_auth(request):
-    serializer = SocialAuthSerializer(data=request.data)
-    if serializer.is_valid():
-        access_token = serializer.validated_data['access_token']
-        
-        try:
-            # Get user profile from LinkedIn
-            profile_response = requests.get(
-                'https://api.linkedin.com/v2/people/~:(id,firstName,lastName,profilePicture(displayImage~:playableStreams))',
-                headers={'Authorization': f'Bearer {access_token}'},
-                timeout=10
-            )
-            
-            email_response = requests.get(
-                'https://api.linkedin.com/v2/emailAddress?q=members&projection=(elements*(handle~))',
-                headers={'Authorization': f'Bearer {access_token}'},
-                timeout=10
-            )
-            
-            if profile_response.status_code != 200 or email_response.status_code != 200:
-                return Response({'error': 'Failed to fetch LinkedIn profile'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            profile_data = profile_response.json()
-            email_data = email_response.json()
-            
-            # Extract user information
-            email = email_data['elements'][0]['handle~']['emailAddress']
-            first_name = profile_data.get('firstName', {}).get('localized', {}).get('en_US', '')
-            last_name = profile_data.get('lastName', {}).get('localized', {}).get('en_US', '')
-            
-            # Extract profile picture
-            picture = ''
-            if 'profilePicture' in profile_data:
-                picture_data = profile_data['profilePicture'].get('displayImage~', {})
-                if 'elements' in picture_data and picture_data['elements']:
-                    picture = picture_data['elements'][-1]['identifiers'][0]['identifier']
-            
-            # Get or create user
-            user, created = User.objects.get_or_create(
-                email=email,
-                defaults={
-                    'username': email,
-                    'first_name': first_name,
-                    'last_name': last_name,
-                    'profile_picture': picture,
-                    'provider': 'linkedin'
-                }
-            )
-            
-            if not created and not user.provider:
-                user.provider = 'linkedin'
-                user.profile_picture = picture
-                user.save()
-            
-            refresh = RefreshToken.for_user(user)
-            return Response({
-                'user': UserSerializer(user).data,
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            })
-            
-        except Exception as e:
-            return Response({'error': 'Invalid LinkedIn token'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+# Social logins are async views: the provider round trips and DB work do not
+# hold a worker thread when served through resume/asgi.py
+def _social_auth_data(request):
+    data, error = _json_body(request)
+    if error:
+        return None, error
+    serializer = SocialAuthSerializer(data=data)
+    if not serializer.is_valid():
+        return None, JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    return serializer.validated_data, None
+
+@csrf_exempt
+@require_POST
+async def google_auth(request):
+    data, error = _social_auth_data(request)
+    if error:
+        return error
+    token = data.get('credential') or data.get('token')
+    if not token:
+        return JsonResponse({'error': 'Token or credential is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        idinfo = await verify_google_id_token(token)
+    except SocialAuthError as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    email = idinfo.get('email')
+    if not email:
+        return JsonResponse({'error': 'Email not provided by Google'}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Create username from email if it doesn't exist
+    return JsonResponse(await social_login(
+        'google', email, username=email.split('@')[0],
+        first_name=idinfo.get('given_name', ''),
+        last_name=idinfo.get('family_name', ''),
+        picture=idinfo.get('picture', ''),
+    ))
+
+@csrf_exempt
+@require_POST
+async def linkedin_auth(request):
+    data, error = _social_auth_data(request)
+    if error:
+        return error
+    if not data.get('access_token'):
+        return JsonResponse({'error': 'access_token is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        identity = await fetch_linkedin_identity(data['access_token'])
+    except SocialAuthError:
+        return JsonResponse({'error': 'Invalid LinkedIn token'}, status=status.HTTP_400_BAD_REQUEST)
+
+    return JsonResponse(await social_login(
+        'linkedin', identity['email'], username=identity['email'],
+        first_name=identity['first_name'],
+        last_name=identity['last_name'],
+        picture=identity['picture'],
+    ))
 
 @api_view(['GET'])
 def profile(request):
-    return Response(UserProfileSerializer(request.user).data)
+    return Response(UserProfileSerializer(request.user, **sparse_fields(request)).data)
 
 @api_view(['PUT', 'PATCH'])
 def update_profile(request):
@@ -270,35 +169,130 @@ def update_profile(request):
 def logout(request):
     try:
         refresh_token = request.data['refresh']
-        token = RefreshToken(refresh_token)
+        token = IndexedRefreshToken(refresh_token)
         token.blacklist()
+        invalidate_user(request.user.pk)
 
         return Response(status=status.HTTP_205_RESET_CONTENT)
     except Exception as e:
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
 # Resume Template Views
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def resume_templates(request):
-    templates = ResumeTemplate.objects.all().order_by('-ats_score', 'name')
-    serializer = ResumeTemplateSerializer(templates, many=True)
-    return Response(serializer.data)
+    sparse = sparse_fields(request)
+    if sparse:
+        templates = ResumeTemplate.objects.all().order_by('-ats_score', 'name')
+        return Response(ResumeTemplateSerializer(templates, many=True, **sparse).data)
+    return cached_json_response(request, get_catalog().listing)
 
+@query_budget(2)
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
 def resume_template_detail(request, template_id):
-    template = get_object_or_404(ResumeTemplate, id=template_id)
-    serializer = ResumeTemplateSerializer(template)
-    return Response(serializer.data)
+    sparse = sparse_fields(request)
+    if sparse:
+        serializer = ResumeTemplateSerializer(**sparse)
+        serializer.instance = get_object_or_404(serializer.project(ResumeTemplate.objects.all()), id=template_id)
+        return Response(serializer.data)
+
+    cached = get_catalog().templates.get(str(template_id))
+    if cached is None:
+        # Possibly created by another process since the catalog was built
+        cached = serialize_template(get_object_or_404(ResumeTemplate, id=template_id))
+    return cached_json_response(request, cached)
 
 # Resume CRUD Views
+@query_budget(2)
+@trusts_token_claims
 @api_view(['GET'])
 def user_resumes(request):
+    fields = sparse_fields(request)
+    # Project before paginating so the JSON content columns are never loaded
+    resumes = ResumeListSerializer(**fields).project(Resume.objects.filter(user=request.user))
+    paginator = UpdatedAtCursorPagination()
+    page = [write_buffer.overlay(resume) for resume in paginator.paginate_queryset(resumes, request)]
+    return paginator.get_paginated_response(ResumeListSerializer(page, many=True, **fields).data)
+
+@query_budget(3)
+@trusts_token_claims
+@api_view(['GET'])
+def search_resumes(request):
+    query = request.query_params.get('q', '').strip()
+    scope = request.query_params.get('scope', 'all')
+    if not query:
+        return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if scope not in ('all', 'mine', 'public'):
+        return Response({'error': 'scope must be all, mine or public'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = max(1, min(int(request.query_params.get('limit', 20)), 50))
+    except ValueError:
+        limit = 20
+
+    try:
+        hits = search_resume_index(query, request.user, scope=scope, limit=limit)
+    except SearchUnavailable as e:
+        return Response({'error': str(e)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    # The index ranks; only the listed columns of the hits are loaded
+    fields = sparse_fields(request)
+    resumes = ResumeSearchResultSerializer(**fields).project(Resume.objects.filter(id__in=[hit[0] for hit in hits]))
+    resumes = resumes.in_bulk()
+    results = []
+    for resume_id, rank, snippet in hits:
+        resume = resumes.get(resume_id)
+        if resume is not None:
+            resume.rank, resume.snippet = rank, snippet
+            results.append(resume)
+    return Response({'results': ResumeSearchResultSerializer(results, many=True, **fields).data})
+
+@api_view(['GET', 'POST'])
+def export_resumes(request):
+    # Optional list of resume ids: JSON body on POST, comma separated ?ids= on GET
+    if request.method == 'POST':
+        ids = request.data.get('ids') or []
+    else:
+        ids = [i for i in request.query_params.get('ids', '').split(',') if i]
+    
+    resumes = Resume.objects.filter(user=request.user)
+    if ids:
+        try:
+            ids = [uuid.UUID(str(i)) for i in ids]
+        except ValueError:
+            return Response({'error': 'Invalid resume id'}, status=status.HTTP_400_BAD_REQUEST)
+        resumes = resumes.filter(id__in=ids)
+    
+    resume_ids = list(resumes.values_list('id', flat=True))
+    if not resume_ids:
+        return Response({'error': 'No resumes to export'}, status=status.HTTP_404_NOT_FOUND)
+    write_buffer.flush(resume_ids)
+    
+    response = StreamingHttpResponse(
+        streaming_content(request, stream_resume_zip(resume_ids)), content_type='application/zip'
+    )
+    response['Content-Disposition'] = 'attachment; filename="resumes.zip"'
+    return response
+
+@api_view(['GET'])
+def export_resumes_ndjson(request):
     resumes = Resume.objects.filter(user=request.user)
-    serializer = ResumeListSerializer(resumes, many=True)
-    return Response(serializer.data)
+    # Buffered edits must reach the rows before the stream reads them
+    write_buffer.flush(list(resumes.values_list('id', flat=True)))
+    content = stream_resumes_ndjson(resumes)
+    response = StreamingHttpResponse(streaming_content(request, content), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="resumes.ndjson"'
+    return response
 
+@api_view(['POST'])
+def import_resumes(request):
+    # The body is read line by line rather than parsed; each line becomes one of the user's resumes
+    report = import_resumes_ndjson(request.stream or [], owner=request.user)
+    return Response({'imported': report.imported, 'failed': report.failed, 'errors': report.errors})
+
+# The user, the template, the resume and its search document (written by the post_save signal)
+@query_budget(4)
 @api_view(['POST'])
 def create_resume(request):
     data = request.data.copy()
@@ -309,183 +303,178 @@ def create_resume(request):
         return Response(ResumeSerializer(resume).data, status=status.HTTP_201_CREATED)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(2)
+@trusts_token_claims
 @api_view(['GET'])
 def resume_detail(request, resume_id):
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    serializer = ResumeSerializer(resume)
-    return Response(serializer.data)
+    serializer = ResumeSerializer(**sparse_fields(request))
+    serializer.instance = write_buffer.overlay(
+        get_object_or_404(serializer.project(Resume.objects.all()), id=resume_id, user=request.user)
+    )
+    response = Response(serializer.data)
+    if 'version' in serializer.fields:
+        response['ETag'] = version_etag(serializer.instance)
+    return response
 
+@query_budget(4)
 @api_view(['PUT', 'PATCH'])
+@parser_classes([JSONParser, JSONPatchParser, MergePatchParser])
 def update_resume(request, resume_id):
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
-    serializer = ResumeSerializer(resume, data=request.data, partial=True)
+    # The response embeds template_details and user_name
+    resume = write_buffer.overlay(
+        get_object_or_404(Resume.objects.select_related('template', 'user'), id=resume_id, user=request.user)
+    )
+
+    expected_version = None
+    if 'If-Match' in request.headers:
+        try:
+            expected_version = if_match_version(request.headers['If-Match'])
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if expected_version is not None and expected_version != resume.version:
+            return version_conflict(resume)
+
+    data = request.data
+    media_type = request.content_type.split(';')[0].strip()
+    if media_type in (JSON_PATCH, MERGE_PATCH):
+        try:
+            data = patched_fields(resume, media_type, request.data)
+        except PatchTestFailed as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        except PatchError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    serializer = ResumeSerializer(resume, data=data, partial=True)
     if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data)
+        if write_buffer.enabled:
+            # Autosave PATCHes are coalesced; a PUT is an explicit save and is written now
+            if not write_buffer.stage(resume, serializer.validated_data, expected_version):
+                return version_conflict(resume)
+            if request.method == 'PUT':
+                write_buffer.flush([resume.pk])
+        # Only the changed columns are written, guarded by the version the client saw
+        elif not save_resume_changes(resume, serializer.validated_data, expected_version):
+            return version_conflict(resume)
+        response = Response(ResumeSerializer(resume).data)
+        response['ETag'] = version_etag(resume)
+        return response
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def version_conflict(resume):
+    resume.refresh_from_db(fields=['version'])
+    write_buffer.overlay(resume)
+    response = Response(
+        {'error': 'Resume was modified by another session', 'version': resume.version},
+        status=status.HTTP_412_PRECONDITION_FAILED,
+    )
+    response['ETag'] = version_etag(resume)
+    return response
+
 @api_view(['DELETE'])
 def delete_resume(request, resume_id):
     resume = get_object_or_404(Resume, id=resume_id, user=request.user)
     resume.delete()
+    # delete() clears resume.pk
+    write_buffer.discard(resume_id)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 # PDF Generation View
-@api_view(['POST'])
+@query_budget(4)
+@api_view(['GET', 'POST'])
 def generate_resume_pdf(request, resume_id):
-    resume = get_object_or_404(Resume, id=resume_id, user=request.user)
+    # Renders read the database, so buffered edits are written first
+    write_buffer.flush([resume_id])
+    resume = get_object_or_404(Resume.objects.select_related('template'), id=resume_id, user=request.user)
     
     try:
-        # Create PDF buffer
-        buffer = BytesIO()
-        
         # Get template styles
-        template = resume.template
-        if not template:
+        if not resume.template:
             return Response({'error': 'No template selected for this resume'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        # Get template styles
-        css_styles = template.css_styles
-        layout_config = template.layout_config
-        
-        # Set margins based on template
-        margins = css_styles.get('margins', {})
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=A4,
-            rightMargin=convert_to_points(margins.get('right', '0.5in')),
-            leftMargin=convert_to_points(margins.get('left', '0.5in')),
-            topMargin=convert_to_points(margins.get('top', '0.5in')),
-            bottomMargin=convert_to_points(margins.get('bottom', '0.5in'))
-        )
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Get font family with fallback
-        font_family = get_font_family(css_styles.get('fontFamily', 'Helvetica, sans-serif'))
-        
-        # Create custom styles based on template
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontName=font_family,
-            fontSize=convert_to_points(css_styles.get('fontSize', '18pt')),
-            spaceAfter=convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '30pt')),
-            alignment=1,  # Center alignment
-            textColor=css_styles.get('colors', {}).get('primary', '#000000')
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontName=font_family,
-            fontSize=convert_to_points(css_styles.get('fontSize', '14pt')),
-            spaceAfter=convert_to_points(css_styles.get('spacing', {}).get('itemSpacing', '12pt')),
-            textColor=css_styles.get('colors', {}).get('accent', '#2E86AB'),
-            fontStyle='bold'
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontName=font_family,
-            fontSize=convert_to_points(css_styles.get('fontSize', '10pt')),
-            spaceAfter=convert_to_points(css_styles.get('spacing', {}).get('itemSpacing', '12pt')),
-            textColor=css_styles.get('colors', {}).get('secondary', '#333333'),
-            leading=convert_to_points(css_styles.get('fontSize', '10pt')) * float(css_styles.get('lineHeight', '1.4'))
-        )
-        
-        # Build PDF content
-        story = []
-        
-        # Personal Info
-        personal_info = resume.personal_info
-        if personal_info.get('name'):
-            story.append(Paragraph(personal_info['name'], title_style))
-        
-        contact_info = []
-        if personal_info.get('email'):
-            contact_info.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_info.append(personal_info['phone'])
-        if personal_info.get('linkedin'):
-            contact_info.append(personal_info['linkedin'])
-        
-        if contact_info:
-            story.append(Paragraph(' | '.join(contact_info), normal_style))
-        
-        story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-        
-        # Get sections order from template
-        sections_order = layout_config.get('sections_order', [
-            'summary', 'experience', 'education', 'skills', 'projects'
-        ])
-        
-        # Process sections in the specified order
-        for section in sections_order:
-            if section == 'summary' and resume.professional_summary:
-                story.append(Paragraph("PROFESSIONAL SUMMARY", heading_style))
-                story.append(Paragraph(resume.professional_summary, normal_style))
-                story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-            
-            elif section == 'experience' and resume.experience:
-                story.append(Paragraph("EXPERIENCE", heading_style))
-                for exp in resume.experience:
-                    exp_title = f"<b>{exp.get('jobTitle', '')}</b> at {exp.get('company', '')}"
-                    story.append(Paragraph(exp_title, normal_style))
-                    
-                    exp_details = f"{exp.get('location', '')} | {exp.get('startDate', '')} - {exp.get('endDate', '')}"
-                    story.append(Paragraph(exp_details, normal_style))
-                    
-                    if exp.get('description'):
-                        story.append(Paragraph(exp['description'], normal_style))
-                    story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('itemSpacing', '6pt'))))
-                story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-            
-            elif section == 'education' and resume.education:
-                story.append(Paragraph("EDUCATION", heading_style))
-                for edu in resume.education:
-                    edu_title = f"<b>{edu.get('degree', '')}</b> - {edu.get('institution', '')}"
-                    story.append(Paragraph(edu_title, normal_style))
-                    
-                    edu_details = f"{edu.get('location', '')} | {edu.get('graduationDate', '')}"
-                    story.append(Paragraph(edu_details, normal_style))
-                    story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('itemSpacing', '6pt'))))
-                story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-            
-            elif section == 'skills' and resume.skills:
-                story.append(Paragraph("SKILLS", heading_style))
-                skills_text = ', '.join([skill.get('name', '') for skill in resume.skills if skill.get('name')])
-                story.append(Paragraph(skills_text, normal_style))
-                story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-            
-            elif section == 'projects' and resume.projects:
-                story.append(Paragraph("PROJECTS", heading_style))
-                for proj in resume.projects:
-                    proj_title = f"<b>{proj.get('name', '')}</b>"
-                    story.append(Paragraph(proj_title, normal_style))
-                    
-                    if proj.get('description'):
-                        story.append(Paragraph(proj['description'], normal_style))
-                    
-                    if proj.get('technologies'):
-                        story.append(Paragraph(f"Technologies: {proj['technologies']}", normal_style))
-                    story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('itemSpacing', '6pt'))))
-                story.append(Spacer(1, convert_to_points(css_styles.get('spacing', {}).get('sectionSpacing', '12pt'))))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        
-        # Create response
-        response = HttpResponse(buffer.read(), content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{resume.title}.pdf"'
+        # Served from the render cache unless the content or template changed
+        digest, pdf = open_resume_pdf(resume)
         
+        # Streams from storage and answers Range requests for progressive viewers
+        response = pdf_file_response(request, pdf, f'{resume.title}.pdf', f'"{digest}"')
+        response['Cache-Control'] = 'private, no-cache'
         return response
         
     except Exception as e:
         return Response({'error': f'Failed to generate PDF: {str(e)}'}, 
                        status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+# Background PDF Rendering Views
+@api_view(['POST'])
+def enqueue_resume_pdf(request, resume_id):
+    write_buffer.flush([resume_id])
+    resume = get_object_or_404(Resume.objects.select_related('template'), id=resume_id, user=request.user)
+    if not resume.template:
+        return Response({'error': 'No template selected for this resume'}, 
+                      status=status.HTTP_400_BAD_REQUEST)
+    
+    job = enqueue_pdf_render(resume)
+    data = PdfRenderJobSerializer(job).data
+    data['status_url'] = request.build_absolute_uri(reverse('pdf_job_status', args=[job.id]))
+    return Response(data, status=status.HTTP_202_ACCEPTED)
+
+@trusts_token_claims
+@api_view(['GET'])
+def pdf_job_status(request, job_id):
+    job = get_object_or_404(PdfRenderJob, id=job_id, resume__user=request.user)
+    data = PdfRenderJobSerializer(job, **sparse_fields(request)).data
+    if job.status == 'done':
+        data['download_url'] = request.build_absolute_uri(reverse('pdf_job_download', args=[job.id]))
+    return Response(data)
+
+@trusts_token_claims
+@api_view(['GET'])
+def pdf_job_download(request, job_id):
+    job = get_object_or_404(PdfRenderJob.objects.select_related('resume'), id=job_id, resume__user=request.user)
+    if job.status != 'done':
+        return Response({'error': f'PDF job is {job.status}'}, status=status.HTTP_409_CONFLICT)
+    
+    resume = job.resume
+    pdf = open_cached_pdf(resume, job.content_hash)
+    if pdf is None:
+        return Response({'error': 'PDF has been superseded or evicted, enqueue a new render'}, 
+                       status=status.HTTP_410_GONE)
+    return pdf_file_response(request, pdf, f'{resume.title}.pdf', f'"{job.content_hash}"')
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def pdf_job_metrics(request):
+    # Flowable cache counters are per process, the queue is shared
+    return Response({**queue_metrics(), 'flowable_cache': flowable_cache.stats()})
+
+# Public resume pages: anyone with the link may read a resume marked is_public.
+# Plain Django views, so no authentication runs; the long-lived Cache-Control
+# and content-hash ETag let a reverse proxy answer almost every hit
+def _public_response(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = public_cache_control()
+    return response
+
+@require_safe
+def public_resume(request, resume_id):
+    page = public_page(resume_id)
+    if page is None:
+        raise Http404('No public resume with this id')
+    digest, html = page
+    etag = f'"{digest}"'
+    if not_modified(request, etag):
+        return _public_response(HttpResponse(status=304), etag)
+    return _public_response(HttpResponse(html, content_type='text/html; charset=utf-8'), etag)
+
+@require_safe
+def public_resume_pdf(request, resume_id):
+    resume = Resume.objects.select_related('template').filter(id=resume_id, is_public=True).first()
+    if resume is None or not resume.template:
+        raise Http404('No public resume with this id')
+    etag = f'"{resume_content_hash(resume)}"'
+    if not_modified(request, etag):
+        return _public_response(HttpResponse(status=304), etag)
+    # Usually rendered by the PDF worker when the resume was saved
+    digest, pdf = open_resume_pdf(resume)
+    filename = f"{resume.personal_info.get('name') or 'Resume'}.pdf"
+    return _public_response(pdf_file_response(request, pdf, filename, f'"{digest}"'), f'"{digest}"')
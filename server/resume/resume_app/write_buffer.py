@@ -0,0 +1,181 @@
+import atexit
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from .models import Resume
+from .public_pages import PUBLIC_FIELDS, public_resume_changed
+from .search import SEARCH_FIELDS, reindex_resume
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BufferedResume:
+    base_version: int  # version of the database row
+    version: int  # version including staged edits
+    updated_at: object
+    changes: dict = field(default_factory=dict)  # every buffered value, written or not
+    dirty: dict = field(default_factory=dict)  # values not yet written
+    staged_at: float = None  # monotonic time of the oldest unwritten edit
+    touched_at: float = 0.0
+
+
+class ResumeWriteBuffer:
+    """Write-behind buffer that merges bursts of edits to a resume into one UPDATE.
+
+    Edits are staged in memory and written once the oldest has waited
+    RESUME_WRITE_BUFFER_WINDOW seconds, on flush() (explicit saves and PDF
+    renders), and at interpreter exit. Readers in this process see staged
+    edits through overlay(). The buffer is per process, so deployments with
+    several workers should only enable it with sticky routing per user.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        # Serializes writes so a resume is never flushed twice concurrently
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    @property
+    def enabled(self):
+        return settings.RESUME_WRITE_BUFFER_WINDOW > 0
+
+    def overlay(self, resume):
+        """Apply staged edits and the buffered version to a resume loaded from the database."""
+        with self._lock:
+            entry = self._entries.get(resume.pk)
+            if entry is not None:
+                for name, value in entry.changes.items():
+                    setattr(resume, name, value)
+                resume.version = entry.version
+                resume.updated_at = entry.updated_at
+        return resume
+
+    def stage(self, resume, changes, expected_version=None):
+        """Buffer validated changes; False if ``expected_version`` is no longer current.
+
+        ``resume`` must already be overlaid; it is updated to the new state.
+        """
+        with self._lock:
+            entry = self._entries.get(resume.pk)
+            current = entry.version if entry else resume.version
+            if expected_version is not None and expected_version != current:
+                return False
+
+            changes = {name: value for name, value in changes.items() if getattr(resume, name) != value}
+            if not changes:
+                return True
+
+            now = time.monotonic()
+            if entry is None:
+                entry = self._entries[resume.pk] = BufferedResume(
+                    base_version=resume.version, version=resume.version, updated_at=resume.updated_at
+                )
+            entry.changes.update(changes)
+            entry.dirty.update(changes)
+            entry.version += 1
+            entry.updated_at = timezone.now()
+            entry.touched_at = now
+            if entry.staged_at is None:
+                entry.staged_at = now
+
+            for name, value in changes.items():
+                setattr(resume, name, value)
+            resume.version = entry.version
+            resume.updated_at = entry.updated_at
+
+        self._start_flusher()
+        return True
+
+    def discard(self, resume_id):
+        with self._lock:
+            self._entries.pop(resume_id, None)
+
+    def flush(self, resume_ids=None):
+        """Write staged edits now, for the given resumes or for all of them."""
+        with self._lock:
+            ids = [pk for pk, entry in self._entries.items() if entry.dirty]
+        if resume_ids is not None:
+            wanted = set(resume_ids)
+            ids = [pk for pk in ids if pk in wanted]
+        for pk in ids:
+            self._write(pk)
+
+    def flush_due(self):
+        """Write resumes whose oldest edit has waited a full window; forget idle clean ones."""
+        now = time.monotonic()
+        window = settings.RESUME_WRITE_BUFFER_WINDOW
+        with self._lock:
+            due = [pk for pk, entry in self._entries.items() if entry.dirty and now - entry.staged_at >= window]
+            # Clean entries only serve reads that raced a flush, so they go once idle
+            for pk in [pk for pk, entry in self._entries.items() if not entry.dirty and now - entry.touched_at > 10 * window]:
+                del self._entries[pk]
+        for pk in due:
+            self._write(pk)
+
+    def _write(self, pk):
+        with self._flush_lock:
+            with self._lock:
+                entry = self._entries.get(pk)
+                if entry is None or not entry.dirty:
+                    return
+                writing, version, updated_at = entry.dirty, entry.version, entry.updated_at
+                entry.dirty, entry.staged_at = {}, None
+
+            try:
+                updated = Resume.objects.filter(pk=pk, version=entry.base_version).update(
+                    **writing, version=version, updated_at=updated_at
+                )
+                if not updated:
+                    # Written outside the buffer (another process, the admin): last write wins
+                    logger.warning('Resume %s changed outside the write buffer; overwriting', pk)
+                    Resume.objects.filter(pk=pk).update(**writing, version=F('version') + 1, updated_at=updated_at)
+                    version = Resume.objects.filter(pk=pk).values_list('version', flat=True).first()
+                    if version is None:
+                        self.discard(pk)
+                        return
+                    with self._lock:
+                        entry.version = version + (1 if entry.dirty else 0)
+            except Exception:
+                with self._lock:
+                    entry.dirty = {**writing, **entry.dirty}
+                    if entry.staged_at is None:
+                        entry.staged_at = time.monotonic()
+                raise
+
+            with self._lock:
+                entry.base_version = version
+            if not writing.keys().isdisjoint(SEARCH_FIELDS):
+                reindex_resume(pk)
+            if not writing.keys().isdisjoint(PUBLIC_FIELDS):
+                public_resume_changed(pk)
+
+    def _start_flusher(self):
+        if self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run_flusher, name='resume-write-buffer', daemon=True)
+                self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(max(settings.RESUME_WRITE_BUFFER_WINDOW / 2, 0.05))
+            try:
+                self.flush_due()
+            except Exception:
+                logger.exception('Flushing buffered resume edits failed')
+            finally:
+                close_old_connections()
+
+
+write_buffer = ResumeWriteBuffer()
+
+# Clean shutdowns (including gunicorn's graceful worker exit) write what is left
+atexit.register(write_buffer.flush)